@@ -0,0 +1,149 @@
+"""Benchmark of the build of a configuration with many dialog groups.
+
+Generates a configuration of `--groups` dialog groups with `--windows`
+windows each and prints the build time in the current process,
+with the dialog groups built in a pool of forked processes
+and in a pool of threads.
+
+On a free-threaded Python build (e.g. 3.13t) the threads are measured
+twice, in subprocesses with the GIL disabled and enabled.
+
+Usage:
+    uv run python benchmarks/bench_build.py [--groups 40] [--windows 10]
+        [--processes 4] [--threads 4]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import sysconfig
+import tempfile
+import time
+
+import yaml
+from aiogram import Router
+
+from dialog_yml import BuilderScope, DialogYAMLBuilder
+
+
+def make_config(groups: int, windows: int) -> dict:
+    def make_window(group: int, window: int) -> dict:
+        next_state = f"group{group}:window{(window + 1) % windows}"
+        return {
+            "widgets": [
+                {"format": "Window {window} of {group}: {count} items"},
+                {"text": {"val": "Many items", "when": "count > 1"}},
+                {
+                    "row": {
+                        "buttons": [
+                            {
+                                "switch_to": {
+                                    "id": "next",
+                                    "text": "Next",
+                                    "state": next_state,
+                                }
+                            },
+                            {"cancel": {"text": "Cancel"}},
+                        ]
+                    }
+                },
+                {"url": {"text": "Site", "uri": "https://example.com"}},
+            ]
+        }
+
+    return {
+        "dialogs": {
+            f"group{group}": {
+                "windows": {
+                    f"window{window}": make_window(group, window)
+                    for window in range(windows)
+                }
+            }
+            for group in range(groups)
+        }
+    }
+
+
+def measure(config_dir: str, **kwargs) -> float:
+    started = time.perf_counter()
+    DialogYAMLBuilder.build(
+        "main.yaml", config_dir, router=Router(), scope=BuilderScope(), **kwargs
+    )
+    return time.perf_counter() - started
+
+
+def is_gil_enabled() -> bool:
+    return getattr(sys, "_is_gil_enabled", lambda: True)()
+
+
+def measure_threads_with_gil(args: argparse.Namespace, gil: bool) -> float:
+    """Measures the threads build in a subprocess with the GIL
+    enabled or disabled.
+    """
+
+    output = subprocess.run(
+        [
+            sys.executable,
+            __file__,
+            "--groups",
+            str(args.groups),
+            "--windows",
+            str(args.windows),
+            "--threads",
+            str(args.threads),
+            "--threads-only",
+        ],
+        env={**os.environ, "PYTHON_GIL": "1" if gil else "0"},
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return float(output)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--groups", type=int, default=40)
+    parser.add_argument("--windows", type=int, default=10)
+    parser.add_argument("--processes", type=int, default=os.cpu_count())
+    parser.add_argument("--threads", type=int, default=os.cpu_count())
+    parser.add_argument("--threads-only", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        with open(os.path.join(config_dir, "main.yaml"), "w") as file:
+            yaml.safe_dump(make_config(args.groups, args.windows), file)
+
+        # Warm up the schemas and the imports
+        measure(config_dir)
+        if args.threads_only:
+            print(measure(config_dir, threads=args.threads))
+            return
+
+        sequential = measure(config_dir)
+        parallel = measure(config_dir, processes=args.processes)
+        threaded = measure(config_dir, threads=args.threads)
+
+    print(f"{args.groups} groups x {args.windows} windows")
+    print(f"GIL enabled: {is_gil_enabled()}")
+    print(f"{'Current process:':18}{sequential * 1e3:8.1f} ms")
+    print(
+        f"{f'{args.processes} processes:':18}{parallel * 1e3:8.1f} ms"
+        f"{sequential / parallel:8.2f}x"
+    )
+    print(
+        f"{f'{args.threads} threads:':18}{threaded * 1e3:8.1f} ms"
+        f"{sequential / threaded:8.2f}x"
+    )
+
+    if sysconfig.get_config_var("Py_GIL_DISABLED"):
+        without_gil = measure_threads_with_gil(args, gil=False)
+        with_gil = measure_threads_with_gil(args, gil=True)
+        print(f"{'Threads, no GIL:':18}{without_gil * 1e3:8.1f} ms")
+        print(f"{'Threads, GIL:':18}{with_gil * 1e3:8.1f} ms")
+        print(f"{'GIL speedup:':18}{with_gil / without_gil:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Benchmark of compiled format templates on a text-heavy window.
+
+Renders a `Multi` of formatted texts with aiogram-dialog `Format`
+and with `CompiledFormat` and prints the per-render time of both.
+
+Usage:
+    uv run python benchmarks/bench_format.py [--texts 50] [--renders 2000]
+"""
+
+import argparse
+import asyncio
+import time
+from aiogram_dialog.widgets.text import Format, Multi
+
+from dialog_yml.widgets.text import CompiledFormat
+
+TEMPLATES = [
+    "Order #{order[id]} for {user.name}: {count} items",
+    "Total: {total:.2f} {currency}",
+    "Delivery to {address!r} on {date}",
+    "Status: {status:>10} | updated {updated}",
+]
+
+
+class User:
+    name = "Alice"
+
+
+class Manager:
+    def is_preview(self) -> bool:
+        return False
+
+
+DATA = {
+    "order": {"id": 1042},
+    "user": User(),
+    "count": 3,
+    "total": 1234.5,
+    "currency": "USD",
+    "address": "Main st. 1",
+    "date": "2026-01-01",
+    "status": "shipped",
+    "updated": "now",
+}
+
+
+async def measure(text_class, texts: int, renders: int) -> float:
+    widget = Multi(*[text_class(TEMPLATES[i % len(TEMPLATES)]) for i in range(texts)])
+    manager = Manager()
+
+    await widget.render_text(DATA, manager)
+    started = time.perf_counter()
+    for _ in range(renders):
+        await widget.render_text(DATA, manager)
+    return (time.perf_counter() - started) / renders
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--texts", type=int, default=50)
+    parser.add_argument("--renders", type=int, default=2000)
+    args = parser.parse_args()
+
+    format_time = asyncio.run(measure(Format, args.texts, args.renders))
+    compiled_time = asyncio.run(measure(CompiledFormat, args.texts, args.renders))
+
+    print(f"Window with {args.texts} formatted texts, {args.renders} renders")
+    print(f"Format:         {format_time * 1e6:8.1f} us/render")
+    print(f"CompiledFormat: {compiled_time * 1e6:8.1f} us/render")
+    print(f"Speedup:        {format_time / compiled_time:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
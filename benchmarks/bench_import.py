@@ -0,0 +1,70 @@
+"""Benchmark of the import time of dialog-yml entry points.
+
+Runs fresh interpreters with `-X importtime` and prints the cumulative
+import time of each target, the best of several runs. `eager widgets`
+imports all the widget models, as every build did before the widget
+registry became lazy.
+
+Usage:
+    uv run python benchmarks/bench_import.py [--runs 5]
+"""
+
+import argparse
+import subprocess
+import sys
+
+WIDGET_MODULES = [
+    f"dialog_yml.models.widgets.{module}"
+    for module in (
+        "calendars.calendar",
+        "counters.counter",
+        "inputs.input",
+        "kbd.keyboard",
+        "medias.media",
+        "scrolls.scroll",
+        "selects.select",
+        "texts.text",
+    )
+]
+
+TARGETS = {
+    "dialog_yml": ["dialog_yml"],
+    "dialog_yml.cli": ["dialog_yml.cli"],
+    "dialog_yml.core": ["dialog_yml.core"],
+    "eager widgets": ["dialog_yml.core", *WIDGET_MODULES],
+}
+
+
+def measure(modules: list[str]) -> float:
+    """Returns the total cumulative import time of the modules, in seconds."""
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {', '.join(modules)}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    total = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line.split("|")
+        # Nested imports are indented, the targets are top-level
+        if name.strip() in modules and not name.startswith("   "):
+            total += int(cumulative)
+    return total / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"Cumulative import time, best of {args.runs} runs")
+    for title, modules in TARGETS.items():
+        best = min(measure(modules) for _ in range(args.runs))
+        print(f"{title:16} {best * 1e3:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
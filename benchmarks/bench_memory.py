@@ -0,0 +1,83 @@
+"""Benchmark of the memory kept after the build of a configuration.
+
+Builds the generated configuration of `bench_build.py`, with a button
+calling a function with extra data in each window, with and without
+the lean mode and prints the memory allocated by the build which is
+still alive afterwards, measured with `tracemalloc`.
+
+Usage:
+    uv run python benchmarks/bench_memory.py [--groups 40] [--windows 10]
+"""
+
+import argparse
+import gc
+import os
+import tempfile
+import tracemalloc
+
+import yaml
+from aiogram import Router
+
+from bench_build import make_config
+from dialog_yml import BuilderScope, DialogYAMLBuilder
+
+
+async def on_buy(callback, button, manager, data):
+    pass
+
+
+def make_memory_config(groups: int, windows: int) -> dict:
+    config = make_config(groups, windows)
+    for group in config["dialogs"].values():
+        for window in group["windows"].values():
+            window["widgets"].append(
+                {
+                    "callback": {
+                        "id": "buy",
+                        "text": "Buy",
+                        "on_click": {"name": "on_buy", "quantity": 1},
+                        "notify": "Added to the cart",
+                        "product": {"sku": "A-1", "price": 10},
+                    }
+                }
+            )
+    return config
+
+
+def measure(config_dir: str, **kwargs) -> int:
+    scope = BuilderScope()
+    scope.funcs_registry.register(on_buy)
+    gc.collect()
+    tracemalloc.start()
+    builder = DialogYAMLBuilder.build(
+        "main.yaml", config_dir, router=Router(), scope=scope, **kwargs
+    )
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del builder
+    return retained
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--groups", type=int, default=40)
+    parser.add_argument("--windows", type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        with open(os.path.join(config_dir, "main.yaml"), "w") as file:
+            yaml.safe_dump(make_memory_config(args.groups, args.windows), file)
+
+        # Warm up the schemas and the imports
+        measure(config_dir)
+        regular = measure(config_dir)
+        lean = measure(config_dir, lean=True)
+
+    print(f"{args.groups} groups x {args.windows} windows")
+    print(f"{'Regular build:':15}{regular / 1024:10.1f} KiB")
+    print(f"{'Lean build:':15}{lean / 1024:10.1f} KiB")
+    print(f"{'Saved:':15}{(regular - lean) / 1024:10.1f} KiB ({1 - lean / regular:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,8 @@
 """Dialog YML library for building aiogram-dialog applications using YAML configuration files."""
 
-import sys
+from importlib import import_module
+from typing import TYPE_CHECKING
 
-from .core import DialogYAMLBuilder
-from .models.funcs.func import FuncsRegistry
 from .exceptions import (
     DialogYamlException,
     ModelRegistrationError,
@@ -17,12 +16,33 @@ from .exceptions import (
     InvalidTagName,
     InvalidTagDataType,
 )
-from .middleware import DialogYAMLMiddleware
-from .reader import YAMLReader
-from .states import YAMLStatesManager
-from .utils import clean_empty
+
+if TYPE_CHECKING:
+    from .core import DialogYAMLBuilder
+    from .middleware import DialogYAMLMiddleware
+    from .models.funcs.func import FuncsRegistry
+    from .reader import YAMLReader
+    from .scope import BuilderScope
+    from .states import YAMLStatesManager
+    from .utils import clean_empty
+    from .variants import BotVariants
+
+# The builder pulls in aiogram, aiogram-dialog and the models,
+# so the exports are imported on first access only.
+_LAZY_EXPORTS = {
+    "BotVariants": ".variants",
+    "BuilderScope": ".scope",
+    "DialogYAMLBuilder": ".core",
+    "DialogYAMLMiddleware": ".middleware",
+    "FuncsRegistry": ".models.funcs.func",
+    "YAMLReader": ".reader",
+    "YAMLStatesManager": ".states",
+    "clean_empty": ".utils",
+}
 
 __all__ = [
+    "BotVariants",
+    "BuilderScope",
     "DialogYAMLBuilder",
     "DialogYamlException",
     "DialogYAMLMiddleware",
@@ -42,12 +62,19 @@ __all__ = [
     "clean_empty",
 ]
 
-if sys.version_info >= (3, 8):
-    from importlib import metadata
-else:
-    import importlib_metadata as metadata
 
-try:
-    __version__ = metadata.version("dialog_yml")
-except Exception:
-    __version__ = "unknown"
+def __getattr__(name: str):
+    if name in _LAZY_EXPORTS:
+        value = getattr(import_module(_LAZY_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    if name == "__version__":
+        from importlib import metadata
+
+        try:
+            version = metadata.version("dialog_yml")
+        except Exception:
+            version = "unknown"
+        globals()[name] = version
+        return version
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,300 @@
+"""The `src.check` module validates YAML configurations without a bot.
+
+The whole build pipeline runs on the configuration: reading, the base
+structure check, states, models and aiogram-dialog objects. Unlike
+`DialogYAMLBuilder.build`, the check does not stop at the first error:
+every window of every dialog group is built and all the errors
+and warnings are collected. Dialog groups are validated in parallel
+worker processes.
+
+Classes:
+---------
+- Issue: An error or a warning found in the configuration.
+- CheckReport: The issues of the checked configuration.
+
+Functions:
+---------
+- check_config: Validates the configuration.
+"""
+
+import importlib
+import logging
+import os
+import sys
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+from pydantic import ValidationError
+
+from .core import DialogYAMLBuilder
+from .exceptions import DialogYamlException
+from .models import YAMLModelFactory
+from .models.dialog import DialogModel
+from .models.funcs.func import FuncsRegistry
+from .reader import YAMLReader
+from .scope import BuilderScope, use_scope
+
+ERROR = "error"
+WARNING = "warning"
+LOGGERS = ("dialog_yml", "aiogram_dialog")
+
+
+class Issue(NamedTuple):
+    """An error or a warning found in the configuration.
+
+    `location` is the dotted path of the problem,
+    e.g. `Menu.MAIN.widgets.0`, empty for the whole configuration.
+    """
+
+    level: str
+    location: str
+    message: str
+
+    def __str__(self):
+        location = f"{self.location}: " if self.location else ""
+        return f"{self.level}: {location}{self.message}"
+
+
+class CheckReport(NamedTuple):
+    """The issues of the checked configuration."""
+
+    issues: List[Issue]
+    groups: int = 0
+    windows: int = 0
+
+    @property
+    def errors(self) -> List[Issue]:
+        return [issue for issue in self.issues if issue.level == ERROR]
+
+    @property
+    def warnings(self) -> List[Issue]:
+        return [issue for issue in self.issues if issue.level == WARNING]
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+
+class _WarningsHandler(logging.Handler):
+    def __init__(self, issues: List[Issue], location: str):
+        super().__init__(logging.WARNING)
+        self.issues = issues
+        self.location = location
+
+    def emit(self, record: logging.LogRecord) -> None:
+        level = ERROR if record.levelno >= logging.ERROR else WARNING
+        self.issues.append(Issue(level, self.location, record.getMessage()))
+
+
+class _IssuesCollector:
+    """Collects the exceptions, the Python warnings and the warning
+    log records raised within a location.
+    """
+
+    def __init__(self, issues: List[Issue], location: str):
+        self.issues = issues
+        self.location = location
+        self._handler = _WarningsHandler(issues, location)
+        self._warnings = None
+
+    def __enter__(self) -> "_IssuesCollector":
+        for name in LOGGERS:
+            logging.getLogger(name).addHandler(self._handler)
+        self._warnings = warnings.catch_warnings(record=True)
+        self._records = self._warnings.__enter__()
+        warnings.simplefilter("always")
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self._warnings.__exit__(None, None, None)
+        for name in LOGGERS:
+            logging.getLogger(name).removeHandler(self._handler)
+        for record in self._records:
+            self.issues.append(Issue(WARNING, self.location, str(record.message)))
+
+        if exc is None:
+            return False
+        if not isinstance(exc, Exception):
+            return False
+        self.issues.extend(_exception_issues(self.location, exc))
+        return True
+
+
+def _exception_issues(location: str, exc: Exception) -> List[Issue]:
+    if isinstance(exc, DialogYamlException):
+        return [Issue(ERROR, location, str(exc))]
+    if not isinstance(exc, ValidationError):
+        message = f"{type(exc).__name__}: {exc}".rstrip(": ")
+        return [Issue(ERROR, location, message)]
+
+    issues = []
+    for error in exc.errors():
+        error_location = ".".join(str(part) for part in error["loc"])
+        issues.append(
+            Issue(
+                ERROR,
+                ".".join(part for part in (location, error_location) if part),
+                error["msg"],
+            )
+        )
+    return issues
+
+
+def _check_structure(data, issues: List[Issue]) -> Dict[str, Dict]:
+    """Checks the base structure of every group and window.
+
+    Returns the data of the groups with the windows which can be built
+    under the `windows` key and the names of all the windows
+    of the group, used to build the states, under the `states` key.
+    """
+
+    if not isinstance(data, dict):
+        issues.append(Issue(ERROR, "", f"Expected a mapping, got {type(data)}"))
+        return {}
+
+    dialogs_data = {}
+    with _IssuesCollector(issues, ""):
+        dialogs_data = DialogYAMLBuilder.check_tag_data("dialogs", data, dict)
+        if not dialogs_data:
+            issues.append(
+                Issue(ERROR, "dialogs", "Dialogs must contain at least one group.")
+            )
+
+    groups = {}
+    for group_name, dialog_data in dialogs_data.items():
+        windows_data = {}
+        with _IssuesCollector(issues, str(group_name)):
+            windows_data = DialogYAMLBuilder.check_tag_data("windows", dialog_data, dict)
+            if not windows_data:
+                issues.append(
+                    Issue(ERROR, str(group_name), "Dialog group must contain a window.")
+                )
+
+        valid_windows = {}
+        for state_name, window_data in windows_data.items():
+            with _IssuesCollector(issues, f"{group_name}.{state_name}"):
+                DialogYAMLBuilder.check_tag_data("widgets", window_data, list)
+                valid_windows[state_name] = window_data
+
+        if windows_data:
+            groups[group_name] = {
+                **dialog_data,
+                "windows": valid_windows,
+                "states": list(windows_data),
+            }
+    return groups
+
+
+def _prepare_process(modules: Sequence[str], search_paths: Sequence[str]) -> None:
+    """Imports the modules registering the functions and the custom models."""
+
+    for path in search_paths:
+        if path not in sys.path:
+            sys.path.insert(0, path)
+    for module in modules:
+        importlib.import_module(module)
+
+
+def _create_scope(states_data: Dict) -> BuilderScope:
+    """Returns the scope of one check: the states of the checked
+    configuration only, with the process-wide functions registry
+    and model factory, where the imported modules register.
+    """
+
+    scope = BuilderScope(funcs_registry=FuncsRegistry(), model_factory=YAMLModelFactory)
+    scope.states_manager.build_states_from_yaml_data(states_data)
+    return scope
+
+
+def _check_group(scope: BuilderScope, group_name: str, dialog_data: Dict) -> List[Issue]:
+    """Builds the windows and the dialog of the group,
+    returns the issues found.
+    """
+
+    issues = []
+    windows = []
+    builder = DialogYAMLBuilder("", scope=scope)
+    with use_scope(scope):
+        for state_name, window_data in dialog_data["windows"].items():
+            location = f"{group_name}.{state_name}"
+            with _IssuesCollector(issues, location):
+                window_model = builder._build_window(group_name, state_name, window_data)
+                window_model.to_object()
+                windows.append(window_model)
+
+        if len(windows) == len(dialog_data["states"]):
+            group_data = {
+                key: value for key, value in dialog_data.items() if key != "states"
+            }
+            with _IssuesCollector(issues, group_name):
+                DialogModel.to_model({**group_data, "windows": windows}).to_object()
+    return issues
+
+
+def _check_group_task(args) -> List[Issue]:
+    group_name, dialog_data, states_data, modules, search_paths = args
+    _prepare_process(modules, search_paths)
+    return _check_group(_create_scope(states_data), group_name, dialog_data)
+
+
+def check_config(
+    yaml_file_name: str,
+    yaml_dir_path: str = "",
+    modules: Iterable[str] = (),
+    workers: Optional[int] = None,
+) -> CheckReport:
+    """Validates the YAML configuration and collects all its issues.
+
+    :param yaml_file_name: The name of the YAML file.
+    :type yaml_file_name: str
+    :param yaml_dir_path: The path to the directory containing the YAML file.
+    :type yaml_dir_path: str (optional, default: "")
+    :param modules: The modules to import before the build, registering
+        the functions and the custom models used by the configuration.
+    :type modules: Iterable[str] (optional, default: ())
+    :param workers: The number of worker processes, 1 to check
+        in the current process. The number of CPUs if not set.
+    :type workers: int (optional, default: None)
+
+    :return: The report.
+    :rtype: CheckReport
+    """
+
+    issues: List[Issue] = []
+    data = None
+    with _IssuesCollector(issues, ""):
+        data = YAMLReader.read_data_to_dict(yaml_file_name, yaml_dir_path)
+    if issues and data is None:
+        return CheckReport(issues)
+
+    groups = _check_structure(data, issues)
+    states_data = {
+        "dialogs": {
+            group_name: {"windows": dict.fromkeys(dialog_data["states"])}
+            for group_name, dialog_data in groups.items()
+        }
+    }
+    windows_count = sum(len(dialog_data["states"]) for dialog_data in groups.values())
+    modules = list(modules)
+    tasks = list(groups.items())
+
+    workers = min(workers or os.cpu_count() or 1, len(tasks) or 1)
+    search_paths = [os.getcwd()]
+    if workers == 1:
+        _prepare_process(modules, search_paths)
+        scope = _create_scope(states_data)
+        for group_name, dialog_data in tasks:
+            issues.extend(_check_group(scope, group_name, dialog_data))
+    else:
+        # Each group is checked in a scope of its own, so the states
+        # of the forked parent don't leak into the check
+        task_args = [
+            (group_name, dialog_data, states_data, modules, search_paths)
+            for group_name, dialog_data in tasks
+        ]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for group_issues in executor.map(_check_group_task, task_args):
+                issues.extend(group_issues)
+
+    return CheckReport(issues, groups=len(groups), windows=windows_count)
@@ -0,0 +1,75 @@
+"""The `src.cli` module provides the `dialog-yml` command.
+
+Commands:
+---------
+- check: Validates a YAML configuration without a bot and prints
+  all the errors and warnings. Exits with code 1 on errors
+  (and on warnings with `--strict`), so it can run in pre-commit.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+from typing import Optional, Sequence
+
+
+def _check(args: argparse.Namespace) -> int:
+    from .check import check_config
+
+    path = Path(args.config)
+    report = check_config(
+        path.name,
+        str(path.parent),
+        modules=args.module,
+        workers=args.workers,
+    )
+
+    for issue in report.issues:
+        print(f"{args.config}: {issue}")
+    print(
+        f"{args.config}: {report.groups} groups, {report.windows} windows, "
+        f"{len(report.errors)} errors, {len(report.warnings)} warnings"
+    )
+
+    if report.errors or (args.strict and report.warnings):
+        return 1
+    return 0
+
+
+def create_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="dialog-yml")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    check_parser = subparsers.add_parser(
+        "check", help="validate a YAML configuration without a bot"
+    )
+    check_parser.add_argument("config", help="the main YAML file")
+    check_parser.add_argument(
+        "-m",
+        "--module",
+        action="append",
+        default=[],
+        help="module registering the functions and the custom models, "
+        "imported before the check (repeatable)",
+    )
+    check_parser.add_argument(
+        "-j",
+        "--workers",
+        type=int,
+        default=None,
+        help="number of worker processes (default: the number of CPUs)",
+    )
+    check_parser.add_argument(
+        "--strict", action="store_true", help="fail on warnings too"
+    )
+    check_parser.set_defaults(handler=_check)
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = create_parser().parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
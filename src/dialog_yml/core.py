@@ -1,11 +1,21 @@
+import asyncio
+import contextlib
+import contextvars
+import gc
 import logging
 import types
+from concurrent.futures import Executor
 from pathlib import Path
-from typing import Type, List, Dict, Any
+from typing import TYPE_CHECKING, Type, List, Dict, Any
 
 from aiogram import Router
 from aiogram.fsm.state import StatesGroup
 from aiogram_dialog import Dialog, setup_dialogs
+from aiogram_dialog.api.entities import DIALOG_EVENT_NAME
+from aiogram_dialog.api.protocols import (
+    MediaIdStorageProtocol,
+    MessageManagerProtocol,
+)
 from pydantic import BaseModel
 
 from .models.funcs.func import FuncsRegistry
@@ -15,19 +25,23 @@ from .models import YAMLModelFactory
 from .models.base import YAMLModel
 from .models.dialog import DialogModel
 from .models.funcs import func_classes
+from .models.registry import LazyModelClasses
 from .models.widgets import widget_classes
-from .models.window import WindowModel
 from .reader import YAMLReader
+from .scope import BuilderScope, use_scope
 from .states import YAMLStatesManager
 
+if TYPE_CHECKING:
+    from .i18n import I18nCatalogs
+
 logger = logging.getLogger(__name__)
 
-models_classes = {
-    "window": WindowModel,
-    "dialog": DialogModel,
-    **func_classes,
-    **widget_classes,
-}
+# The window model imports the widgets, it's loaded on the first build
+models_classes = LazyModelClasses(
+    {"window": "dialog_yml.models.window:WindowModel", "dialog": DialogModel},
+    func_classes,
+    widget_classes,
+)
 
 
 class DialogYAMLBuilder:
@@ -41,6 +55,7 @@ class DialogYAMLBuilder:
         yaml_file_name: str,
         yaml_dir_path: str = "",
         router: Router = Router(),
+        scope: BuilderScope | None = None,
     ):
         logger.debug("Initialize DialogYAMLBuilder")
 
@@ -48,10 +63,19 @@ class DialogYAMLBuilder:
         self.yaml_dir_path = yaml_dir_path or ""
         self._router = router
 
-        self.funcs_registry = FuncsRegistry()
-        self.states_manager = YAMLStatesManager()
-        self.model_factory = YAMLModelFactory
-        self.model_factory.set_classes(models_classes)
+        self.scope = scope
+        if scope is None:
+            self.funcs_registry = FuncsRegistry()
+            self.states_manager = YAMLStatesManager()
+            self.model_factory = YAMLModelFactory
+            self.model_factory.set_classes(models_classes)
+        else:
+            self.funcs_registry = scope.funcs_registry
+            self.states_manager = scope.states_manager
+            self.model_factory = scope.model_factory
+            self.model_factory.set_classes(
+                LazyModelClasses(models_classes, self.model_factory._models_classes)
+            )
 
     @property
     def router(self) -> Router:
@@ -63,13 +87,14 @@ class DialogYAMLBuilder:
         Allows accessing states like `builder.states.Menu.MAIN` instead of
         `builder.states_manager.get_by_name("Menu").MAIN`.
 
+        The namespace is cached by the states manager
+        and rebuilt only after the states change.
+
         :return: The states.
         :rtype: types.SimpleNamespace
         """
-        groups = {}
-        for group_name in self.states_manager.get_group_names():
-            groups[group_name] = self.states_manager.get_by_name(group_name)
-        return types.SimpleNamespace(**groups)
+
+        return self.states_manager.namespace
 
     @classmethod
     def build(
@@ -79,6 +104,13 @@ class DialogYAMLBuilder:
         states: List[Type[StatesGroup]] | None = None,
         models: Dict[str, Type[YAMLModel]] | None = None,
         router: Router = Router(),
+        media_id_storage: MediaIdStorageProtocol | None = None,
+        message_manager: MessageManagerProtocol | None = None,
+        scope: BuilderScope | None = None,
+        i18n: "I18nCatalogs | None" = None,
+        processes: int | None = None,
+        threads: int | None = None,
+        lean: bool = False,
     ) -> "DialogYAMLBuilder":
         """Builds the DialogYAMLBuilder and initializes
         the aiogram dialogs router.
@@ -94,6 +126,34 @@ class DialogYAMLBuilder:
         :type models: Dict[str, Type[YAMLModel]] (optional, default: None)
         :param router: The router to be used.
         :type router: Router (optional, default: Router())
+        :param media_id_storage: The storage of Telegram file ids
+            of the sent media, e.g. `SqliteMediaIdStorage` to keep them
+            between restarts. aiogram-dialog in-memory storage if not set.
+        :type media_id_storage: MediaIdStorageProtocol
+            (optional, default: None)
+        :param message_manager: The aiogram-dialog message manager,
+            e.g. `CachedMediaMessageManager` to read local media
+            in a thread pool with an in-memory cache.
+        :type message_manager: MessageManagerProtocol
+            (optional, default: None)
+        :param scope: The functions registry, the states manager
+            and the model factory of the builder. The process-wide
+            singletons are used if not set.
+        :type scope: BuilderScope (optional, default: None)
+        :param i18n: The catalogs of the texts marked with `i18n`.
+        :type i18n: I18nCatalogs (optional, default: None)
+        :param processes: The number of forked processes validating
+            the dialog groups into models in parallel. The groups
+            are built in the current process if not set.
+        :type processes: int (optional, default: None)
+        :param threads: The number of threads building the dialog groups
+            in parallel, scales on free-threaded Python builds.
+            Ignored if `processes` is set.
+        :type threads: int (optional, default: None)
+        :param lean: Whether to keep less memory after the build:
+            equal strings of the YAML data and equal format templates
+            are shared and the build garbage is collected right away.
+        :type lean: bool (optional, default: False)
 
         :return: The router.
         :rtype: Router
@@ -105,23 +165,201 @@ class DialogYAMLBuilder:
             states,
             models,
         )
-        dialog_builder = DialogYAMLBuilder(yaml_file_name, yaml_dir_path)
+        if i18n is not None:
+            scope = (scope or BuilderScope.default()).with_i18n(i18n)
+
+        dialog_builder = DialogYAMLBuilder(yaml_file_name, yaml_dir_path, scope=scope)
+        dialog_builder.register_custom_models(models)
+        dialog_builder.register_custom_states(states)
+
+        if lean:
+            from .widgets.text import share_templates
+
+        with use_scope(scope), share_templates() if lean else contextlib.nullcontext():
+            dialogs = dialog_builder._build(
+                processes=processes, threads=threads, intern_strings=lean
+            )
+        if lean:
+            # The YAML data and the models are garbage now,
+            # partly in reference cycles
+            collected = gc.collect()
+            logger.debug("Lean build: %d objects collected", collected)
+        dialog_builder._dialogs = dialogs
+        dialog_builder._router = router
+        dialog_builder._setup_router(
+            router, dialogs, media_id_storage, message_manager
+        )
+        return dialog_builder
+
+    @classmethod
+    async def abuild(
+        cls,
+        yaml_file_name: str,
+        yaml_dir_path: str | None = None,
+        states: List[Type[StatesGroup]] | None = None,
+        models: Dict[str, Type[YAMLModel]] | None = None,
+        router: Router | None = None,
+        media_id_storage: MediaIdStorageProtocol | None = None,
+        message_manager: MessageManagerProtocol | None = None,
+        scope: BuilderScope | None = None,
+        i18n: "I18nCatalogs | None" = None,
+        replace_router: Router | None = None,
+        executor: Executor | None = None,
+    ) -> "DialogYAMLBuilder":
+        """Builds the DialogYAMLBuilder without blocking the event loop,
+        e.g. to reload the dialogs of a running bot.
+
+        Reading and parsing of the YAML files and the build of each
+        dialog group run in the executor, the loop serves other updates
+        between the groups. The router is set up on the loop when all
+        the groups are built and, if `replace_router` is given,
+        takes its place in its parent router.
+
+        The other parameters are the same as of `build`.
+
+        :param router: The router to be used.
+        :type router: Router (optional, default: a new router)
+        :param replace_router: The router of the previous build
+            to be replaced by the new router, included in a parent router.
+        :type replace_router: Router (optional, default: None)
+        :param executor: The executor to build in.
+        :type executor: Executor (optional, default: the loop default executor)
+
+        :return: The builder.
+        :rtype: DialogYAMLBuilder
+
+        :raises DialogYamlException: When `replace_router` is not included
+            in a parent router
+        """
+
+        logger.debug("Build %r asynchronously", yaml_file_name)
+        if replace_router is not None and replace_router.parent_router is None:
+            raise DialogYamlException(
+                f"The router {replace_router!r} to replace is not included "
+                "in a parent router"
+            )
+
+        loop = asyncio.get_running_loop()
+        router = router or Router()
+        if i18n is not None:
+            scope = (scope or BuilderScope.default()).with_i18n(i18n)
+
+        dialog_builder = DialogYAMLBuilder(yaml_file_name, yaml_dir_path, scope=scope)
         dialog_builder.register_custom_models(models)
         dialog_builder.register_custom_states(states)
 
-        dialogs = dialog_builder._build()
+        with use_scope(scope):
+            context = contextvars.copy_context()
+
+        data = await loop.run_in_executor(executor, context.run, dialog_builder._read_data)
+        dialog_builder.states_manager.build_states_from_yaml_data(data)
+
+        dialogs = []
+        for group_name, dialog_model_data in data["dialogs"].items():
+            dialog = await loop.run_in_executor(
+                executor,
+                context.run,
+                dialog_builder._build_dialog,
+                group_name,
+                dialog_model_data,
+            )
+            dialogs.append(dialog)
+            await asyncio.sleep(0)
+
         dialog_builder._dialogs = dialogs
+        dialog_builder._router = router
+        dialog_builder._setup_router(
+            router, dialogs, media_id_storage, message_manager
+        )
+        if replace_router is not None:
+            cls._swap_router(replace_router, router)
+        return dialog_builder
+
+    @classmethod
+    def _swap_router(cls, old_router: Router, new_router: Router) -> None:
+        """Puts the new router in place of the old one in their parent router.
+
+        aiogram has no public API to detach a router, so this relies
+        on its `sub_routers` list and `_parent_router` attribute,
+        which are stable within aiogram 3 the dependency is pinned to.
+
+        :param old_router: The included router
+        :type old_router: Router
+        :param new_router: The not included router
+        :type new_router: Router
+        """
+
+        parent_router = old_router.parent_router
+        index = parent_router.sub_routers.index(old_router)
+        parent_router.include_router(new_router)
+        parent_router.sub_routers[index] = parent_router.sub_routers.pop()
+        old_router._parent_router = None
+
+    def _setup_router(
+        self,
+        router: Router,
+        dialogs: List[Dialog],
+        media_id_storage: MediaIdStorageProtocol | None = None,
+        message_manager: MessageManagerProtocol | None = None,
+    ) -> None:
         router.include_routers(*dialogs)
 
-        router.message.middleware.register(DialogYAMLMiddleware(dialog_yml=dialog_builder))
-        router.callback_query.middleware.register(
-            DialogYAMLMiddleware(dialog_yml=dialog_builder)
+        router.message.middleware.register(DialogYAMLMiddleware(dialog_yml=self))
+        router.callback_query.middleware.register(DialogYAMLMiddleware(dialog_yml=self))
+        router.errors.middleware.register(DialogYAMLMiddleware(dialog_yml=self))
+
+        setup_dialogs(
+            router,
+            media_id_storage=media_id_storage,
+            message_manager=message_manager,
         )
-        router.errors.middleware.register(DialogYAMLMiddleware(dialog_yml=dialog_builder))
-        dialog_builder._router = router
+        if dialog_observer := router.observers.get(DIALOG_EVENT_NAME):
+            dialog_observer.middleware.register(DialogYAMLMiddleware(dialog_yml=self))
 
-        setup_dialogs(router)
-        return dialog_builder
+    def attach(
+        self,
+        router: Router,
+        media_id_storage: MediaIdStorageProtocol | None = None,
+        message_manager: MessageManagerProtocol | None = None,
+    ) -> Router:
+        """Attaches the built dialogs to one more router,
+        e.g. of another `Dispatcher`.
+
+        aiogram routers can have only one parent, so light `Dialog`
+        routers are created for the new router, while the windows
+        with all their widgets are shared with the built dialogs.
+        Bots of one `Dispatcher` share the router returned by `build`
+        and don't need this method.
+
+        :param router: The router to attach the dialogs to.
+        :type router: Router
+        :param media_id_storage: The storage of Telegram file ids
+            of the sent media.
+        :type media_id_storage: MediaIdStorageProtocol
+            (optional, default: None)
+        :param message_manager: The aiogram-dialog message manager.
+        :type message_manager: MessageManagerProtocol
+            (optional, default: None)
+
+        :return: The router.
+        :rtype: Router
+        """
+
+        dialogs = [self._share_dialog(dialog) for dialog in self._dialogs]
+        self._setup_router(router, dialogs, media_id_storage, message_manager)
+        return router
+
+    @classmethod
+    def _share_dialog(cls, dialog: Dialog) -> Dialog:
+        shared_dialog = Dialog(
+            *dialog.windows.values(),
+            on_start=dialog.on_start,
+            on_close=dialog.on_close,
+            on_process_result=dialog.on_process_result,
+            launch_mode=dialog.launch_mode,
+        )
+        shared_dialog.getter = dialog.getter
+        return shared_dialog
 
     def register_custom_models(
         self,
@@ -162,16 +400,20 @@ class DialogYAMLBuilder:
         for custom_state in custom_states:
             self.states_manager.include_states_group_by_class(custom_state)
 
-    def _build(self) -> List[Dialog]:
-        """Builds the Dialog instance from the YAML file.
+    def _read_data(self, intern_strings: bool = False) -> Dict:
+        """Reads the YAML file and checks its base structure.
 
-        :return: The dialogs.
-        :rtype: List[Dialog]
+        :param intern_strings: Whether equal strings of the data are one object.
+        :type intern_strings: bool (optional, default: False)
+
+        :return: The YAML data.
+        :rtype: Dict
         """
 
-        logger.debug("Build dialogs")
         data = YAMLReader.read_data_to_dict(
-            data_file_path=self.yaml_file_name, data_dir_path=self.yaml_dir_path
+            data_file_path=self.yaml_file_name,
+            data_dir_path=self.yaml_dir_path,
+            intern_strings=intern_strings,
         )
         data_file_path = str(Path(self.yaml_dir_path) / self.yaml_file_name)
 
@@ -179,21 +421,68 @@ class DialogYAMLBuilder:
             raise DialogYamlException(f"YAML data file {data_file_path!r} not provided!")
 
         self.check_yaml_data_base_structure(data)
+        return data
+
+    def _build(
+        self,
+        processes: int | None = None,
+        threads: int | None = None,
+        intern_strings: bool = False,
+    ) -> List[Dialog]:
+        """Builds the Dialog instance from the YAML file.
+
+        :param processes: The number of processes building
+            the dialog models, the current process if not set.
+        :type processes: int (optional, default: None)
+        :param threads: The number of threads building the dialogs,
+            the current thread if not set.
+        :type threads: int (optional, default: None)
+        :param intern_strings: Whether equal strings of the YAML data
+            are one object.
+        :type intern_strings: bool (optional, default: False)
+
+        :return: The dialogs.
+        :rtype: List[Dialog]
+        """
+
+        logger.debug("Build dialogs")
+        data = self._read_data(intern_strings=intern_strings)
         self.states_manager.build_states_from_yaml_data(data)
 
-        dialog_models = {}
-        for group_name, dialog_model_data in data["dialogs"].items():
-            logger.debug("Build dialog data %r", group_name)
-            dialog_model_data["windows"] = self._build_windows(
-                group_name, dialog_model_data["windows"]
+        dialogs_data = data["dialogs"]
+        if processes and processes > 1 and len(dialogs_data) > 1:
+            from .parallel import build_dialog_models_in_processes
+
+            logger.debug("Build dialog models in %d processes", processes)
+            dialog_models = build_dialog_models_in_processes(
+                self, dialogs_data, min(processes, len(dialogs_data))
+            )
+        elif threads and threads > 1 and len(dialogs_data) > 1:
+            from .parallel import build_dialogs_in_threads
+
+            logger.debug("Build dialogs in %d threads", threads)
+            return build_dialogs_in_threads(
+                self, dialogs_data, min(threads, len(dialogs_data))
             )
-            dialog_model = DialogModel.to_model(dialog_model_data)
-            dialog_models[group_name] = dialog_model
+        else:
+            dialog_models = {}
+            for group_name, dialog_model_data in dialogs_data.items():
+                dialog_models[group_name] = self._build_dialog_model(
+                    group_name, dialog_model_data
+                )
 
         dialogs = self._build_dialogs(dialog_models)
 
         return dialogs
 
+    def _build_dialog_model(self, group_name: str, dialog_model_data: Dict) -> DialogModel:
+        logger.debug("Build dialog data %r", group_name)
+        windows = self._build_windows(group_name, dialog_model_data["windows"])
+        return DialogModel.to_model({**dialog_model_data, "windows": windows})
+
+    def _build_dialog(self, group_name: str, dialog_model_data: Dict) -> Dialog:
+        return self._build_dialog_model(group_name, dialog_model_data).to_object()
+
     def _build_dialogs(self, dialog_models: Dict) -> List[Dialog]:
         logger.debug("Create dialogs")
         dialogs = [dialog_model.to_object() for dialog_model in dialog_models.values()]
@@ -212,10 +501,11 @@ class DialogYAMLBuilder:
         self, group_name: str, state_name: str, window_data: Dict
     ) -> BaseModel:
         logger.debug("Build window data %r", state_name)
-        window_data["state"] = self.states_manager.format_state_name(
-            group_name, state_name
-        )
-        window_data["widgets"] = self._build_widgets(window_data["widgets"])
+        window_data = {
+            **window_data,
+            "state": self.states_manager.format_state_name(group_name, state_name),
+            "widgets": self._build_widgets(window_data["widgets"]),
+        }
         window_model = self.model_factory.create_model({"window": window_data})
 
         return window_model
@@ -1,12 +1,17 @@
 import functools
+import threading
 from typing import Type
 
 
 def singleton(cls: Type):
+    lock = threading.Lock()
+
     @functools.wraps(cls)
     def wrapper(*args, **kwargs):
         if not wrapper.instance:
-            wrapper.instance = cls(*args, **kwargs)
+            with lock:
+                if not wrapper.instance:
+                    wrapper.instance = cls(*args, **kwargs)
         return wrapper.instance
 
     wrapper.instance = None
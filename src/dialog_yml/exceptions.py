@@ -71,3 +71,34 @@ class InvalidTagDataType(DialogYamlException):
         self.tag = tag
         message = message.format(tag=tag)
         super().__init__(message)
+
+
+class InvalidExpressionError(DialogYamlException):
+    def __init__(self, expression: str, reason: str):
+        message = f"Invalid expression {expression!r}: {reason}"
+        super().__init__(message)
+
+
+class FunctionOverrideError(DialogYamlException):
+    def __init__(self, bot_id: int, function_names: list[str]):
+        message = (
+            f"Functions {', '.join(function_names)} of bot {bot_id} can't be "
+            "overridden: they were built without overrides, add the bot "
+            "before the build"
+        )
+        super().__init__(message)
+
+
+class RenderCacheKeysError(DialogYamlException):
+    def __init__(self, state: str):
+        message = (
+            f"Render cache of window {state!r}: the data keys its widgets use "
+            "can't be inferred, list them in `render_cache.keys`"
+        )
+        super().__init__(message)
+
+
+class ShardWorkerError(DialogYamlException):
+    def __init__(self, index: int, exitcode: int):
+        message = f"Shard worker {index} exited with code {exitcode}"
+        super().__init__(message)
@@ -0,0 +1,135 @@
+"""The `src.i18n` module provides localized YAML texts resolved
+against compiled gettext catalogs.
+
+Texts marked with `i18n: true` hold a message id instead of the text.
+Catalogs (`<path>/<locale>/LC_MESSAGES/<domain>.mo`, compiled with
+`pybabel compile`) are loaded lazily, when a text is first rendered
+for a user with that locale.
+
+Classes:
+---------
+- I18nCatalogs: Lazily loaded compiled catalogs and the user locale lookup.
+"""
+
+import os
+import threading
+from typing import Dict, FrozenSet, Optional
+
+from aiogram_dialog.api.protocols import DialogManager
+from babel.support import NullTranslations, Translations
+
+DEFAULT_DOMAIN = "messages"
+DEFAULT_LOCALE = "en"
+
+
+class I18nCatalogs:
+    """Compiled gettext catalogs of all the locales.
+
+    :param path: The directory with the locale directories
+    :type path: str
+    :param domain: The catalogs domain, the `.mo` file name
+    :type domain: str (optional, default: DEFAULT_DOMAIN)
+    :param default_locale: The locale of users with an unknown
+        or unsupported language
+    :type default_locale: str (optional, default: DEFAULT_LOCALE)
+    """
+
+    def __init__(
+        self,
+        path: str,
+        domain: str = DEFAULT_DOMAIN,
+        default_locale: str = DEFAULT_LOCALE,
+    ):
+        self.path = path
+        self.domain = domain
+        self.default_locale = default_locale
+        self._lock = threading.Lock()
+        self._available_locales: Optional[FrozenSet[str]] = None
+        self._translations: Dict[str, NullTranslations] = {}
+        self._locales: Dict[Optional[str], str] = {}
+
+    @property
+    def available_locales(self) -> FrozenSet[str]:
+        """The locales with a compiled catalog."""
+
+        if self._available_locales is None:
+            self._available_locales = frozenset(
+                name
+                for name in (os.listdir(self.path) if os.path.isdir(self.path) else [])
+                if os.path.isfile(
+                    os.path.join(self.path, name, "LC_MESSAGES", f"{self.domain}.mo")
+                )
+            )
+        return self._available_locales
+
+    def get_translations(self, locale: str) -> NullTranslations:
+        """Returns the catalog of the locale, loading it on the first call.
+
+        :param locale: The locale
+        :type locale: str
+
+        :return: The translations, `NullTranslations` if there is no catalog
+        :rtype: NullTranslations
+        """
+
+        translations = self._translations.get(locale)
+        if translations is None:
+            with self._lock:
+                translations = self._translations.get(locale)
+                if translations is None:
+                    translations = Translations.load(self.path, [locale], self.domain)
+                    self._translations[locale] = translations
+        return translations
+
+    def gettext(self, message_id: str, locale: str) -> str:
+        """Translates the message id to the locale.
+
+        :param message_id: The message id
+        :type message_id: str
+        :param locale: The locale
+        :type locale: str
+
+        :return: The translated text, the message id if not translated
+        :rtype: str
+        """
+
+        return self.get_translations(locale).gettext(message_id)
+
+    def resolve_locale(self, language_code: Optional[str]) -> str:
+        """Returns the supported locale for the Telegram language code,
+        e.g. `pt_BR` or `pt` for `pt-br`, the default locale otherwise.
+
+        :param language_code: The IETF language code of the user
+        :type language_code: Optional[str]
+
+        :return: The locale
+        :rtype: str
+        """
+
+        locale = self._locales.get(language_code)
+        if locale is None:
+            locale = self.default_locale
+            if language_code:
+                language, _, territory = language_code.replace("-", "_").partition("_")
+                candidates = [language.lower()]
+                if territory:
+                    candidates.insert(0, f"{language.lower()}_{territory.upper()}")
+                for candidate in candidates:
+                    if candidate in self.available_locales:
+                        locale = candidate
+                        break
+            self._locales[language_code] = locale
+        return locale
+
+    def get_locale(self, manager: DialogManager) -> str:
+        """Returns the locale of the user of the current update.
+
+        :param manager: The dialog manager
+        :type manager: DialogManager
+
+        :return: The locale
+        :rtype: str
+        """
+
+        user = manager.middleware_data.get("event_from_user")
+        return self.resolve_locale(user.language_code if user else None)
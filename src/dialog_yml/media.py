@@ -0,0 +1,311 @@
+import asyncio
+import hashlib
+import logging
+import mmap
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncGenerator, Optional, Union
+
+from aiogram import Bot
+from aiogram.enums import ContentType
+from aiogram.types import InputFile
+from aiogram.types.input_file import DEFAULT_CHUNK_SIZE
+from aiogram_dialog.api.entities import MediaAttachment, MediaId
+from aiogram_dialog.api.protocols import MediaIdStorageProtocol
+from aiogram_dialog.manager.message_manager import MessageManager
+
+logger = logging.getLogger(__name__)
+
+HASH_CHUNK_SIZE = 1024 * 1024
+DEFAULT_MEDIA_CACHE_SIZE = 64 * 1024 * 1024
+DEFAULT_MMAP_THRESHOLD = 8 * 1024 * 1024
+DEFAULT_MEDIA_READ_WORKERS = 4
+
+
+def file_content_hash(path: str) -> str:
+    """Returns the hex digest of the file content.
+
+    :param path: The file path
+    :type path: str
+
+    :return: The blake2b hex digest
+    :rtype: str
+    """
+
+    digest = hashlib.blake2b(digest_size=20)
+    with open(path, "rb") as file:
+        while chunk := file.read(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class SqliteMediaIdStorage(MediaIdStorageProtocol):
+    """Persistent storage of Telegram file ids of the sent media.
+
+    aiogram-dialog uploads a local file on the first send and stores
+    the returned file id in the media id storage, so the next sends
+    reuse it. The default storage lives in memory and is lost on
+    restart; this one keeps the ids in a sqlite database keyed by the
+    file path and its content hash, so a changed file is uploaded again.
+
+    Content hashes are cached by the file modification time and size,
+    the files are hashed and the database is queried in a thread.
+
+    :param db_path: The sqlite database file path
+    :type db_path: str
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(db_path, check_same_thread=False)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS media_ids ("
+            "path TEXT NOT NULL, url TEXT NOT NULL, type TEXT NOT NULL, "
+            "hash TEXT NOT NULL, file_id TEXT NOT NULL, file_unique_id TEXT, "
+            "PRIMARY KEY (path, url, type, hash))"
+        )
+        self._connection.commit()
+        self._hashes: dict[str, tuple[int, int, str]] = {}
+        self._media_ids: dict[tuple, Optional[MediaId]] = {}
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    def _get_hash(self, path: Optional[str]) -> Optional[str]:
+        if not path:
+            return ""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+
+        cached = self._hashes.get(path)
+        if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+            return cached[2]
+
+        content_hash = file_content_hash(path)
+        self._hashes[path] = (stat.st_mtime_ns, stat.st_size, content_hash)
+        return content_hash
+
+    def _get_key(
+        self, path: Optional[str], url: Optional[str], type: ContentType
+    ) -> Optional[tuple]:
+        content_hash = self._get_hash(path)
+        if content_hash is None:
+            return None
+        return path or "", url or "", str(type), content_hash
+
+    def _get(
+        self, path: Optional[str], url: Optional[str], type: ContentType
+    ) -> Optional[MediaId]:
+        with self._lock:
+            key = self._get_key(path, url, type)
+            if key is None:
+                return None
+            if key in self._media_ids:
+                return self._media_ids[key]
+
+            row = self._connection.execute(
+                "SELECT file_id, file_unique_id FROM media_ids "
+                "WHERE path = ? AND url = ? AND type = ? AND hash = ?",
+                key,
+            ).fetchone()
+            media_id = MediaId(*row) if row else None
+            self._media_ids[key] = media_id
+            return media_id
+
+    def _save(
+        self,
+        path: Optional[str],
+        url: Optional[str],
+        type: ContentType,
+        media_id: MediaId,
+    ) -> None:
+        with self._lock:
+            key = self._get_key(path, url, type)
+            if key is None:
+                return
+            self._connection.execute(
+                "INSERT OR REPLACE INTO media_ids "
+                "(path, url, type, hash, file_id, file_unique_id) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (*key, media_id.file_id, media_id.file_unique_id),
+            )
+            self._connection.commit()
+            self._media_ids[key] = media_id
+
+    async def get_media_id(
+        self,
+        path: Optional[str],
+        url: Optional[str],
+        type: ContentType,
+    ) -> Optional[MediaId]:
+        if not path and not url:
+            return None
+        return await asyncio.to_thread(self._get, path, url, type)
+
+    async def save_media_id(
+        self,
+        path: Optional[str],
+        url: Optional[str],
+        type: ContentType,
+        media_id: MediaId,
+    ) -> None:
+        if not path and not url:
+            return
+        logger.debug("Save media id for path=%r url=%r", path, url)
+        await asyncio.to_thread(self._save, path, url, type, media_id)
+
+
+class MediaFileCache:
+    """Reader of local media files running in a thread pool.
+
+    Files smaller than `mmap_threshold` are read into memory and kept
+    in an LRU bounded by the total size in bytes. Larger files are
+    memory-mapped, so their content is paged in by the OS and never
+    copied into the process heap. Entries are invalidated when the file
+    modification time or size changes.
+
+    :param max_size: The maximum total size of the cached files in bytes
+    :type max_size: int (optional, default: DEFAULT_MEDIA_CACHE_SIZE)
+    :param mmap_threshold: The file size starting from which
+        the file is memory-mapped
+    :type mmap_threshold: int (optional, default: DEFAULT_MMAP_THRESHOLD)
+    :param max_workers: The number of reading threads
+    :type max_workers: int (optional, default: DEFAULT_MEDIA_READ_WORKERS)
+    """
+
+    def __init__(
+        self,
+        max_size: int = DEFAULT_MEDIA_CACHE_SIZE,
+        mmap_threshold: int = DEFAULT_MMAP_THRESHOLD,
+        max_workers: int = DEFAULT_MEDIA_READ_WORKERS,
+    ):
+        self.max_size = max_size
+        self.mmap_threshold = mmap_threshold
+        self.size = 0
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="dialog-yml-media"
+        )
+        self._lock = threading.Lock()
+        self._files: OrderedDict[str, tuple[int, int, bytes]] = OrderedDict()
+        self._mmaps: dict[str, tuple[int, int, mmap.mmap]] = {}
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False)
+        with self._lock:
+            self._files.clear()
+            self._mmaps.clear()
+            self.size = 0
+
+    def _get_cached(self, path: str, stat: os.stat_result) -> Union[bytes, mmap.mmap, None]:
+        version = (stat.st_mtime_ns, stat.st_size)
+        if (mapped := self._mmaps.get(path)) and mapped[:2] == version:
+            return mapped[2]
+        if (cached := self._files.get(path)) and cached[:2] == version:
+            self._files.move_to_end(path)
+            return cached[2]
+        return None
+
+    def _put_file(self, path: str, stat: os.stat_result, data: bytes) -> None:
+        if old := self._files.pop(path, None):
+            self.size -= len(old[2])
+        if len(data) > self.max_size:
+            return
+        self._files[path] = (stat.st_mtime_ns, stat.st_size, data)
+        self.size += len(data)
+        while self.size > self.max_size:
+            _, (_, _, evicted) = self._files.popitem(last=False)
+            self.size -= len(evicted)
+
+    def _read(self, path: str) -> Union[bytes, mmap.mmap]:
+        stat = os.stat(path)
+        with self._lock:
+            if (cached := self._get_cached(path, stat)) is not None:
+                return cached
+
+        with open(path, "rb") as file:
+            if stat.st_size >= self.mmap_threshold:
+                data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                data = file.read()
+
+        with self._lock:
+            if isinstance(data, mmap.mmap):
+                # The replaced map is closed by GC once no upload uses it
+                self._mmaps[path] = (stat.st_mtime_ns, stat.st_size, data)
+            else:
+                self._put_file(path, stat, data)
+        return data
+
+    async def read(self, path: str) -> Union[bytes, mmap.mmap]:
+        """Returns the file content without blocking the event loop.
+
+        :param path: The file path
+        :type path: str
+
+        :return: The file bytes or the read-only memory map
+        :rtype: Union[bytes, mmap.mmap]
+        """
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._read, path)
+
+
+class CachedInputFile(InputFile):
+    """Local file uploaded from a `MediaFileCache`.
+
+    Chunks are memoryview slices of the cached content, so neither
+    the cached bytes nor the memory map are copied.
+
+    :param path: The file path
+    :type path: str
+    :param cache: The media file cache
+    :type cache: MediaFileCache
+    """
+
+    def __init__(
+        self,
+        path: str,
+        cache: MediaFileCache,
+        filename: Optional[str] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ):
+        super().__init__(
+            filename=filename or os.path.basename(path), chunk_size=chunk_size
+        )
+        self.path = path
+        self.cache = cache
+
+    async def read(self, bot: Bot) -> AsyncGenerator[memoryview, None]:
+        view = memoryview(await self.cache.read(self.path))
+        try:
+            for start in range(0, len(view), self.chunk_size):
+                yield view[start : start + self.chunk_size]
+        finally:
+            view.release()
+
+
+class CachedMediaMessageManager(MessageManager):
+    """aiogram-dialog message manager uploading local media
+    through a `MediaFileCache` instead of reading the file on every send.
+
+    :param cache: The media file cache
+    :type cache: MediaFileCache (optional, default: MediaFileCache())
+    """
+
+    def __init__(self, cache: Optional[MediaFileCache] = None):
+        super().__init__()
+        self.cache = cache or MediaFileCache()
+
+    async def get_media_source(
+        self, media: MediaAttachment, bot: Bot
+    ) -> Union[InputFile, str]:
+        if media.file_id or media.url or not media.path:
+            return await super().get_media_source(media, bot)
+        return CachedInputFile(str(media.path), self.cache)
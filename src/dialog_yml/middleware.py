@@ -3,6 +3,8 @@ from typing import Callable, Dict, Any, Awaitable
 from aiogram import BaseMiddleware
 from aiogram.types import TelegramObject
 
+from dialog_yml.variants import current_bot_id
+
 
 class DialogYAMLMiddleware(BaseMiddleware):
     async def __call__(
@@ -12,7 +14,12 @@ class DialogYAMLMiddleware(BaseMiddleware):
         data: Dict[str, Any],
     ) -> Any:
         data["dialog_yml"] = self.dialog_yml
-        return await handler(event, data)
+        bot = data.get("bot")
+        token = current_bot_id.set(bot.id if bot else None)
+        try:
+            return await handler(event, data)
+        finally:
+            current_bot_id.reset(token)
 
     def __init__(self, dialog_yml):
         self.dialog_yml = dialog_yml
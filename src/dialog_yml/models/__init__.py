@@ -17,8 +17,9 @@ Classes:
 
 import logging
 import re
+import threading
 from logging import Logger
-from typing import Type, Union, Dict, Any
+from typing import Type, Union, Dict, Any, Iterable, Optional
 
 from pydantic import ValidationError, BaseModel
 
@@ -28,6 +29,8 @@ from dialog_yml.exceptions import (
     DialogYamlException,
 )
 from dialog_yml.models.base import YAMLModel
+from dialog_yml.models.registry import LazyModelClasses
+from dialog_yml.scope import get_current_scope
 
 logger: Logger = logging.getLogger(__name__)
 
@@ -50,6 +53,29 @@ class YAMLModelFactory:
     """
 
     _models_classes: Dict[str, Type[YAMLModel]] = {}
+    _lock = threading.RLock()
+
+    @classmethod
+    def new_factory(
+        cls, models_classes: Dict[str, Type[YAMLModel]] | None = None
+    ) -> Type["YAMLModelFactory"]:
+        """Creates a factory with its own registered model classes,
+        initialized with a copy of the classes of this factory.
+
+        :param models_classes: The model classes of the new factory.
+        :type models_classes: Dict[str, Type[YAMLModel]] (optional, default: None)
+
+        :return: The new factory class.
+        :rtype: Type[YAMLModelFactory]
+        """
+
+        if models_classes is None:
+            models_classes = cls._models_classes
+        return type(
+            cls.__name__,
+            (cls,),
+            {"_models_classes": LazyModelClasses(models_classes)},
+        )
 
     @classmethod
     def is_valid_tag(cls, tag: str) -> bool:
@@ -146,16 +172,17 @@ class YAMLModelFactory:
         """
 
         if cls._is_valid(tag, model_class):
-            registered_model_class = cls.get_model_class(tag)
+            with cls._lock:
+                registered_model_class = cls.get_model_class(tag)
 
-            if registered_model_class and not replace_existing:
-                raise ModelRegistrationError(
-                    tag,
-                    registered_model_class,
-                    message="{tag!r} already registered with {model_class!r}",
-                )
+                if registered_model_class and not replace_existing:
+                    raise ModelRegistrationError(
+                        tag,
+                        registered_model_class,
+                        message="{tag!r} already registered with {model_class!r}",
+                    )
 
-            cls._models_classes[tag] = model_class
+                cls._models_classes[tag] = model_class
 
     @classmethod
     def get_model_class(cls, tag: str) -> Union[Type[YAMLModel], None]:
@@ -173,27 +200,76 @@ class YAMLModelFactory:
         return cls._models_classes.get(tag)
 
     @classmethod
-    def set_classes(cls, models_classes: Dict[str, Type[YAMLModel]]) -> None:
+    def set_classes(
+        cls, models_classes: Union[Dict[str, Type[YAMLModel]], LazyModelClasses]
+    ) -> None:
         """Sets the registered custom model classes.
 
+        Classes of a `LazyModelClasses` registry given by import paths
+        are not imported here, only their tags are validated.
+
         :param models_classes: A dictionary of custom
             model classes with their tags.
-        :type models_classes: Dict[str, Type[YAMLModel]]
+        :type models_classes: Union[Dict[str, Type[YAMLModel]], LazyModelClasses]
 
         :raises DialogYamlException: When `models_classes` is not
             a valid dictionary of model classes.
         """
 
-        if not isinstance(models_classes, dict):
+        if not isinstance(models_classes, (dict, LazyModelClasses)):
             raise DialogYamlException(
                 "models_classes must be a dictionary of strings to YAMLModel classes"
             )
 
-        for key, value in models_classes.items():
+        if isinstance(models_classes, LazyModelClasses):
+            for key in models_classes:
+                cls.is_valid_tag(key)
+            loaded_classes = models_classes.loaded_items()
+        else:
+            loaded_classes = models_classes
+        for key, value in loaded_classes.items():
             cls._is_valid(key, value)
 
         cls._models_classes = models_classes
 
+    @classmethod
+    def warm_up(cls, tags: Optional[Iterable[str]] = None) -> int:
+        """Builds the pydantic schemas of the model classes in advance.
+
+        Models are defined with deferred schema building, so a schema
+        is built on the first validation of its model. Warming up moves
+        this cost out of the first build, e.g. to a worker startup.
+        The models reference each other, so the schemas are built
+        one by one under the factory lock.
+
+        :param tags: The tags of the models, all the registered tags if not set.
+        :type tags: Iterable[str] (optional, default: None)
+
+        :return: The number of built schemas.
+        :rtype: int
+
+        :raises InvalidTagName: When a tag is not registered.
+        """
+
+        model_classes = []
+        for tag in cls._models_classes if tags is None else tags:
+            model_class = cls.get_model_class(tag)
+            if model_class is None:
+                raise InvalidTagName(tag, "{tag!r} is not registered")
+            if not model_class.__pydantic_complete__ and model_class not in model_classes:
+                model_classes.append(model_class)
+
+        if not model_classes:
+            return 0
+
+        logger.debug("Build schemas of %d models", len(model_classes))
+        built = 0
+        with cls._lock:
+            for model_class in model_classes:
+                # None if built meanwhile as a dependency of a previous model
+                built += bool(model_class.model_rebuild())
+        return built
+
     @classmethod
     def create_model(cls, yaml_data: Dict[str, Any]) -> YAMLModel:
         """Creates an instance of a custom model class based on YAML data.
@@ -228,3 +304,15 @@ class YAMLModelFactory:
             raise DialogYamlException(f"Failed to parse tag {tag!r}: {e}") from e
 
         return model
+
+
+def get_model_factory() -> Type[YAMLModelFactory]:
+    """Returns the model factory of the current builder scope,
+    `YAMLModelFactory` by default.
+
+    :return: The model factory class
+    :rtype: Type[YAMLModelFactory]
+    """
+
+    scope = get_current_scope()
+    return scope.model_factory if scope else YAMLModelFactory
@@ -4,7 +4,7 @@ from typing import Any, Self
 from aiogram_dialog.api.internal import Widget
 from pydantic import ConfigDict, BaseModel
 
-from dialog_yml.models.funcs.func import FuncField
+from dialog_yml.models.funcs.expression import WhenField
 
 
 class YAMLModel(BaseModel, ABC):
@@ -17,7 +17,9 @@ class YAMLModel(BaseModel, ABC):
     :vartype model_config: ConfigDict
     """
 
-    model_config = ConfigDict(arbitrary_types_allowed=True, extra="allow")
+    model_config = ConfigDict(
+        arbitrary_types_allowed=True, extra="allow", defer_build=True
+    )
 
     @classmethod
     @abstractmethod
@@ -32,15 +34,16 @@ class YAMLModel(BaseModel, ABC):
 class WidgetModel(YAMLModel):
     """Base class for all widget models.
 
-    :ivar when: The function to be called when the widget is selected.
-        FuncField the pydantic annotation to FuncModel
-    :vartype when: FuncField
+    :ivar when: The condition of the widget to be shown: the function
+        name or the expression over the render data.
+        WhenField the pydantic annotation to FuncModel or ExpressionModel
+    :vartype when: WhenField
     """
 
     def to_object(self):
         raise NotImplementedError()
 
-    when: FuncField = None
+    when: WhenField = None
 
     @classmethod
     def to_model(cls, data: Any):
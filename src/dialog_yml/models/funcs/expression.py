@@ -0,0 +1,227 @@
+import ast
+from functools import lru_cache
+from typing import Annotated, Any, Callable, Dict, Self, Union
+
+from pydantic import BaseModel, BeforeValidator, ConfigDict, PrivateAttr, model_validator
+
+from dialog_yml.exceptions import InvalidExpressionError
+from dialog_yml.models.funcs.func import FuncModel
+
+SAFE_FUNCTIONS: Dict[str, Callable] = {
+    "len": len,
+    "abs": abs,
+    "min": min,
+    "max": max,
+    "any": any,
+    "all": all,
+}
+
+ALLOWED_NODES = (
+    ast.Expression,
+    ast.BoolOp,
+    ast.And,
+    ast.Or,
+    ast.UnaryOp,
+    ast.Not,
+    ast.USub,
+    ast.UAdd,
+    ast.BinOp,
+    ast.Add,
+    ast.Sub,
+    ast.Mult,
+    ast.Div,
+    ast.FloorDiv,
+    ast.Mod,
+    ast.Compare,
+    ast.Eq,
+    ast.NotEq,
+    ast.Lt,
+    ast.LtE,
+    ast.Gt,
+    ast.GtE,
+    ast.In,
+    ast.NotIn,
+    ast.Is,
+    ast.IsNot,
+    ast.IfExp,
+    ast.Name,
+    ast.Constant,
+    ast.Attribute,
+    ast.Subscript,
+    ast.Call,
+    ast.Tuple,
+    ast.List,
+    ast.Set,
+    ast.Load,
+)
+
+Predicate = Callable[[dict, Any, Any], bool]
+
+
+class _ExpressionTransformer(ast.NodeTransformer):
+    """Validates the expression tree and replaces data names
+    with `data.get(name)` lookups."""
+
+    def __init__(self, expression: str):
+        self.expression = expression
+
+    def error(self, reason: str) -> InvalidExpressionError:
+        return InvalidExpressionError(self.expression, reason)
+
+    def generic_visit(self, node: ast.AST) -> ast.AST:
+        if not isinstance(node, ALLOWED_NODES):
+            raise self.error(f"{type(node).__name__} is not allowed")
+        return super().generic_visit(node)
+
+    def visit_Name(self, node: ast.Name) -> ast.AST:
+        if node.id.startswith("_"):
+            raise self.error(f"name {node.id!r} is not allowed")
+        return ast.copy_location(
+            ast.Call(
+                func=ast.Attribute(
+                    value=ast.Name(id="data", ctx=ast.Load()),
+                    attr="get",
+                    ctx=ast.Load(),
+                ),
+                args=[ast.Constant(value=node.id)],
+                keywords=[],
+            ),
+            node,
+        )
+
+    def visit_Attribute(self, node: ast.Attribute) -> ast.AST:
+        if node.attr.startswith("_"):
+            raise self.error(f"attribute {node.attr!r} is not allowed")
+        return self.generic_visit(node)
+
+    def visit_Subscript(self, node: ast.Subscript) -> ast.AST:
+        if isinstance(node.slice, ast.Slice):
+            raise self.error("slices are not allowed")
+        return self.generic_visit(node)
+
+    def visit_Call(self, node: ast.Call) -> ast.AST:
+        if not isinstance(node.func, ast.Name) or node.func.id not in SAFE_FUNCTIONS:
+            raise self.error(f"only {', '.join(SAFE_FUNCTIONS)} calls are allowed")
+        if node.keywords:
+            raise self.error("keyword arguments are not allowed")
+        node.args = [self.visit(arg) for arg in node.args]
+        return node
+
+
+@lru_cache(maxsize=None)
+def compile_expression(expression: str) -> Predicate:
+    """Compiles the expression into a `when` predicate.
+
+    Equal expressions share the predicate, so they can be memoized
+    per render like shared functions.
+
+    Names in the expression are looked up in the render data,
+    missing names are `None`. Supported are boolean operators,
+    comparisons, arithmetic, attribute and item access,
+    literals and the `SAFE_FUNCTIONS` calls.
+
+    :param expression: The expression, e.g. `"count > 0 and not banned"`
+    :type expression: str
+
+    :return: The predicate called with `(data, widget, manager)`
+    :rtype: Predicate
+
+    :raises InvalidExpressionError: If the expression can't be parsed
+        or uses not allowed syntax
+    """
+
+    try:
+        tree = ast.parse(expression.strip(), mode="eval")
+    except SyntaxError as e:
+        raise InvalidExpressionError(expression, e.msg) from e
+
+    body = _ExpressionTransformer(expression).visit(tree).body
+    predicate = ast.Expression(
+        body=ast.Lambda(
+            args=ast.arguments(
+                posonlyargs=[],
+                args=[ast.arg(arg=name) for name in ("data", "widget", "manager")],
+                kwonlyargs=[],
+                kw_defaults=[],
+                defaults=[],
+            ),
+            body=ast.Call(
+                func=ast.Name(id="bool", ctx=ast.Load()),
+                args=[body],
+                keywords=[],
+            ),
+        )
+    )
+    code = compile(ast.fix_missing_locations(predicate), "<when>", "eval")
+    return eval(code, {"__builtins__": {}, "bool": bool, **SAFE_FUNCTIONS})
+
+
+class ExpressionModel(BaseModel):
+    """The ExpressionModel class represents a `when` condition
+    written as an expression over the render data.
+
+    The expression is compiled once, when the model is created.
+
+    :ivar expr: The expression text
+    :vartype expr: str
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True, defer_build=True)
+
+    expr: str
+    _func: Predicate = PrivateAttr()
+
+    @model_validator(mode="after")
+    def compile_expr(self) -> Self:
+        self._func = compile_expression(self.expr)
+        return self
+
+    @property
+    def func(self) -> Predicate:
+        return self._func
+
+    def to_object(self) -> Predicate:
+        return self.func
+
+    def __getstate__(self) -> dict:
+        # The compiled predicate is not picklable, it is compiled again on load
+        return {**super().__getstate__(), "__pydantic_private__": {}}
+
+    def __setstate__(self, state: dict) -> None:
+        super().__setstate__(state)
+        self._func = compile_expression(self.expr)
+
+    @classmethod
+    def to_model(cls, data: Union[str, dict, Self]) -> Self:
+        if isinstance(data, cls):
+            return data
+        if isinstance(data, str):
+            data = {"expr": data}
+        return cls(**data)
+
+
+def to_when_model(data: Any) -> Union[FuncModel, ExpressionModel, None]:
+    """Converts `when` data to a model.
+
+    A bare identifier is the name of a registered function,
+    any other string and a dict with the `expr` key is an expression.
+
+    :param data: The `when` data
+    :type data: Any
+
+    :return: The function or expression model
+    :rtype: Union[FuncModel, ExpressionModel, None]
+    """
+
+    if data is None or isinstance(data, (FuncModel, ExpressionModel)):
+        return data
+    if isinstance(data, str) and not data.strip().isidentifier():
+        return ExpressionModel.to_model(data)
+    if isinstance(data, dict) and "expr" in data:
+        return ExpressionModel.to_model(data)
+    return FuncModel.to_model(data)
+
+
+WhenField = Annotated[
+    Union[FuncModel, ExpressionModel], BeforeValidator(to_when_model)
+]
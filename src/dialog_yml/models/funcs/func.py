@@ -1,4 +1,5 @@
 import asyncio
+import threading
 from enum import Enum
 from typing import (
     Dict,
@@ -27,6 +28,7 @@ from dialog_yml.exceptions import (
     CategoryNotFoundError,
     FunctionNotFoundError,
 )
+from dialog_yml.scope import get_current_scope
 from dialog_yml.utils import clean_empty
 
 
@@ -65,6 +67,7 @@ class Category:
     def __init__(self, name: Union[str, CategoryName] = CategoryName.func):
         self._name = name.value if isinstance(name, CategoryName) else name
         self._functions = {}
+        self._lock = threading.Lock()
 
     def __str__(self):
         return f"Category(name={self._name}, functions={self._functions})"
@@ -85,10 +88,11 @@ class Category:
             raise InvalidFunctionType(str(function))
 
         function_name = function.__name__
-        if function_name in self._functions:
-            raise FunctionRegistrationError(self._name, function_name)
+        with self._lock:
+            if function_name in self._functions:
+                raise FunctionRegistrationError(self._name, function_name)
 
-        self._functions[function_name] = function
+            self._functions[function_name] = function
 
     def get(self, function_name: str) -> Union[Callable, Awaitable, None]:
         """Retrieve a function from the category.
@@ -202,26 +206,57 @@ async def notify_func(
     )
 
 
+def create_funcs_registry() -> FuncsRegistry:
+    """Creates a new functions registry, not the process-wide one,
+    with the default notify function registered.
+
+    :return: The functions registry
+    :rtype: FuncsRegistry
+    """
+
+    registry = FuncsRegistry.__wrapped__()
+    registry.notify.register(function=notify_func)
+    return registry
+
+
 function_registry = FuncsRegistry()
 function_registry.notify.register(function=notify_func)
 
 
+def get_function_registry() -> FuncsRegistry:
+    """Returns the functions registry of the current builder scope,
+    the process-wide one by default.
+
+    :return: The functions registry
+    :rtype: FuncsRegistry
+    """
+
+    scope = get_current_scope()
+    return scope.funcs_registry if scope else function_registry
+
+
 class FuncModel(BaseModel):
     def to_object(self) -> Union[Callable, Awaitable]:
         return self.func
 
-    model_config = ConfigDict(arbitrary_types_allowed=True, extra="allow")
+    model_config = ConfigDict(
+        arbitrary_types_allowed=True, extra="allow", defer_build=True
+    )
 
     category_name: str = CategoryName.func.value
     name: str
 
     @property
     def data(self) -> Dict:
-        return clean_empty({"extra_data": self.model_extra})
+        # A copy, so that callbacks using the data don't keep the model
+        return clean_empty({"extra_data": dict(self.model_extra)})
 
     @property
     def func(self):
-        f = function_registry.get_function(self.name, self.category_name)
+        f = get_function_registry().get_function(self.name, self.category_name)
+        scope = get_current_scope()
+        if scope and scope.variants and f is not None:
+            f = scope.variants.wrap(self.name, f)
         return f
 
     async def run_async(self, *args, **kwargs):
@@ -232,7 +267,7 @@ class FuncModel(BaseModel):
         category_name = self.category_name
         func_name = self.name
 
-        f = function_registry.get_function(func_name, category_name)
+        f = get_function_registry().get_function(func_name, category_name)
 
         if f is None:
             raise FunctionNotFoundError(category_name, func_name)
@@ -268,7 +303,7 @@ class NotifyModel(FuncModel):
                 "text": self.text,
                 "show_alert": self.show_alert,
                 "delay": self.delay,
-                "extra_data": self.model_extra,
+                "extra_data": dict(self.model_extra),
             }
         )
 
@@ -276,7 +311,8 @@ class NotifyModel(FuncModel):
     def to_model(cls, data: Union[str, dict, Self]) -> Self:
         if isinstance(data, cls):
             return data
-        if isinstance(data, dict):
+        if isinstance(data, dict) and "val" in data:
+            data = dict(data)
             if val := data.pop("val"):
                 data["text"] = val
         if isinstance(data, str):
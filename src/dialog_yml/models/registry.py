@@ -0,0 +1,142 @@
+"""The `src.models.registry` module provides the lazy registry
+of model classes.
+
+A tag may be registered with the import path of its model class
+instead of the class itself. The module of the class is imported
+on the first lookup of the tag, so configurations pay the import
+cost of the widgets they use only.
+
+Classes:
+---------
+- LazyModelClasses: Mapping of tags to model classes or their import paths.
+
+Functions:
+---------
+- make_classes_getattr: Module `__getattr__` of the widgets packages.
+"""
+
+import importlib
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Dict,
+    Iterator,
+    Mapping,
+    MutableMapping,
+    Type,
+    Union,
+)
+
+from dialog_yml.exceptions import DialogYamlException
+
+if TYPE_CHECKING:
+    from dialog_yml.models.base import YAMLModel
+
+ModelClass = Type["YAMLModel"]
+
+
+class LazyModelClasses(MutableMapping):
+    """Mapping of tags to model classes.
+
+    Values may be given as `"package.module:ClassName"` import paths,
+    which are resolved and replaced by the class on the first lookup.
+    Merging registries keeps unresolved paths unresolved.
+
+    :param sources: Mappings merged in order, later ones win
+    :type sources: Mapping[str, Union[ModelClass, str]]
+    """
+
+    def __init__(self, *sources: Mapping[str, Union[ModelClass, str]]):
+        self._entries: Dict[str, Union[ModelClass, str]] = {}
+        for source in sources:
+            self.update(source)
+
+    @classmethod
+    def _import(cls, tag: str, path: str) -> ModelClass:
+        module_name, _, class_name = path.partition(":")
+        try:
+            return getattr(importlib.import_module(module_name), class_name)
+        except (ImportError, AttributeError) as e:
+            raise DialogYamlException(
+                f"Failed to import model {path!r} of tag {tag!r}: {e}"
+            ) from e
+
+    def __getitem__(self, tag: str) -> ModelClass:
+        value = self._entries[tag]
+        if isinstance(value, str):
+            value = self._import(tag, value)
+            self._entries[tag] = value
+        return value
+
+    def __setitem__(self, tag: str, value: Union[ModelClass, str]) -> None:
+        self._entries[tag] = value
+
+    def __delitem__(self, tag: str) -> None:
+        del self._entries[tag]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self._entries!r})"
+
+    def update(self, other=(), /, **kwargs) -> None:
+        if isinstance(other, LazyModelClasses):
+            self._entries.update(other._entries)
+            other = ()
+        super().update(other, **kwargs)
+
+    def copy(self) -> "LazyModelClasses":
+        return type(self)(self)
+
+    def is_loaded(self, tag: str) -> bool:
+        """Checks whether the model class of the tag is imported.
+
+        :param tag: The tag
+        :type tag: str
+
+        :return: True if the class is imported, False otherwise
+        :rtype: bool
+        """
+
+        return not isinstance(self._entries.get(tag), str)
+
+    def loaded_items(self) -> Dict[str, ModelClass]:
+        """Returns the tags with already imported model classes.
+
+        :return: The imported model classes by tag
+        :rtype: Dict[str, ModelClass]
+        """
+
+        return {
+            tag: value
+            for tag, value in self._entries.items()
+            if not isinstance(value, str)
+        }
+
+
+def make_classes_getattr(name: str, module_name: str) -> Callable[[str], Dict]:
+    """Returns the module `__getattr__` of a widgets package providing
+    its `*_classes` map of the tags to the model classes, as before
+    the lazy `widget_classes` registry, which the builder uses instead.
+
+    :param name: The map name, e.g. `keyboard_classes`
+    :type name: str
+    :param module_name: The package name
+    :type module_name: str
+
+    :return: The module `__getattr__`
+    :rtype: Callable[[str], Dict[str, ModelClass]]
+    """
+
+    def __getattr__(attribute: str) -> Dict[str, ModelClass]:
+        if attribute == name:
+            from dialog_yml.models.widgets import resolve_model_classes
+
+            return resolve_model_classes(name)
+        raise AttributeError(f"module {module_name!r} has no attribute {attribute!r}")
+
+    return __getattr__
@@ -1,19 +1,102 @@
-from .calendars import calendar_classes
-from .counters import counter_classes
-from .inputs import input_classes
-from .kbd import keyboard_classes
-from .medias import media_classes
-from .scrolls import scroll_classes
-from .selects import select_classes
-from .texts import text_classes
-
-widget_classes = {
-    **calendar_classes,
-    **counter_classes,
-    **input_classes,
-    **keyboard_classes,
-    **media_classes,
-    **scroll_classes,
-    **select_classes,
-    **text_classes,
+"""The `src.models.widgets` module provides the widget models by tag.
+
+`widget_classes` is lazy: the widget package of a tag is imported
+on the first lookup of the tag. The `*_classes` maps of the widget
+packages are resolved on access with `resolve_model_classes`.
+"""
+
+from typing import Dict
+
+from dialog_yml.models.registry import LazyModelClasses, ModelClass
+
+_CALENDARS = "dialog_yml.models.widgets.calendars.calendar"
+_COUNTERS = "dialog_yml.models.widgets.counters.counter"
+_INPUTS = "dialog_yml.models.widgets.inputs.input"
+_KEYBOARDS = "dialog_yml.models.widgets.kbd.keyboard"
+_MEDIAS = "dialog_yml.models.widgets.medias.media"
+_SCROLLS = "dialog_yml.models.widgets.scrolls.scroll"
+_SELECTS = "dialog_yml.models.widgets.selects.select"
+_TEXTS = "dialog_yml.models.widgets.texts.text"
+
+calendar_classes = {"calendar": f"{_CALENDARS}:CalendarModel"}
+
+counter_classes = {
+    "counter": f"{_COUNTERS}:CounterModel",
+    "progress": f"{_COUNTERS}:ProgressModel",
 }
+
+input_classes = {"input": f"{_INPUTS}:MessageInputModel"}
+
+keyboard_classes = {
+    "button": f"{_KEYBOARDS}:ButtonModel",
+    "url": f"{_KEYBOARDS}:UrlButtonModel",
+    "callback": f"{_KEYBOARDS}:CallbackButtonModel",
+    "switch_to": f"{_KEYBOARDS}:SwitchToModel",
+    "start": f"{_KEYBOARDS}:StartModel",
+    "next": f"{_KEYBOARDS}:NextModel",
+    "back": f"{_KEYBOARDS}:BackModel",
+    "cancel": f"{_KEYBOARDS}:CancelModel",
+    "group": f"{_KEYBOARDS}:GroupKeyboardModel",
+    "row": f"{_KEYBOARDS}:RowKeyboardModel",
+    "column": f"{_KEYBOARDS}:ColumnKeyboardModel",
+    "scrolling_group": f"{_KEYBOARDS}:ScrollingGroupKeyboardModel",
+    "dynamic_group": f"{_KEYBOARDS}:DynamicGroupKeyboardModel",
+}
+
+media_classes = {
+    "static_media": f"{_MEDIAS}:StaticMediaModel",
+    "dynamic_media": f"{_MEDIAS}:DynamicMediaModel",
+}
+
+scroll_classes = {
+    "scrolling_text": f"{_SCROLLS}:ScrollingTextModel",
+    "stub_scroll": f"{_SCROLLS}:StubScrollModel",
+    "numbered_pager": f"{_SCROLLS}:NumberedPagerModel",
+    "windowed_pager": f"{_SCROLLS}:WindowedPagerModel",
+    "first_page": f"{_SCROLLS}:FirstPageModel",
+    "prev_page": f"{_SCROLLS}:PrevPageModel",
+    "current_page": f"{_SCROLLS}:CurrentPageModel",
+    "next_page": f"{_SCROLLS}:NextPageModel",
+    "last_page": f"{_SCROLLS}:LastPageModel",
+}
+
+select_classes = {
+    "checkbox": f"{_SELECTS}:CheckboxModel",
+    "select": f"{_SELECTS}:SelectModel",
+    "radio": f"{_SELECTS}:RadioModel",
+    "multi_select": f"{_SELECTS}:MultiSelectModel",
+    "multiselect": f"{_SELECTS}:MultiSelectModel",
+}
+
+text_classes = {
+    "text": f"{_TEXTS}:TextModel",
+    "format": f"{_TEXTS}:FormatModel",
+    "i18n": f"{_TEXTS}:I18nTextModel",
+    "multi": f"{_TEXTS}:MultiTextModel",
+    "case": f"{_TEXTS}:CaseModel",
+    "list": f"{_TEXTS}:ListModel",
+}
+
+widget_classes = LazyModelClasses(
+    calendar_classes,
+    counter_classes,
+    input_classes,
+    keyboard_classes,
+    media_classes,
+    scroll_classes,
+    select_classes,
+    text_classes,
+)
+
+
+def resolve_model_classes(name: str) -> Dict[str, ModelClass]:
+    """Returns a `*_classes` map of this module with imported model classes.
+
+    :param name: The map name, e.g. `keyboard_classes`
+    :type name: str
+
+    :return: The model classes by tag
+    :rtype: Dict[str, ModelClass]
+    """
+
+    return dict(LazyModelClasses(globals()[name]))
@@ -1,3 +1,11 @@
 from .calendar import CalendarModel
 
-calendar_classes = {"calendar": CalendarModel}
+
+def __getattr__(name: str):
+    # `calendar_classes` maps the tags to the model classes, as before the lazy
+    # `widget_classes` registry, which the builder uses instead
+    if name == "calendar_classes":
+        from dialog_yml.models.widgets import resolve_model_classes
+
+        return resolve_model_classes(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,3 +1,4 @@
+from dialog_yml.models.registry import make_classes_getattr
 from .counter import CounterModel, ProgressModel
 
-counter_classes = {"counter": CounterModel, "progress": ProgressModel}
+__getattr__ = make_classes_getattr("counter_classes", __name__)
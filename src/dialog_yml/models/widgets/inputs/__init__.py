@@ -1,3 +1,11 @@
 from .input import MessageInputModel
 
-input_classes = {"input": MessageInputModel}
+
+def __getattr__(name: str):
+    # `input_classes` maps the tags to the model classes, as before the lazy
+    # `widget_classes` registry, which the builder uses instead
+    if name == "input_classes":
+        from dialog_yml.models.widgets import resolve_model_classes
+
+        return resolve_model_classes(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,16 +1,4 @@
+from dialog_yml.models.registry import make_classes_getattr
 from dialog_yml.models.widgets.kbd import keyboard
 
-keyboard_classes = {
-    "button": keyboard.ButtonModel,
-    "url": keyboard.UrlButtonModel,
-    "callback": keyboard.CallbackButtonModel,
-    "switch_to": keyboard.SwitchToModel,
-    "start": keyboard.StartModel,
-    "next": keyboard.NextModel,
-    "back": keyboard.BackModel,
-    "cancel": keyboard.CancelModel,
-    "group": keyboard.GroupKeyboardModel,
-    "row": keyboard.RowKeyboardModel,
-    "column": keyboard.ColumnKeyboardModel,
-    "scrolling_group": keyboard.ScrollingGroupKeyboardModel,
-}
+__getattr__ = make_classes_getattr("keyboard_classes", __name__)
@@ -1,5 +1,5 @@
-import functools
-from typing import Union, Self, Any, Annotated, Callable
+import asyncio
+from typing import Union, Self, Any, Annotated, Callable, Optional
 
 from aiogram.fsm.state import State
 from aiogram_dialog import StartMode
@@ -14,20 +14,27 @@ from aiogram_dialog.widgets.kbd import (
     Group,
     ScrollingGroup,
 )
-from pydantic import field_validator, BeforeValidator
+from pydantic import field_validator, BeforeValidator, PrivateAttr
 
 from dialog_yml.exceptions import StateNotFoundError
-from dialog_yml.models import YAMLModelFactory
+from dialog_yml.models import get_model_factory
 from dialog_yml.models.base import WidgetModel
 from dialog_yml.models.funcs.func import (
     FuncField,
     NotifyField,
     FuncModel,
-    function_registry,
+    get_function_registry,
 )
 from dialog_yml.models.widgets.texts.text import TextField
-from dialog_yml.states import YAMLStatesManager
+from dialog_yml.scope import get_current_scope, use_scope
+from dialog_yml.states import get_states_manager
 from dialog_yml.utils import clean_empty
+from dialog_yml.widgets.keyboard import (
+    DEFAULT_CACHE_SIZE,
+    ButtonsCompiler,
+    ButtonsFactory,
+    DynamicGroup,
+)
 
 
 class ButtonModel(WidgetModel):
@@ -71,19 +78,25 @@ class CallbackButtonModel(ButtonModel):
     on_click: FuncField = None
     notify: NotifyField = None
 
-    def _get_partial_on_click(self) -> Callable:
-        """Returns a partial function that can be used
+    def _get_partial_on_click(self) -> Optional[Callable]:
+        """Returns a function that can be used
         as a callback for a button click event.
 
-        The returned partial function captures the values
-        of `on_click` and `notify` from the `self` object.
+        The `on_click` and `notify` functions are resolved here,
+        in the scope of the builder, and the returned function keeps
+        only them and a copy of their data, not the models.
 
-        :return: partial function that can be used as a callback
-        :rtype: Callable
+        :return: function that can be used as a callback
+        :rtype: Optional[Callable]
         """
 
-        partial_on_click = None
-        partial_data = clean_empty({"on_click": self.on_click, "notify": self.notify})
+        notify = on_click = None
+        if self.notify:
+            notify = (self.notify.func, {**self.notify.data, **self.model_extra})
+        if self.on_click:
+            on_click = (self.on_click.func, {**self.on_click.data, **self.model_extra})
+        if notify is None and on_click is None:
+            return None
 
         async def wrap_functions(*args, **kwargs) -> None:
             """Function that wraps the `on_click` and `notify` functions.
@@ -94,29 +107,15 @@ class CallbackButtonModel(ButtonModel):
             :return: None
             :rtype: None
             """
-            callback = None
-
-            if notify := self.notify:
-                callback = (
-                    notify.func,
-                    {"data": {**notify.data, **self.model_extra}},
-                )
 
-            if on_click := self.on_click:
-                if callback:
-                    await notify.run_async(*args, **callback[1])
-                callback = (
-                    on_click.func,
-                    {"data": {**on_click.data, **self.model_extra}},
-                )
+            if on_click is None:
+                await notify[0](*args, data=notify[1])
+                return
+            if notify is not None:
+                asyncio.create_task(notify[0](*args, data=notify[1]))
+            await on_click[0](*args, data=on_click[1])
 
-            if callback is not None:
-                await callback[0](*args, **callback[1])
-
-        if partial_data:
-            partial_on_click = functools.partial(wrap_functions, **partial_data)
-
-        return partial_on_click
+        return wrap_functions
 
     def to_object(self) -> Button:
         kwargs = clean_empty(
@@ -154,7 +153,7 @@ class SwitchToModel(CallbackButtonModel):
 
     @field_validator("state", mode="before")
     def validate_state(cls, value) -> State:
-        state = YAMLStatesManager().get_by_name(value)
+        state = get_states_manager().get_by_name(value)
         if not state:
             raise StateNotFoundError(value)
         return state
@@ -182,7 +181,7 @@ class StartModel(CallbackButtonModel):
 
     @field_validator("state", mode="before")
     def validate_state(cls, value) -> State:
-        state = YAMLStatesManager().get_by_name(value)
+        state = get_states_manager().get_by_name(value)
         if not state:
             raise ValueError(f'State "{value}" is declared but not provided.')
         return state
@@ -247,10 +246,51 @@ class CancelModel(CallbackButtonModel):
         return Cancel(**kwargs)
 
 
+def make_buttons_compiler() -> ButtonsCompiler:
+    """Returns the compiler of buttons data into widgets
+    in the scope of the current builder.
+
+    :return: The compiler
+    :rtype: ButtonsCompiler
+    """
+
+    # Buttons are compiled at render time, in the scope of the builder
+    scope = get_current_scope()
+
+    def compiler(buttons_data: list) -> list:
+        with use_scope(scope):
+            return [
+                get_model_factory().create_model(button_data).to_object()
+                for button_data in buttons_data
+            ]
+
+    return compiler
+
+
 class GroupKeyboardModel(WidgetModel):
     id: str = None
     width: int = None
     buttons: list[WidgetModel]
+    _buttons_func: Optional[str] = PrivateAttr(default=None)
+
+    def _get_buttons_factory(self) -> Optional[ButtonsFactory]:
+        """Returns the factory of the buttons when their function
+        is overridden for some bots, so the buttons of each bot
+        are produced at render time.
+
+        :return: The factory, None if the buttons are the same for all bots
+        :rtype: Optional[ButtonsFactory]
+        """
+
+        scope = get_current_scope()
+        if self._buttons_func is None or not (scope and scope.variants):
+            return None
+
+        function = get_function_registry().func.get(self._buttons_func)
+        wrapped = scope.variants.wrap(self._buttons_func, function)
+        if wrapped is function:
+            return None
+        return lambda data, manager: wrapped()
 
     def to_object(self) -> Group:
         kwargs = clean_empty(
@@ -260,23 +300,34 @@ class GroupKeyboardModel(WidgetModel):
                 "when": self.when.func if self.when else None,
             }
         )
+        if factory := self._get_buttons_factory():
+            return DynamicGroup(
+                factory=factory, compiler=make_buttons_compiler(), **kwargs
+            )
         return Group(*[button.to_object() for button in self.buttons], **kwargs)
 
     @classmethod
     def to_model(cls, data: Union[str, dict, Self]) -> Self:
         if isinstance(data, cls):
             return data
+        buttons_func = None
         if isinstance(data, dict):
             if buttons := data.get("buttons"):
                 if isinstance(buttons, str):
-                    buttons_getter_func = function_registry.func.get(buttons)
+                    buttons_func = buttons
+                    buttons_getter_func = get_function_registry().func.get(buttons)
                     buttons = buttons_getter_func()
                 if isinstance(buttons, list):
-                    data["buttons"] = [
-                        YAMLModelFactory.create_model(button_data)
-                        for button_data in buttons
-                    ]
-        return cls(**data)
+                    data = {
+                        **data,
+                        "buttons": [
+                            get_model_factory().create_model(button_data)
+                            for button_data in buttons
+                        ],
+                    }
+        model = cls(**data)
+        model._buttons_func = buttons_func
+        return model
 
 
 GroupKeyboardField = Annotated[
@@ -313,3 +364,42 @@ class ScrollingGroupKeyboardModel(GroupKeyboardModel):
             }
         )
         return ScrollingGroup(*[button.to_object() for button in self.buttons], **kwargs)
+
+
+class DynamicGroupKeyboardModel(WidgetModel):
+    """Group keyboard with buttons produced at render time.
+
+    Unlike `GroupKeyboardModel` with a string `buttons`, which calls
+    the function once at build time, `buttons` here names a sync or async
+    factory called with the dialog data and the dialog manager.
+    The returned buttons data is compiled into widgets once and cached
+    by the value of the `cache_key` dialog data key.
+    """
+
+    id: str = None
+    width: int = None
+    buttons: FuncField
+    cache_key: str = None
+    cache_size: int = DEFAULT_CACHE_SIZE
+
+    def to_object(self) -> DynamicGroup:
+        kwargs = clean_empty(
+            {
+                "id": self.id,
+                "width": self.width,
+                "cache_key": self.cache_key,
+                "cache_size": self.cache_size,
+                "when": self.when.func if self.when else None,
+            }
+        )
+        return DynamicGroup(
+            factory=self.buttons.func, compiler=make_buttons_compiler(), **kwargs
+        )
+
+    @classmethod
+    def to_model(cls, data: Union[str, dict, Self]) -> Self:
+        if isinstance(data, cls):
+            return data
+        if isinstance(data, str):
+            data = {"buttons": data}
+        return cls(**data)
@@ -1,6 +1,4 @@
+from dialog_yml.models.registry import make_classes_getattr
 from .media import StaticMediaModel, DynamicMediaModel
 
-media_classes = {
-    "static_media": StaticMediaModel,
-    "dynamic_media": DynamicMediaModel,
-}
+__getattr__ = make_classes_getattr("media_classes", __name__)
@@ -1,12 +1,4 @@
+from dialog_yml.models.registry import make_classes_getattr
 from . import scroll
 
-scroll_classes = {
-    "scrolling_text": scroll.ScrollingTextModel,
-    "stub_scroll": scroll.StubScrollModel,
-    "numbered_pager": scroll.NumberedPagerModel,
-    "first_page": scroll.FirstPageModel,
-    "prev_page": scroll.PrevPageModel,
-    "current_page": scroll.CurrentPageModel,
-    "next_page": scroll.NextPageModel,
-    "last_page": scroll.LastPageModel,
-}
+__getattr__ = make_classes_getattr("scroll_classes", __name__)
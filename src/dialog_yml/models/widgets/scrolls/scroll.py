@@ -1,13 +1,16 @@
 from typing import Union, Self
 
+from aiogram.enums import ParseMode
 from aiogram_dialog.widgets.kbd import StubScroll, NumberedPager, SwitchPage
 from aiogram_dialog.widgets.kbd.pager import PageDirection
-from aiogram_dialog.widgets.text import ScrollingText
+from pydantic import field_validator
 
 from dialog_yml.models.base import WidgetModel
 from dialog_yml.models.funcs.func import FuncField, FuncModel
 from dialog_yml.models.widgets.texts.text import TextField
 from dialog_yml.utils import clean_empty
+from dialog_yml.widgets.scroll import WindowedPager, DEFAULT_PAGER_WINDOW
+from dialog_yml.widgets.text import PagedScrollingText
 
 DEFAULT_PAGER_ID = "__pager__"
 
@@ -18,6 +21,8 @@ DEFAULT_NEXT_BUTTON_TEXT = TextField(val=">")
 DEFAULT_CURRENT_BUTTON_TEXT = TextField(val="{current_page1}", formatted=True)
 DEFAULT_PAGE_TEXT = TextField(val="{target_page1}", formatted=True)
 DEFAULT_CURRENT_PAGE_TEXT = TextField(val="[ {current_page1} ]", formatted=True)
+DEFAULT_JUMP_PREV_TEXT = TextField(val="« {target_page1}", formatted=True)
+DEFAULT_JUMP_NEXT_TEXT = TextField(val="{target_page1} »", formatted=True)
 
 
 class ScrollingTextModel(WidgetModel):
@@ -25,8 +30,9 @@ class ScrollingTextModel(WidgetModel):
     text: TextField
     page_size: int = 0
     on_page_changed: FuncField = None
+    parse_mode: ParseMode = None
 
-    def to_object(self) -> ScrollingText:
+    def to_object(self) -> PagedScrollingText:
         kwargs = clean_empty(
             {
                 "id": self.id,
@@ -36,9 +42,16 @@ class ScrollingTextModel(WidgetModel):
                 if self.on_page_changed
                 else None,
                 "when": self.when.func if self.when else None,
+                "parse_mode": self.parse_mode,
             }
         )
-        return ScrollingText(**kwargs)
+        return PagedScrollingText(**kwargs)
+
+    @field_validator("parse_mode", mode="before")
+    def validate_parse_mode(cls, value: Union[str, ParseMode]) -> ParseMode | None:
+        if isinstance(value, str) and value.upper() in ParseMode.__members__:
+            return ParseMode[value.upper()]
+        return value
 
     @classmethod
     def to_model(cls, data: Union[dict, Self]) -> Self:
@@ -100,6 +113,30 @@ class NumberedPagerModel(WidgetModel):
         return cls(**data)
 
 
+class WindowedPagerModel(NumberedPagerModel):
+    window: int = DEFAULT_PAGER_WINDOW
+    jump: int = None
+    jump_prev_text: TextField = DEFAULT_JUMP_PREV_TEXT
+    jump_next_text: TextField = DEFAULT_JUMP_NEXT_TEXT
+    length: int = None
+
+    def to_object(self) -> WindowedPager:
+        kwargs = clean_empty(
+            {
+                "id": self.id,
+                "scroll": self.scroll,
+                "page_text": self.page_text.to_object(),
+                "current_page_text": self.current_page_text.to_object(),
+                "jump": self.jump,
+                "jump_prev_text": self.jump_prev_text.to_object(),
+                "jump_next_text": self.jump_next_text.to_object(),
+                "length": self.length,
+                "when": self.when.func if self.when else None,
+            }
+        )
+        return WindowedPager(window=self.window, **kwargs)
+
+
 class SwitchPageModel(WidgetModel):
     id: str = DEFAULT_PAGER_ID
     text: TextField
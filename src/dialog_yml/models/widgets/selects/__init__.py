@@ -1,9 +1,4 @@
+from dialog_yml.models.registry import make_classes_getattr
 from .select import CheckboxModel, SelectModel, RadioModel, MultiSelectModel
 
-select_classes = {
-    "checkbox": CheckboxModel,
-    "select": SelectModel,
-    "radio": RadioModel,
-    "multi_select": MultiSelectModel,
-    "multiselect": MultiSelectModel,
-}
+__getattr__ = make_classes_getattr("select_classes", __name__)
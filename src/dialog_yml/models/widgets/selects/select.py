@@ -1,12 +1,114 @@
 import operator
-from typing import Union, Self
+from typing import Union, Self, Annotated
 
-from aiogram_dialog.widgets.kbd import Checkbox, Select, Radio, Multiselect
+from aiogram_dialog.widgets.kbd import Checkbox, Select, Radio, Multiselect, Group, Keyboard
+from pydantic import BaseModel, ConfigDict, Field, BeforeValidator, field_validator
 
 from dialog_yml.models.base import WidgetModel
 from dialog_yml.models.funcs.func import FuncModel, FuncField
 from dialog_yml.models.widgets.texts.text import TextField, FormatModel
 from dialog_yml.utils import clean_empty
+from dialog_yml.widgets.scroll import PagedItemsScroll, Pagination, DEFAULT_PAGE_SIZE
+
+
+class ItemsSourceModel(BaseModel):
+    """Items source loading select items one page at a time.
+
+    :ivar source: The function returning a page of items.
+    :vartype source: FuncField
+    :ivar page_size: The number of items per page.
+    :vartype page_size: int
+    :ivar pagination: The cursor kind, `offset` or `keyset`.
+    :vartype pagination: Pagination
+    :ivar scroll: The scroll id used by pagers.
+        Defaults to `<select id>_scroll`.
+    :vartype scroll: str
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True, defer_build=True)
+
+    source: FuncField
+    page_size: Annotated[int, Field(gt=0)] = DEFAULT_PAGE_SIZE
+    pagination: Pagination = Pagination.offset
+    scroll: str = None
+    on_page_changed: FuncField = None
+
+    def to_object(self, widget_id: str) -> PagedItemsScroll:
+        kwargs = clean_empty(
+            {
+                "id": self.scroll or f"{widget_id}_scroll",
+                "source": self.source.func,
+                "page_size": self.page_size,
+                "pagination": self.pagination,
+                "on_page_changed": self.on_page_changed.func
+                if self.on_page_changed
+                else None,
+            }
+        )
+        return PagedItemsScroll(**kwargs)
+
+    @field_validator("pagination", mode="before")
+    def validate_pagination(cls, value) -> Union[Pagination, None]:
+        if isinstance(value, Pagination):
+            return value
+        if isinstance(value, str):
+            try:
+                return Pagination[value.lower()]
+            except KeyError:
+                names = ", ".join(pagination.name for pagination in Pagination)
+                raise ValueError(
+                    f'Unknown pagination "{value}", expected one of: {names}'
+                ) from None
+        return None
+
+    @classmethod
+    def to_model(cls, data: Union[str, dict, Self]) -> Self:
+        if isinstance(data, cls):
+            return data
+        if isinstance(data, str):
+            data = {"source": data}
+        return cls(**data)
+
+    @classmethod
+    def validate_items(cls, value):
+        if isinstance(value, dict) and "source" in value:
+            return cls.to_model(value)
+        return value
+
+
+ItemsField = Annotated[
+    Union[ItemsSourceModel, str, list, dict],
+    BeforeValidator(ItemsSourceModel.validate_items),
+]
+
+
+def build_items(
+    widget_id: str, items: Union[ItemsSourceModel, str, list, dict]
+) -> tuple[Union[str, list, dict], Union[PagedItemsScroll, None]]:
+    """Builds the select items and the paged items scroll
+    when the items are loaded from an items source.
+
+    :param widget_id: The select widget id
+    :type widget_id: str
+    :param items: The select items
+    :type items: Union[ItemsSourceModel, str, list, dict]
+
+    :return: The items for the select widget and the scroll or None
+    :rtype: tuple[Union[str, list, dict], Union[PagedItemsScroll, None]]
+    """
+
+    if not isinstance(items, ItemsSourceModel):
+        return items, None
+    items_scroll = items.to_object(widget_id)
+    return items_scroll.items_key, items_scroll
+
+
+def with_items_scroll(
+    widget: Keyboard, items_scroll: Union[PagedItemsScroll, None]
+) -> Union[Keyboard, Group]:
+    if items_scroll is None:
+        return widget
+    return Group(widget, items_scroll)
 
 
 class CheckboxModel(WidgetModel):
@@ -43,11 +145,12 @@ class CheckboxModel(WidgetModel):
 class SelectModel(WidgetModel):
     text: TextField = None
     id: str
-    items: Union[str, list, dict]
+    items: ItemsField
     item_id_getter: Union[int, str]
     on_click: FuncField = None
 
-    def to_object(self) -> Select:
+    def to_object(self) -> Union[Select, Group]:
+        items, items_scroll = build_items(self.id, self.items)
         item_id_getter = self.item_id_getter
         if isinstance(item_id_getter, int):
             item_id_getter = operator.itemgetter(item_id_getter)
@@ -57,37 +160,39 @@ class SelectModel(WidgetModel):
             {
                 "text": self.text.to_object(),
                 "id": self.id,
-                "items": self.items,
+                "items": items,
                 "item_id_getter": item_id_getter,
                 "on_click": self.on_click.func if self.on_click else None,
                 "when": self.when.func if self.when else None,
             }
         )
-        return Select(**kwargs)
+        return with_items_scroll(Select(**kwargs), items_scroll)
 
     @classmethod
     def to_model(cls, data: Union[str, dict, Self]) -> Self:
         if isinstance(data, cls):
             return data
-        if isinstance(data, dict):
-            if formatted_text := data.pop("format", {}):
+        if isinstance(data, dict) and "format" in data:
+            data = dict(data)
+            if formatted_text := data.pop("format"):
                 data["text"] = FormatModel.to_model(formatted_text)
         return cls(**data)
 
 
 class RadioModel(WidgetModel):
     id: str
-    items: Union[str, list, dict]
+    items: ItemsField
     on_state_changed: FuncField = None
     checked: TextField = TextField(val="✓ {item}")
     unchecked: TextField = TextField(val="{item}")
     item_id_getter: Union[int, str, FuncField]
 
-    def to_object(self) -> Radio:
+    def to_object(self) -> Union[Radio, Group]:
         args = [
             self.checked.to_object(),
             self.unchecked.to_object(),
         ]
+        items, items_scroll = build_items(self.id, self.items)
         item_id_getter = self.item_id_getter
         if isinstance(item_id_getter, int):
             item_id_getter = operator.itemgetter(item_id_getter)
@@ -97,14 +202,14 @@ class RadioModel(WidgetModel):
             {
                 "id": self.id,
                 "when": self.when.func if self.when else None,
-                "items": self.items,
+                "items": items,
                 "item_id_getter": item_id_getter,
                 "on_state_changed": self.on_state_changed.func
                 if self.on_state_changed
                 else None,
             }
         )
-        return Radio(*args, **kwargs)
+        return with_items_scroll(Radio(*args, **kwargs), items_scroll)
 
     @classmethod
     def to_model(cls, data: Union[str, dict, Self]) -> Self:
@@ -119,7 +224,8 @@ class MultiSelectModel(SelectModel, CheckboxModel):
     checked: TextField = TextField(val="✓ {item[0]}", formatted=True)
     unchecked: TextField = TextField(val="{item[0]}", formatted=True)
 
-    def to_object(self) -> Multiselect:
+    def to_object(self) -> Union[Multiselect, Group]:
+        items, items_scroll = build_items(self.id, self.items)
         item_id_getter = self.item_id_getter
         if isinstance(item_id_getter, int):
             item_id_getter = operator.itemgetter(item_id_getter)
@@ -130,7 +236,7 @@ class MultiSelectModel(SelectModel, CheckboxModel):
                 "checked_text": self.checked.to_object(),
                 "unchecked_text": self.unchecked.to_object(),
                 "id": self.id,
-                "items": self.items,
+                "items": items,
                 "item_id_getter": item_id_getter,
                 "on_state_changed": self.on_state_changed.func
                 if self.on_state_changed
@@ -139,7 +245,7 @@ class MultiSelectModel(SelectModel, CheckboxModel):
                 "when": self.when.func if self.when else None,
             }
         )
-        return Multiselect(**kwargs)
+        return with_items_scroll(Multiselect(**kwargs), items_scroll)
 
     @classmethod
     def to_model(cls, data: Union[str, dict, Self]) -> Self:
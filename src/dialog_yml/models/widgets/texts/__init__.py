@@ -1,9 +1,4 @@
+from dialog_yml.models.registry import make_classes_getattr
 from dialog_yml.models.widgets.texts import text
 
-text_classes = {
-    "text": text.TextModel,
-    "format": text.FormatModel,
-    "multi": text.MultiTextModel,
-    "case": text.CaseModel,
-    "list": text.ListModel,
-}
+__getattr__ = make_classes_getattr("text_classes", __name__)
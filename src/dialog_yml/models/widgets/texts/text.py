@@ -1,25 +1,45 @@
 from typing import Union, Optional, Any, Annotated, Self
 
-from aiogram_dialog.widgets.text import Const, Format, Multi, Case, List
+from aiogram_dialog.widgets.text import Const, Multi, Case, List
 from pydantic import BeforeValidator
 
-from dialog_yml.models import YAMLModelFactory
+from dialog_yml.exceptions import DialogYamlException
+from dialog_yml.models import get_model_factory
 from dialog_yml.models.base import WidgetModel
 from dialog_yml.models.funcs.func import FuncModel, FuncField
+from dialog_yml.scope import get_current_scope
 from dialog_yml.utils import clean_empty
+from dialog_yml.widgets.text import CompiledFormat, I18nText
 
 
 class TextModel(WidgetModel):
     formatted: bool = False
+    i18n: bool = False
     val: str
 
-    def to_object(self) -> Union[Const, Format]:
+    def _to_i18n_object(self) -> I18nText:
+        scope = get_current_scope()
+        if scope is None or scope.i18n is None:
+            raise DialogYamlException(
+                f"Text {self.val!r} is localized, but i18n catalogs are not provided"
+            )
+        return I18nText(
+            message_id=self.val,
+            catalogs=scope.i18n,
+            formatted=self.formatted,
+            when=self.when.func if self.when else None,
+        )
+
+    def to_object(self) -> Union[Const, CompiledFormat, I18nText]:
+        if self.i18n:
+            return self._to_i18n_object()
+
         kwargs = clean_empty(
             {"when": self.when.func if self.when else None, "text": self.val}
         )
 
         if self.formatted:
-            return Format(**kwargs)
+            return CompiledFormat(**kwargs)
 
         return Const(**kwargs)
 
@@ -36,6 +56,10 @@ class FormatModel(TextModel):
     formatted: bool = True
 
 
+class I18nTextModel(TextModel):
+    i18n: bool = True
+
+
 TextField = Annotated[TextModel, BeforeValidator(TextModel.to_model)]
 
 
@@ -54,9 +78,12 @@ class MultiTextModel(WidgetModel):
         if isinstance(data, cls):
             return Self
         if texts := data.get("texts"):
-            data["texts"] = [
-                YAMLModelFactory.create_model(text_data) for text_data in texts
-            ]
+            data = {
+                **data,
+                "texts": [
+                    get_model_factory().create_model(text_data) for text_data in texts
+                ],
+            }
         return cls(**data)
 
 
@@ -81,12 +108,16 @@ class CaseModel(WidgetModel):
         if isinstance(data, cls):
             return data
         if texts := data.get("texts"):
-            data["texts"] = {
-                item: TextModel.to_model(text_data) for item, text_data in texts.items()
+            data = {
+                **data,
+                "texts": {
+                    item: TextModel.to_model(text_data)
+                    for item, text_data in texts.items()
+                },
             }
         if selector := data.get("selector"):
             if isinstance(selector, dict):
-                data["selector"] = YAMLModelFactory.create_model(selector)
+                data = {**data, "selector": get_model_factory().create_model(selector)}
         return cls(**data)
 
 
@@ -1,14 +1,82 @@
-from typing import Union, Self
+from typing import Annotated, Optional, Union, Self
 
 from aiogram.enums import ParseMode
 from aiogram_dialog import Window
-from pydantic import field_validator
+from aiogram_dialog.widgets.kbd import Keyboard
+from aiogram_dialog.widgets.utils import ensure_keyboard
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 
+from dialog_yml.exceptions import RenderCacheKeysError
 from dialog_yml.models.base import YAMLModel, WidgetModel
 from dialog_yml.models.funcs.func import FuncField
 from dialog_yml.models.widgets.kbd.keyboard import GroupKeyboardField
-from dialog_yml.states import YAMLStatesManager
+from dialog_yml.scope import get_current_scope
+from dialog_yml.states import get_states_manager
 from dialog_yml.utils import clean_empty
+from dialog_yml.widgets.keyboard import StaticKeyboard, is_static_keyboard
+from dialog_yml.widgets.render import (
+    DEFAULT_RENDER_CACHE_SIZE,
+    RenderCache,
+    RenderCachedWindow,
+    collect_required_keys,
+    find_locale_getter,
+    find_state_ids,
+    infer_render_keys,
+)
+from dialog_yml.widgets.scroll import PagedItemsScroll
+from dialog_yml.widgets.text import PagedScrollingText
+from dialog_yml.widgets.utils import iter_widgets
+from dialog_yml.widgets.when import memoize_conditions
+
+
+class RenderCacheModel(BaseModel):
+    """Render cache of a window.
+
+    :ivar keys: The data keys the texts and the keyboards depend on,
+        including `dialog_data`, `start_data`, `middleware_data`
+        or `event` when a widget reads them. Inferred from the widgets
+        if not set, the keys used by the compiled formatted texts
+        are added to the given ones.
+    :vartype keys: list[str]
+    :ivar size: The maximum number of cached renders.
+    :vartype size: int
+    :ivar ttl: The lifetime of the cached renders in seconds,
+        unlimited if not set.
+    :vartype ttl: float
+    """
+
+    model_config = ConfigDict(defer_build=True)
+
+    keys: Optional[list[str]] = None
+    size: Annotated[int, Field(gt=0)] = DEFAULT_RENDER_CACHE_SIZE
+    ttl: Optional[Annotated[float, Field(gt=0)]] = None
+
+    def to_object(self, widgets: list, state: str) -> RenderCache:
+        """Creates the cache of the window.
+
+        :param widgets: The window widgets
+        :type widgets: list
+        :param state: The window state name
+        :type state: str
+
+        :return: The cache
+        :rtype: RenderCache
+
+        :raises RenderCacheKeysError: When the keys are not set
+            and can't be inferred from the widgets
+        """
+
+        if self.keys is not None:
+            keys = collect_required_keys(widgets).union(self.keys)
+        elif (keys := infer_render_keys(widgets)) is None:
+            raise RenderCacheKeysError(state)
+        return RenderCache(
+            keys=keys,
+            state_ids=find_state_ids(widgets),
+            size=self.size,
+            ttl=self.ttl,
+            get_locale=find_locale_getter(widgets),
+        )
 
 
 class WindowModel(YAMLModel):
@@ -19,12 +87,77 @@ class WindowModel(YAMLModel):
     disable_web_page_preview: bool = False
     preview_add_transitions: GroupKeyboardField = None
     preview_data: FuncField = None
+    cache_keyboard: bool = True
+    memoize_when: bool = True
+    render_cache: Union[bool, RenderCacheModel] = False
+
+    def _get_getters(self, widgets: list) -> list:
+        """Collects the window getter, the per-bot texts getter
+        and the data getters of the paged items scrolls
+        of the window widgets.
+
+        :param widgets: The window widgets
+        :type widgets: list
+
+        :return: The data getters
+        :rtype: list
+        """
+
+        scope = get_current_scope()
+        getters = []
+        if scope and scope.variants:
+            getters.append(scope.variants.texts_getter)
+        if self.getter:
+            getters.append(self.getter.func)
+        getters.extend(
+            widget.load_page
+            for widget in iter_widgets(widgets)
+            if isinstance(widget, PagedItemsScroll)
+        )
+        return getters
+
+    def _set_parse_mode(self, widgets: list) -> None:
+        """Passes the window parse mode to the scrolling texts
+        without their own one, so their pages keep markup entities whole.
+
+        :param widgets: The window widgets
+        :type widgets: list
+        """
+
+        for widget in iter_widgets(widgets):
+            if isinstance(widget, PagedScrollingText) and widget.parse_mode is None:
+                widget.set_parse_mode(self.parse_mode)
+
+    def _cache_static_keyboard(self, widgets: list) -> list:
+        """Wraps the window keyboards into a `StaticKeyboard`
+        when all of them are static, so they are rendered only once.
+
+        :param widgets: The window widgets
+        :type widgets: list
+
+        :return: The window widgets
+        :rtype: list
+        """
+
+        keyboards = [widget for widget in widgets if isinstance(widget, Keyboard)]
+        if not keyboards or not all(map(is_static_keyboard, keyboards)):
+            return widgets
+
+        other_widgets = [widget for widget in widgets if not isinstance(widget, Keyboard)]
+        return [*other_widgets, StaticKeyboard(ensure_keyboard(keyboards))]
 
     def to_object(self) -> Window:
+        widgets = [widget.to_object() for widget in self.widgets]
+        if self.cache_keyboard:
+            widgets = self._cache_static_keyboard(widgets)
+        self._set_parse_mode(widgets)
+        if self.memoize_when:
+            memoize_conditions(widgets)
+        getters = self._get_getters(widgets)
         kwargs = clean_empty(
             {
-                "state": YAMLStatesManager().get_by_name(self.state),
-                "getter": self.getter.func if self.getter else None,
+                "state": get_states_manager().get_by_name(self.state),
+                "getter": getters[0] if len(getters) == 1 else getters,
                 "parse_mode": self.parse_mode,
                 "disable_web_page_preview": self.disable_web_page_preview,
                 "preview_add_transitions": self.preview_add_transitions
@@ -33,7 +166,18 @@ class WindowModel(YAMLModel):
                 "preview_data": self.preview_data.func if self.preview_data else None,
             }
         )
-        return Window(*[widget.to_object() for widget in self.widgets], **kwargs)
+        render_cache = self.render_cache
+        if render_cache is True:
+            render_cache = RenderCacheModel()
+        if render_cache:
+            window = RenderCachedWindow(
+                *widgets,
+                render_cache=render_cache.to_object(widgets, self.state),
+                **kwargs,
+            )
+        else:
+            window = Window(*widgets, **kwargs)
+        return window
 
     @classmethod
     @field_validator("widgets", mode="before")
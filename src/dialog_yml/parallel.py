@@ -0,0 +1,185 @@
+"""The `src.parallel` module builds dialog groups in parallel.
+
+In processes, each dialog group is validated into a `DialogModel` in a worker
+process. Functions are referenced by name in the models, so the model
+trees are sent back to the builder process, where they are converted
+to aiogram-dialog objects. States are sent by name and resolved
+by the states manager of the builder.
+
+The workers are forked from the builder process, so they inherit its
+registered functions, custom models and states.
+
+In threads, the dialog groups are built up to aiogram-dialog objects
+in the builder process. The registries are shared by the threads,
+so this scales with the number of threads on free-threaded Python
+builds only, while with the GIL the threads take turns.
+
+Functions:
+---------
+- dumps_models: Pickles model trees, replacing states by their names.
+- loads_models: Unpickles model trees, resolving states by their names.
+- build_dialog_models_in_processes: Builds the dialog models of the groups
+  in a process pool.
+- build_dialogs_in_threads: Builds the dialogs of the groups in a thread pool.
+"""
+
+import contextvars
+import io
+import multiprocessing
+import pickle
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+from aiogram.fsm.state import State
+from aiogram_dialog import Dialog
+
+from .exceptions import DialogYamlException, StateNotFoundError
+from .scope import use_scope
+from .states import YAMLStatesManager
+
+if TYPE_CHECKING:
+    from .core import DialogYAMLBuilder
+    from .models.dialog import DialogModel
+
+_STATE = "state"
+
+
+class _ModelsPickler(pickle.Pickler):
+    def persistent_id(self, obj: Any) -> Optional[tuple[str, str]]:
+        # States belong to dynamically created groups,
+        # which can't be pickled by reference
+        if isinstance(obj, State):
+            return _STATE, obj.state
+        return None
+
+
+class _ModelsUnpickler(pickle.Unpickler):
+    def __init__(self, file, states_manager: YAMLStatesManager):
+        super().__init__(file)
+        self.states_manager = states_manager
+
+    def persistent_load(self, pid: tuple[str, str]) -> State:
+        kind, name = pid
+        state = self.states_manager.get_state(name) if kind == _STATE else None
+        if state is None:
+            raise StateNotFoundError(name)
+        return state
+
+
+def dumps_models(models: Any) -> bytes:
+    """Pickles the model trees, replacing the states by their names.
+
+    :param models: The models
+    :type models: Any
+
+    :return: The pickled models
+    :rtype: bytes
+    """
+
+    file = io.BytesIO()
+    _ModelsPickler(file, pickle.HIGHEST_PROTOCOL).dump(models)
+    return file.getvalue()
+
+
+def loads_models(data: bytes, states_manager: YAMLStatesManager) -> Any:
+    """Unpickles the model trees, resolving the states by their names.
+
+    :param data: The pickled models
+    :type data: bytes
+    :param states_manager: The states manager with the states of the models
+    :type states_manager: YAMLStatesManager
+
+    :return: The models
+    :rtype: Any
+    """
+
+    return _ModelsUnpickler(io.BytesIO(data), states_manager).load()
+
+
+_builder: Optional["DialogYAMLBuilder"] = None
+
+
+def _build_group(group_name: str, dialog_model_data: Dict) -> bytes:
+    with use_scope(_builder.scope):
+        dialog_model = _builder._build_dialog_model(group_name, dialog_model_data)
+    return dumps_models(dialog_model)
+
+
+def build_dialog_models_in_processes(
+    builder: "DialogYAMLBuilder",
+    dialogs_data: Dict[str, Dict],
+    processes: Optional[int] = None,
+) -> Dict[str, "DialogModel"]:
+    """Builds the dialog models of the groups in a pool of forked processes.
+
+    :param builder: The builder with the built states
+    :type builder: DialogYAMLBuilder
+    :param dialogs_data: The data of the dialog groups by name
+    :type dialogs_data: Dict[str, Dict]
+    :param processes: The number of processes, the number of CPUs if not set
+    :type processes: int (optional, default: None)
+
+    :return: The dialog models by group name
+    :rtype: Dict[str, DialogModel]
+
+    :raises DialogYamlException: When processes can't be forked
+        on the platform
+    """
+
+    global _builder
+
+    if "fork" not in multiprocessing.get_all_start_methods():
+        raise DialogYamlException(
+            "Building in processes requires the 'fork' start method"
+        )
+
+    _builder = builder
+    try:
+        with ProcessPoolExecutor(
+            max_workers=processes, mp_context=multiprocessing.get_context("fork")
+        ) as executor:
+            results = executor.map(
+                _build_group, dialogs_data.keys(), dialogs_data.values()
+            )
+            return {
+                group_name: loads_models(data, builder.states_manager)
+                for group_name, data in zip(dialogs_data, results)
+            }
+    finally:
+        _builder = None
+
+
+def build_dialogs_in_threads(
+    builder: "DialogYAMLBuilder",
+    dialogs_data: Dict[str, Dict],
+    threads: Optional[int] = None,
+) -> List[Dialog]:
+    """Builds the dialogs of the groups in a thread pool.
+
+    Each group is built in a copy of the current context,
+    so the threads use the scope of the caller. The schemas
+    of the models are built in advance, before the groups.
+
+    :param builder: The builder with the built states
+    :type builder: DialogYAMLBuilder
+    :param dialogs_data: The data of the dialog groups by name
+    :type dialogs_data: Dict[str, Dict]
+    :param threads: The number of threads, the executor default if not set
+    :type threads: int (optional, default: None)
+
+    :return: The dialogs in the order of the groups
+    :rtype: List[Dialog]
+    """
+
+    builder.model_factory.warm_up()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        futures = [
+            executor.submit(
+                contextvars.copy_context().run,
+                builder._build_dialog,
+                group_name,
+                dialog_model_data,
+            )
+            for group_name, dialog_model_data in dialogs_data.items()
+        ]
+        return [future.result() for future in futures]
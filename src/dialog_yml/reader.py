@@ -1,36 +1,99 @@
+import functools
 import os
 from pathlib import Path
+from typing import Type
 
 import yaml
 import yaml_include
 
 
+class FrozenDict(dict):
+    """A read-only mapping node of the YAML data.
+
+    Nodes shared through YAML anchors and includes are the same object
+    in each place they are used, so the build must not change them.
+    Changing methods raise `TypeError`, `copy` returns a regular dict.
+    """
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("YAML nodes are read-only, use a copy to change them")
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    pop = popitem = clear = update = setdefault = _read_only
+
+    def copy(self) -> dict:
+        return dict(self)
+
+    def __reduce__(self):
+        return type(self), (dict(self),)
+
+
+def _construct_frozen_dict(loader: yaml.FullLoader, node: yaml.MappingNode):
+    data = FrozenDict()
+    yield data
+    # The empty node is given out first to resolve recursive anchors
+    dict.update(data, loader.construct_mapping(node))
+
+
+@functools.lru_cache(maxsize=None)
+def _get_loader(base_dir: str) -> Type[yaml.FullLoader]:
+    """Returns the loader class with the `!include` constructor
+    of the base directory.
+
+    Each base directory has its own loader class, so readers of different
+    directories don't replace the constructor of each other,
+    even when they run in parallel threads.
+    """
+
+    loader = type("IncludeLoader", (yaml.FullLoader,), {})
+    yaml.add_constructor("!include", yaml_include.Constructor(base_dir=base_dir), loader)
+    yaml.add_constructor("tag:yaml.org,2002:map", _construct_frozen_dict, loader)
+    return loader
+
+
+def _construct_interned_str(loader: yaml.FullLoader, node: yaml.ScalarNode) -> str:
+    value = loader.construct_scalar(node)
+    return loader.strings.setdefault(value, value)
+
+
+def _get_interning_loader(base_dir: str) -> Type[yaml.FullLoader]:
+    """Returns a loader class which returns one object for equal strings.
+
+    The strings are shared by all the files of one read, including
+    the included ones, which are loaded by the same loader class.
+    """
+
+    loader = type("InterningLoader", (_get_loader(base_dir),), {"strings": {}})
+    yaml.add_constructor("tag:yaml.org,2002:str", _construct_interned_str, loader)
+    return loader
+
+
 class YAMLReader:
     """The YAMLReader class is responsible for reading data
     from a YAML file and returning it as a dictionary.
     """
 
     @classmethod
-    def read_data_to_dict(cls, data_file_path: str, data_dir_path: str = "") -> dict:
+    def read_data_to_dict(
+        cls, data_file_path: str, data_dir_path: str = "", intern_strings: bool = False
+    ) -> dict:
         """Reads data from a YAML file and returns it as a dictionary.
 
         Supports both .yaml and .yml file extensions. If a file with the specified
         extension is not found, the method tries the alternative extension.
 
+        Mappings of the data are read-only `FrozenDict` nodes.
+
         :param data_file_path: Path to the YAML file.
         :param data_dir_path: Path to the directory containing the YAML file.
+        :param intern_strings: Whether equal strings of the data
+            are one object.
 
         :return: A dictionary with the data from the YAML file.
         :rtype: dict
 
         :raises FileNotFoundError: If the YAML file is not found.
         """
-        yaml.add_constructor(
-            "!include",
-            yaml_include.Constructor(base_dir=data_dir_path),
-            yaml.FullLoader,
-        )
-
         # Check if the file has a yaml/yml extension
         if data_file_path.lower().endswith(".yaml"):
             # If the file ends with .yaml, try .yaml first, then .yml
@@ -71,7 +134,11 @@ class YAMLReader:
                 f"File not found {original_abs_path!r}. Tried: {', '.join(possible_paths)}"
             )
 
+        if intern_strings:
+            loader = _get_interning_loader(data_dir_path)
+        else:
+            loader = _get_loader(data_dir_path)
         with open(abs_data_file_path, "r") as file:
-            data = yaml.load(file, Loader=yaml.FullLoader)
+            data = yaml.load(file, Loader=loader)
 
         return data
@@ -0,0 +1,127 @@
+"""The `src.scope` module provides builder scopes: sets of the functions
+registry, the states manager and the model factory used to build dialogs.
+
+By default every builder uses the process-wide singletons. A builder
+created with its own `BuilderScope` makes the models resolve functions,
+states and tags in that scope, so several independent configurations
+can be built and served by one process.
+
+Classes:
+---------
+- BuilderScope: The registries and the factory of one builder.
+"""
+
+import copy
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Iterator, Optional, Type
+
+if TYPE_CHECKING:
+    from dialog_yml.i18n import I18nCatalogs
+    from dialog_yml.models import YAMLModelFactory
+    from dialog_yml.models.funcs.func import FuncsRegistry
+    from dialog_yml.states import YAMLStatesManager
+    from dialog_yml.variants import BotVariants
+
+
+class BuilderScope:
+    """The functions registry, the states manager and the model factory
+    of one builder.
+
+    Not provided parts are created empty: a new functions registry with
+    the default notify function, a new states manager and a copy
+    of the model factory with the default models.
+
+    :ivar funcs_registry: The functions registry
+    :vartype funcs_registry: FuncsRegistry
+    :ivar states_manager: The states manager
+    :vartype states_manager: YAMLStatesManager
+    :ivar model_factory: The model factory class
+    :vartype model_factory: Type[YAMLModelFactory]
+    :ivar variants: The per-bot texts and functions of the dialog tree
+        shared by several bots
+    :vartype variants: Optional[BotVariants]
+    :ivar i18n: The catalogs of the localized texts
+    :vartype i18n: Optional[I18nCatalogs]
+    """
+
+    def __init__(
+        self,
+        funcs_registry: Optional["FuncsRegistry"] = None,
+        states_manager: Optional["YAMLStatesManager"] = None,
+        model_factory: Optional[Type["YAMLModelFactory"]] = None,
+        variants: Optional["BotVariants"] = None,
+        i18n: Optional["I18nCatalogs"] = None,
+    ):
+        from dialog_yml.models import YAMLModelFactory
+        from dialog_yml.models.funcs.func import create_funcs_registry
+        from dialog_yml.states import YAMLStatesManager
+
+        self.funcs_registry = funcs_registry or create_funcs_registry()
+        self.states_manager = states_manager or YAMLStatesManager.__wrapped__()
+        self.model_factory = model_factory or YAMLModelFactory.new_factory()
+        self.variants = variants
+        self.i18n = i18n
+
+    @classmethod
+    def default(cls, variants: Optional["BotVariants"] = None) -> "BuilderScope":
+        """Returns the scope of the process-wide singletons.
+
+        :param variants: The per-bot texts and functions
+        :type variants: Optional[BotVariants]
+
+        :return: The default scope
+        :rtype: BuilderScope
+        """
+
+        from dialog_yml.models import YAMLModelFactory
+        from dialog_yml.models.funcs.func import FuncsRegistry
+        from dialog_yml.states import YAMLStatesManager
+
+        return cls(FuncsRegistry(), YAMLStatesManager(), YAMLModelFactory, variants)
+
+    def with_i18n(self, i18n: Optional["I18nCatalogs"]) -> "BuilderScope":
+        """Returns a copy of the scope with the given catalogs,
+        sharing the registries, the model factory and the variants.
+
+        :param i18n: The catalogs of the localized texts
+        :type i18n: Optional[I18nCatalogs]
+
+        :return: The copy of the scope
+        :rtype: BuilderScope
+        """
+
+        scope = copy.copy(self)
+        scope.i18n = i18n
+        return scope
+
+
+_current_scope: ContextVar[Optional[BuilderScope]] = ContextVar(
+    "dialog_yml_scope", default=None
+)
+
+
+def get_current_scope() -> Optional[BuilderScope]:
+    """Returns the scope of the builder being built,
+    None when the process-wide singletons are used.
+
+    :return: The current scope
+    :rtype: Optional[BuilderScope]
+    """
+
+    return _current_scope.get()
+
+
+@contextmanager
+def use_scope(scope: Optional[BuilderScope]) -> Iterator[Optional[BuilderScope]]:
+    """Makes the models use the given scope within the context.
+
+    :param scope: The scope, None for the process-wide singletons
+    :type scope: Optional[BuilderScope]
+    """
+
+    token = _current_scope.set(scope)
+    try:
+        yield scope
+    finally:
+        _current_scope.reset(token)
@@ -0,0 +1,330 @@
+"""The `src.sharding` module provides a multi-process runner partitioning
+incoming updates between worker processes by the user id.
+
+All the updates of one user are handled by the same worker in the order
+they were received, so the dialog stack of the user is never changed
+by two processes, and even the in-memory FSM storage stays consistent.
+
+Classes:
+---------
+- ShardedDispatcher: Routes the updates of an update source to the workers.
+
+Functions:
+---------
+- shard_for: Consistent hash of the user id to the worker index.
+- polling_source: Update source polling `getUpdates`.
+"""
+
+import asyncio
+import functools
+import hashlib
+import inspect
+import logging
+import multiprocessing
+import os
+import queue
+from typing import (
+    Any,
+    AsyncIterable,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from aiogram import Bot, Dispatcher
+from aiogram.types import Update
+
+from dialog_yml.exceptions import ShardWorkerError
+
+logger = logging.getLogger(__name__)
+
+WorkerSetup = Callable[
+    [int], Union[Tuple[Dispatcher, Bot], Awaitable[Tuple[Dispatcher, Bot]]]
+]
+UpdateSource = Union[AsyncIterable[Union[Update, dict]], Iterable[Union[Update, dict]]]
+
+_STOP = None
+
+DEFAULT_MAX_PENDING = 1000
+
+# Seconds to wait for a full queue before checking the worker is alive
+_PUT_INTERVAL = 0.5
+
+
+def shard_for(key: int, shards: int) -> int:
+    """Returns the shard of the key with the jump consistent hash,
+    so that changing the number of shards moves only `1/shards` of the keys.
+
+    :param key: The key, e.g. the user id
+    :type key: int
+    :param shards: The number of shards
+    :type shards: int
+
+    :return: The shard index in `[0, shards)`
+    :rtype: int
+    """
+
+    digest = hashlib.blake2b(str(key).encode(), digest_size=8).digest()
+    key = int.from_bytes(digest, "little")
+    bucket, jump = -1, 0
+    while jump < shards:
+        bucket = jump
+        key = (key * 2862933555777941757 + 1) & 0xFFFFFFFFFFFFFFFF
+        jump = int((bucket + 1) * ((1 << 31) / ((key >> 33) + 1)))
+    return bucket
+
+
+def get_update_user_id(update: Union[Update, dict]) -> int:
+    """Returns the id of the user the update belongs to,
+    the chat id for updates without a user, 0 if there is neither.
+
+    :param update: The update
+    :type update: Union[Update, dict]
+
+    :return: The user id
+    :rtype: int
+    """
+
+    if isinstance(update, Update):
+        update = update.model_dump(exclude_none=True)
+    for key, event in update.items():
+        if key == "update_id" or not isinstance(event, dict):
+            continue
+        for user_key in ("from_user", "from", "user"):
+            if user := event.get(user_key):
+                return user["id"]
+        if chat := event.get("chat"):
+            return chat["id"]
+    return 0
+
+
+async def polling_source(bot: Bot, timeout: int = 30) -> AsyncIterable[Update]:
+    """Update source polling `getUpdates` of the bot.
+
+    :param bot: The bot
+    :type bot: Bot
+    :param timeout: The long polling timeout in seconds
+    :type timeout: int (optional, default: 30)
+    """
+
+    offset = None
+    while True:
+        updates = await bot.get_updates(offset=offset, timeout=timeout)
+        for update in updates:
+            offset = update.update_id + 1
+            yield update
+
+
+async def _iterate(source: UpdateSource) -> AsyncIterable[Union[Update, dict]]:
+    if hasattr(source, "__aiter__"):
+        async for update in source:
+            yield update
+    else:
+        for update in source:
+            yield update
+
+
+class _UserOrderedFeeder:
+    """Feeds the updates to the dispatcher concurrently for different
+    users and sequentially for each user.
+
+    At most `max_pending` updates are handled or wait for the previous
+    update of their user, `feed` waits for a free slot beyond that.
+    Failed updates are logged and counted in `failed`.
+    """
+
+    def __init__(
+        self, dispatcher: Dispatcher, bot: Bot, max_pending: int = DEFAULT_MAX_PENDING
+    ):
+        self.dispatcher = dispatcher
+        self.bot = bot
+        self.failed = 0
+        self._tails: Dict[int, asyncio.Task] = {}
+        self._slots = asyncio.Semaphore(max_pending)
+
+    async def _feed(self, previous: Optional[asyncio.Task], update: Update) -> None:
+        try:
+            if previous is not None:
+                await asyncio.wait([previous])
+            await self.dispatcher.feed_update(self.bot, update)
+        except Exception:
+            self.failed += 1
+            logger.exception("Update %d failed", update.update_id)
+        finally:
+            self._slots.release()
+
+    async def feed(self, data: dict) -> None:
+        await self._slots.acquire()
+        user_id = get_update_user_id(data)
+        try:
+            update = Update.model_validate(data, context={"bot": self.bot})
+        except Exception:
+            self._slots.release()
+            self.failed += 1
+            logger.exception("Update %s is not valid", data.get("update_id"))
+            return
+        task = asyncio.create_task(self._feed(self._tails.get(user_id), update))
+        self._tails[user_id] = task
+        task.add_done_callback(lambda done: self._forget(user_id, done))
+
+    def _forget(self, user_id: int, task: asyncio.Task) -> None:
+        if self._tails.get(user_id) is task:
+            del self._tails[user_id]
+
+    async def wait(self) -> None:
+        while self._tails:
+            await asyncio.wait(list(self._tails.values()))
+
+
+async def _worker_loop(
+    index: int, updates: multiprocessing.Queue, setup: WorkerSetup, max_pending: int
+):
+    result = setup(index)
+    dispatcher, bot = await result if inspect.isawaitable(result) else result
+    feeder = _UserOrderedFeeder(dispatcher, bot, max_pending)
+    loop = asyncio.get_running_loop()
+    try:
+        while (data := await loop.run_in_executor(None, updates.get)) is not _STOP:
+            await feeder.feed(data)
+        await feeder.wait()
+    finally:
+        await bot.session.close()
+    if feeder.failed:
+        logger.error("Shard %d: %d updates failed", index, feeder.failed)
+
+
+def _worker_main(
+    index: int, updates: multiprocessing.Queue, setup: WorkerSetup, max_pending: int
+) -> None:
+    asyncio.run(_worker_loop(index, updates, setup, max_pending))
+
+
+class ShardedDispatcher:
+    """Multi-process runner routing the updates to the worker processes
+    by the consistent hash of the user id.
+
+    `setup` is called in each worker with its index and returns
+    the dispatcher, with the dialogs router included, and the bot.
+    With the default `fork` start method the workers inherit everything
+    built in the master, e.g. by `DialogYAMLBuilder.build`.
+
+    :param setup: The function returning the worker dispatcher and bot
+    :type setup: WorkerSetup
+    :param workers: The number of worker processes
+    :type workers: int (optional, default: the number of CPUs)
+    :param start_method: The multiprocessing start method
+    :type start_method: str (optional, default: "fork")
+    :param max_pending: The maximum number of updates of each worker
+        queued or in progress. Routing waits for the worker beyond that.
+    :type max_pending: int (optional, default: DEFAULT_MAX_PENDING)
+    """
+
+    def __init__(
+        self,
+        setup: WorkerSetup,
+        workers: Optional[int] = None,
+        start_method: str = "fork",
+        max_pending: int = DEFAULT_MAX_PENDING,
+    ):
+        self.setup = setup
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending
+        self._context = multiprocessing.get_context(start_method)
+
+    def get_shard(self, update: Union[Update, dict]) -> int:
+        return shard_for(get_update_user_id(update), self.workers)
+
+    async def run(self, source: UpdateSource) -> List[int]:
+        """Starts the workers and routes the updates of the source
+        to them until the source is exhausted.
+
+        :param source: The sync or async iterable of updates, e.g.
+            `polling_source(bot)` or a list of updates in tests
+        :type source: UpdateSource
+
+        :return: The exit codes of the workers by index
+        :rtype: List[int]
+
+        :raises ShardWorkerError: If a worker exits before
+            the source is exhausted
+        """
+
+        queues = [
+            self._context.Queue(maxsize=self.max_pending) for _ in range(self.workers)
+        ]
+        processes = [
+            self._context.Process(
+                target=_worker_main,
+                args=(index, updates, self.setup, self.max_pending),
+                name=f"dialog-yml-shard-{index}",
+                daemon=True,
+            )
+            for index, updates in enumerate(queues)
+        ]
+        for process in processes:
+            process.start()
+        logger.debug("Started %d shard workers", self.workers)
+
+        loop = asyncio.get_running_loop()
+        try:
+            async for update in _iterate(source):
+                data = self._dump(update)
+                shard = self.get_shard(data)
+                if not await self._put(queues[shard], processes[shard], data):
+                    raise ShardWorkerError(shard, processes[shard].exitcode)
+        finally:
+            stopped = [
+                process
+                for updates, process in zip(queues, processes)
+                if await self._put(updates, process, _STOP)
+            ]
+            for process in stopped:
+                await loop.run_in_executor(None, process.join)
+            for updates in queues:
+                # Stops the feeder thread of the queue
+                updates.close()
+
+        return [process.exitcode for process in processes]
+
+    @classmethod
+    async def _put(
+        cls,
+        updates: multiprocessing.Queue,
+        process: multiprocessing.Process,
+        data: Optional[dict],
+    ) -> bool:
+        """Puts the data into the queue of the worker,
+        waiting while the queue is full and the worker is alive.
+
+        :return: Whether the data was put, False if the worker is dead
+        :rtype: bool
+        """
+
+        if not process.is_alive():
+            return False
+        try:
+            updates.put_nowait(data)
+            return True
+        except queue.Full:
+            pass
+        # The worker is behind, wait for it without blocking the loop
+        put = functools.partial(updates.put, data, timeout=_PUT_INTERVAL)
+        loop = asyncio.get_running_loop()
+        while process.is_alive():
+            try:
+                await loop.run_in_executor(None, put)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    @classmethod
+    def _dump(cls, update: Union[Update, dict]) -> dict[str, Any]:
+        if isinstance(update, Update):
+            return update.model_dump(mode="json", exclude_none=True, by_alias=True)
+        return update
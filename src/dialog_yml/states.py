@@ -16,13 +16,54 @@ Classes:
 for managing and storing states and state groups.
 """
 
+import threading
+import types
 from collections import defaultdict
-from typing import List, Dict, Union, Iterable, Set, Type
+from typing import List, Dict, Union, Iterable, Set, Type, Optional
 
 from aiogram.fsm.state import State, StatesGroup
 
 from dialog_yml.decorators import singleton
 from dialog_yml.exceptions import DialogYamlException, StatesGroupNotFoundError
+from dialog_yml.scope import get_current_scope
+
+
+class StatesMap(dict):
+    """Dictionary counting its changes in `version`,
+    so that indices built from it can be invalidated."""
+
+    version: int = 0
+
+    def _changed(self) -> None:
+        self.version += 1
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._changed()
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._changed()
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self._changed()
+
+    def setdefault(self, key, default=None):
+        self._changed()
+        return super().setdefault(key, default)
+
+    def pop(self, *args):
+        self._changed()
+        return super().pop(*args)
+
+    def popitem(self):
+        self._changed()
+        return super().popitem()
+
+    def clear(self):
+        super().clear()
+        self._changed()
 
 
 @singleton
@@ -43,11 +84,88 @@ class YAMLStatesManager:
     """
 
     DELIMITER = ":"
-    _states_groups_map_: Dict[str, Union[State, StatesGroup]]
+    _map_: StatesMap
 
     def __init__(self):
+        self._lock = threading.RLock()
         self._states_groups_map_ = {}
 
+    @property
+    def _states_groups_map_(self) -> StatesMap:
+        return self._map_
+
+    @_states_groups_map_.setter
+    def _states_groups_map_(self, value: Dict[str, Union[State, StatesGroup]]) -> None:
+        with self._lock:
+            self._map_ = value if isinstance(value, StatesMap) else StatesMap(value)
+            self._indices_ = (None, None)
+
+    def _get_indices(
+        self,
+    ) -> tuple[Dict[str, StatesGroup], Dict[str, State], types.SimpleNamespace]:
+        """Returns the group and state indices and the groups namespace,
+        rebuilt only after the states groups map changes.
+
+        :return: The groups by name, the states by full name
+            and the namespace of the groups
+        :rtype: tuple[Dict[str, StatesGroup], Dict[str, State], SimpleNamespace]
+        """
+
+        # The key and the indices are replaced together,
+        # so readers in other threads never see a mismatched pair
+        key = (id(self._map_), self._map_.version)
+        indices_key, indices = self._indices_
+        if indices_key == key:
+            return indices
+
+        with self._lock:
+            key = (id(self._map_), self._map_.version)
+            groups = {}
+            states = {}
+            for name, item in tuple(self._map_.items()):
+                if isinstance(item, StatesGroup) and self.DELIMITER not in name:
+                    groups[name] = item
+                elif isinstance(item, State):
+                    states[name] = item
+            indices = (groups, states, types.SimpleNamespace(**groups))
+            self._indices_ = (key, indices)
+        return indices
+
+    @property
+    def namespace(self) -> types.SimpleNamespace:
+        """The cached namespace of the states groups,
+        invalidated when the states change.
+
+        :return: The states groups by name
+        :rtype: types.SimpleNamespace
+        """
+
+        return self._get_indices()[2]
+
+    def get_group(self, group_name: str) -> Optional[StatesGroup]:
+        """Get the states group by its name.
+
+        :param group_name: The name of the group
+        :type group_name: str
+
+        :return: The StatesGroup object or None if not found.
+        :rtype: Optional[StatesGroup]
+        """
+
+        return self._get_indices()[0].get(group_name)
+
+    def get_state(self, name: str) -> Optional[State]:
+        """Get the state by its full name, e.g. `group:state`.
+
+        :param name: The full name of the state
+        :type name: str
+
+        :return: The State object or None if not found.
+        :rtype: Optional[State]
+        """
+
+        return self._get_indices()[1].get(name)
+
     def get_by_names(
         self, group_name: str, state_name: str
     ) -> Union[StatesGroup, State, None]:
@@ -257,13 +375,15 @@ class YAMLStatesManager:
         if state_name is None:
             raise DialogYamlException("State name cannot be None")
         full_state_name = self.format_state_name(group_name, state_name)
-        states_group = self._states_groups_map_.get(group_name, None)
 
-        if not states_group:
-            raise StatesGroupNotFoundError(group_name)
+        with self._lock:
+            states_group = self._states_groups_map_.get(group_name, None)
+
+            if not states_group:
+                raise StatesGroupNotFoundError(group_name)
 
-        state.set_parent(states_group.__class__)
-        self._states_groups_map_[full_state_name] = state
+            state.set_parent(states_group.__class__)
+            self._states_groups_map_[full_state_name] = state
 
     def add_states_to_map(self, group_name: str, states: Dict[str, State]) -> None:
         """Adds states to the states groups map.
@@ -292,7 +412,8 @@ class YAMLStatesManager:
         :rtype: None
         """
 
-        self._states_groups_map_[group_name] = states_group
+        with self._lock:
+            self._states_groups_map_[group_name] = states_group
 
     @classmethod
     def format_state_name(cls, group_name: str, state_name: str) -> str:
@@ -316,15 +437,8 @@ class YAMLStatesManager:
         :return: A list of group names
         :rtype: List[str]
         """
-        # Group names are the keys that don't contain the delimiter
-        group_names = []
-        for key in self._states_groups_map_.keys():
-            if self.DELIMITER not in key:
-                # Check if this key represents a StatesGroup (not a State)
-                item = self._states_groups_map_[key]
-                if isinstance(item, StatesGroup):
-                    group_names.append(key)
-        return group_names
+
+        return list(self._get_indices()[0])
 
     def include_states_group_by_class(self, custom_state_class: Type[StatesGroup]) -> None:
         """It creates an instance of the custom `StatesGroup` class,
@@ -361,3 +475,15 @@ class YAMLStatesManager:
                 self.add_state_to_map(group_name, state)
         else:
             raise DialogYamlException(f"{group_name!r} must have at least one state.")
+
+
+def get_states_manager() -> YAMLStatesManager:
+    """Returns the states manager of the current builder scope,
+    the process-wide one by default.
+
+    :return: The states manager
+    :rtype: YAMLStatesManager
+    """
+
+    scope = get_current_scope()
+    return scope.states_manager if scope else YAMLStatesManager()
@@ -0,0 +1,127 @@
+"""The `src.variants` module provides per-bot variants of one built
+dialog tree.
+
+Several bots with the same flows can share one built dialog tree and
+differ only in a small set of texts and functions. Texts are data keys
+added to the render data of every window, e.g. `format: "Welcome to {brand}"`,
+functions replace registered functions by name.
+
+Classes:
+---------
+- BotVariants: The texts and the functions of each bot.
+"""
+
+import functools
+import inspect
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterable, Optional, Union
+
+from aiogram import Bot
+
+from dialog_yml.exceptions import FunctionOverrideError
+
+current_bot_id: ContextVar[Optional[int]] = ContextVar(
+    "dialog_yml_bot_id", default=None
+)
+
+
+def get_bot_id(bot: Union[Bot, int]) -> int:
+    return bot if isinstance(bot, int) else bot.id
+
+
+class BotVariants:
+    """The texts and the functions overridden for each bot.
+
+    The bot of the current update is set by `DialogYAMLMiddleware`.
+    An overriding function must be sync or async like the registered one.
+    Texts and overrides of already wrapped functions are resolved
+    when called, so bots can be added after the build, as long as
+    they don't override functions the build left unwrapped.
+
+    :param texts: The default texts, used by bots without overrides
+    :type texts: Dict[str, Any] (optional, default: None)
+    """
+
+    def __init__(self, texts: Optional[Dict[str, Any]] = None):
+        self.default_texts: Dict[str, Any] = dict(texts or {})
+        self._texts: Dict[int, Dict[str, Any]] = {}
+        self._functions: Dict[int, Dict[str, Callable]] = {}
+        self._unwrapped_names: set[str] = set()
+
+    def add(
+        self,
+        bot: Union[Bot, int],
+        texts: Optional[Dict[str, Any]] = None,
+        functions: Union[Dict[str, Callable], Iterable[Callable], None] = None,
+    ) -> None:
+        """Adds the overrides of the bot.
+
+        :param bot: The bot or its id
+        :type bot: Union[Bot, int]
+        :param texts: The texts by data key
+        :type texts: Dict[str, Any] (optional, default: None)
+        :param functions: The functions by registered name,
+            or the functions named like the registered ones
+        :type functions: Union[Dict[str, Callable], Iterable[Callable]]
+            (optional, default: None)
+
+        :raises FunctionOverrideError: When a function is built
+            without overrides already
+        """
+
+        bot_id = get_bot_id(bot)
+        if functions is not None and not isinstance(functions, dict):
+            functions = {function.__name__: function for function in functions}
+        if late_names := sorted(self._unwrapped_names.intersection(functions or {})):
+            raise FunctionOverrideError(bot_id, late_names)
+        self._texts[bot_id] = {**self.default_texts, **(texts or {})}
+        self._functions[bot_id] = dict(functions or {})
+
+    @property
+    def function_names(self) -> set[str]:
+        return {name for functions in self._functions.values() for name in functions}
+
+    def get_texts(self, bot_id: Optional[int]) -> Dict[str, Any]:
+        return self._texts.get(bot_id, self.default_texts)
+
+    def get_function(self, name: str, default: Callable) -> Callable:
+        return self._functions.get(current_bot_id.get(), {}).get(name, default)
+
+    async def texts_getter(self, dialog_manager, **kwargs) -> Dict[str, Any]:
+        """Window data getter returning the texts of the current bot."""
+
+        bot_id = current_bot_id.get()
+        if bot_id is None and (bot := dialog_manager.middleware_data.get("bot")):
+            bot_id = bot.id
+        return self.get_texts(bot_id)
+
+    def wrap(self, name: str, function: Callable) -> Callable:
+        """Wraps the registered function, so that the override
+        of the current bot is called instead, if any.
+
+        :param name: The registered function name
+        :type name: str
+        :param function: The registered function
+        :type function: Callable
+
+        :return: The function or its wrapper
+        :rtype: Callable
+        """
+
+        if name not in self.function_names:
+            self._unwrapped_names.add(name)
+            return function
+
+        if inspect.iscoroutinefunction(function):
+
+            @functools.wraps(function)
+            async def async_wrapper(*args, **kwargs):
+                return await self.get_function(name, function)(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            return self.get_function(name, function)(*args, **kwargs)
+
+        return wrapper
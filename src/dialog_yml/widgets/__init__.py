@@ -0,0 +1,46 @@
+"""The `src.widgets` module provides aiogram-dialog widgets implemented
+by dialog-yml itself.
+
+Models from `src.models.widgets` produce these widgets when the plain
+aiogram-dialog ones are not enough for the YAML configuration.
+"""
+
+from .keyboard import DynamicGroup, StaticKeyboard, is_static_keyboard
+from .render import RenderCache, RenderCachedWindow
+from .scroll import (
+    ItemsPage,
+    ItemsRequest,
+    PagedItemsScroll,
+    Pagination,
+    WindowedPager,
+)
+from .text import (
+    CompiledFormat,
+    CompiledTemplate,
+    I18nText,
+    PagedScrollingText,
+    share_templates,
+)
+from .when import MemoizedPredicate, WhenCache, get_when_cache, memoize_conditions
+
+__all__ = [
+    "CompiledFormat",
+    "CompiledTemplate",
+    "DynamicGroup",
+    "I18nText",
+    "ItemsPage",
+    "ItemsRequest",
+    "MemoizedPredicate",
+    "PagedItemsScroll",
+    "PagedScrollingText",
+    "Pagination",
+    "RenderCache",
+    "RenderCachedWindow",
+    "StaticKeyboard",
+    "WhenCache",
+    "WindowedPager",
+    "get_when_cache",
+    "is_static_keyboard",
+    "memoize_conditions",
+    "share_templates",
+]
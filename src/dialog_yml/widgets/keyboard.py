@@ -0,0 +1,242 @@
+import inspect
+import json
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Iterable, Optional, Union
+
+from aiogram.types import CallbackQuery
+from aiogram_dialog.api.internal import RawKeyboard
+from aiogram_dialog.api.protocols import DialogManager, DialogProtocol
+from aiogram_dialog.widgets.common import WhenCondition, true_condition
+from aiogram_dialog.widgets.kbd import (
+    Back,
+    Button,
+    Cancel,
+    Column,
+    Group,
+    Keyboard,
+    Next,
+    Row,
+    Start,
+    SwitchTo,
+    Url,
+)
+from aiogram_dialog.widgets.text import Const
+
+DEFAULT_CACHE_SIZE = 128
+
+STATIC_BUTTONS = (Button, Url, SwitchTo, Start, Next, Back, Cancel)
+STATIC_GROUPS = (Group, Row, Column)
+
+ButtonsFactory = Callable[[dict, DialogManager], Any]
+ButtonsCompiler = Callable[[list], Iterable[Keyboard]]
+
+
+class DynamicGroup(Group):
+    """Group keyboard whose buttons are produced at render time.
+
+    The factory is called with the dialog data and the dialog manager
+    and returns YAML-like buttons data. The data is compiled into
+    widgets by the compiler and the resulting group is cached, so
+    repeated renders with the same key do not rebuild the widget tree.
+    Clicks on buttons of groups missing from the cache, e.g. evicted
+    or rendered by another process, rebuild the group from the current
+    dialog data.
+
+    :param factory: Sync or async function returning buttons data.
+    :type factory: ButtonsFactory
+    :param compiler: Function converting buttons data to keyboards.
+    :type compiler: ButtonsCompiler
+    :param cache_key: The name of the dialog data key identifying
+        the buttons set. When provided, the factory is not called
+        on a cache hit. Otherwise, the factory output itself is the key.
+    :type cache_key: str (optional, default: None)
+    :param cache_size: The maximum number of cached button sets.
+    :type cache_size: int (optional, default: DEFAULT_CACHE_SIZE)
+    """
+
+    def __init__(
+        self,
+        factory: ButtonsFactory,
+        compiler: ButtonsCompiler,
+        id: Optional[str] = None,
+        width: Optional[int] = None,
+        cache_key: Optional[str] = None,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+        when: WhenCondition = None,
+    ):
+        super().__init__(id=id, width=width, when=when)
+        self.factory = factory
+        self.compiler = compiler
+        self.cache_key = cache_key
+        self.cache_size = cache_size
+        self._groups: OrderedDict[Hashable, Group] = OrderedDict()
+
+    @property
+    def cached_groups(self) -> tuple[Group, ...]:
+        return tuple(self._groups.values())
+
+    def clear_cache(self) -> None:
+        self._groups.clear()
+
+    async def _call_factory(self, data: dict, manager: DialogManager) -> list:
+        buttons_data = self.factory(data, manager)
+        if inspect.isawaitable(buttons_data):
+            buttons_data = await buttons_data
+        return list(buttons_data or [])
+
+    @classmethod
+    def _make_data_key(cls, buttons_data: list) -> str:
+        return json.dumps(buttons_data, sort_keys=True, default=str)
+
+    def _get_cached(self, key: Hashable) -> Union[Group, None]:
+        group = self._groups.get(key)
+        if group is not None:
+            self._groups.move_to_end(key)
+        return group
+
+    def _put_cached(self, key: Hashable, buttons_data: list) -> Group:
+        group = Group(*self.compiler(buttons_data), width=self.width)
+        self._groups[key] = group
+        while len(self._groups) > self.cache_size:
+            self._groups.popitem(last=False)
+        return group
+
+    async def get_group(self, data: dict, manager: DialogManager) -> Group:
+        """Returns the compiled group for the current dialog data.
+
+        :param data: The dialog data
+        :type data: dict
+        :param manager: The dialog manager
+        :type manager: DialogManager
+
+        :return: The compiled group
+        :rtype: Group
+        """
+
+        if self.cache_key is not None:
+            key = ("key", data.get(self.cache_key))
+            if group := self._get_cached(key):
+                return group
+            buttons_data = await self._call_factory(data, manager)
+        else:
+            buttons_data = await self._call_factory(data, manager)
+            key = ("data", self._make_data_key(buttons_data))
+            if group := self._get_cached(key):
+                return group
+
+        return self._put_cached(key, buttons_data)
+
+    async def _render_keyboard(
+        self,
+        data: dict,
+        manager: DialogManager,
+    ) -> RawKeyboard:
+        group = await self.get_group(data, manager)
+        return await group._render_keyboard(data, manager)
+
+    def find(self, widget_id):
+        if self.widget_id is not None and self.widget_id == widget_id:
+            return self
+        for group in reversed(self._groups.values()):
+            if widget := group.find(widget_id):
+                return widget
+        return None
+
+    @classmethod
+    async def _load_data(cls, dialog: DialogProtocol, manager: DialogManager) -> dict:
+        windows = getattr(dialog, "windows", {})
+        window = windows.get(manager.current_context().state)
+        if window is not None:
+            return await window.load_data(dialog, manager)
+        return await dialog.load_data(manager)
+
+    async def _process_other_callback(
+        self,
+        callback: CallbackQuery,
+        dialog: DialogProtocol,
+        manager: DialogManager,
+    ) -> bool:
+        cached_groups = self.cached_groups
+        for group in reversed(cached_groups):
+            if await group.process_callback(callback, dialog, manager):
+                return True
+
+        # The group of the clicked button may have been evicted or rendered
+        # by another process, so it's rebuilt from the current dialog data
+        data = await self._load_data(dialog, manager)
+        group = await self.get_group(data, manager)
+        if group in cached_groups:
+            return False
+        return await group.process_callback(callback, dialog, manager)
+
+
+def is_static_keyboard(widget: Keyboard) -> bool:
+    """Checks whether the keyboard renders the same buttons
+    for any dialog data.
+
+    A keyboard is static when it consists of plain buttons and groups
+    only, without `when` conditions, and all its texts are `Const`.
+    Subclasses are not considered static, as they may override rendering.
+
+    :param widget: The keyboard to check
+    :type widget: Keyboard
+
+    :return: True if the keyboard is static, False otherwise
+    :rtype: bool
+    """
+
+    if widget.condition is not true_condition:
+        return False
+
+    widget_type = type(widget)
+    if widget_type in STATIC_GROUPS:
+        return all(is_static_keyboard(button) for button in widget.buttons)
+
+    if widget_type not in STATIC_BUTTONS:
+        return False
+
+    texts = [widget.text, widget.url] if widget_type is Url else [widget.text]
+    return all(
+        type(text) is Const and text.condition is true_condition for text in texts
+    )
+
+
+class StaticKeyboard(Keyboard):
+    """Keyboard rendering the wrapped static keyboard only once.
+
+    The rendered buttons are cached and copied on every render,
+    because the markup factory adds the intent id to the callback
+    data of the returned buttons in place.
+
+    :param keyboard: The static keyboard
+    :type keyboard: Keyboard
+    """
+
+    def __init__(self, keyboard: Keyboard):
+        super().__init__()
+        self.keyboard = keyboard
+        self._rows: Optional[RawKeyboard] = None
+
+    @property
+    def buttons(self) -> tuple[Keyboard]:
+        return (self.keyboard,)
+
+    async def _render_keyboard(
+        self,
+        data: dict,
+        manager: DialogManager,
+    ) -> RawKeyboard:
+        if self._rows is None:
+            self._rows = await self.keyboard.render_keyboard(data, manager)
+        return [[button.model_copy() for button in row] for row in self._rows]
+
+    def find(self, widget_id):
+        return self.keyboard.find(widget_id)
+
+    async def process_callback(
+        self,
+        callback: CallbackQuery,
+        dialog: DialogProtocol,
+        manager: DialogManager,
+    ) -> bool:
+        return await self.keyboard.process_callback(callback, dialog, manager)
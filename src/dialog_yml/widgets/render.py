@@ -0,0 +1,323 @@
+import dataclasses
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Iterable, Optional
+
+from aiogram_dialog import Window
+from aiogram_dialog.api.entities import MarkupVariant
+from aiogram_dialog.api.internal import RawKeyboard
+from aiogram_dialog.api.protocols import DialogManager
+from aiogram_dialog.widgets.common import true_condition
+from aiogram_dialog.widgets.kbd import Keyboard
+from aiogram_dialog.widgets.text import Const, Multi, Text
+from pydantic import BaseModel
+
+from dialog_yml.widgets.keyboard import (
+    STATIC_BUTTONS,
+    STATIC_GROUPS,
+    StaticKeyboard,
+    is_static_keyboard,
+)
+from dialog_yml.widgets.text import CompiledFormat, I18nText
+from dialog_yml.widgets.utils import iter_widgets
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RENDER_CACHE_SIZE = 256
+
+LocaleGetter = Callable[[DialogManager], str]
+
+
+class _UnstableValueError(TypeError):
+    """Raised for render data values without a value-based key."""
+
+
+def _encode_value(value: Any, hashables: list) -> Any:
+    """Encodes a render data value that is not JSON-native for the key.
+
+    Pydantic models and dataclasses are encoded by their fields. Values
+    hashable by value, e.g. dates or enums, are kept in `hashables`
+    and compared by the cache as they are. Other objects, whose string
+    may include their memory address, can't be keyed.
+
+    :raises _UnstableValueError: If the value can't be keyed
+    """
+
+    if isinstance(value, BaseModel):
+        return [type(value).__qualname__, value.model_dump()]
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        fields = dataclasses.fields(value)
+        return [
+            type(value).__qualname__,
+            {field.name: getattr(value, field.name) for field in fields},
+        ]
+    if type(value).__hash__ not in (None, object.__hash__):
+        hashables.append((type(value), value))
+        return ["__hashable__", len(hashables) - 1]
+    raise _UnstableValueError(type(value).__qualname__)
+
+
+class RenderCache:
+    """Cache of the texts and the keyboards rendered by a window.
+
+    Entries are keyed by a hash of the render data the window uses:
+    the values of the data keys and the state of the stateful widgets
+    of the current dialog, e.g. checks or pages. They are evicted
+    by the least recently used order above `size` entries
+    and after `ttl` seconds.
+
+    Values must be JSON-native, pydantic models, dataclasses or hashable
+    by value. Renders with other objects in the used data are not cached.
+
+    :param keys: The data keys the rendered output depends on,
+        including context keys like `dialog_data` when a widget reads them.
+    :type keys: Iterable[str]
+    :param state_ids: The ids of the widgets keeping their state
+        in the dialog context.
+    :type state_ids: Iterable[str] (optional, default: ())
+    :param size: The maximum number of cached entries.
+    :type size: int (optional, default: DEFAULT_RENDER_CACHE_SIZE)
+    :param ttl: The lifetime of the entries in seconds, unlimited if not set.
+    :type ttl: float (optional, default: None)
+    :param get_locale: The function returning the locale of the user,
+        for windows with localized texts.
+    :type get_locale: LocaleGetter (optional, default: None)
+
+    :ivar hits: The number of renders answered from the cache
+    :vartype hits: int
+    :ivar misses: The number of renders of the widgets
+    :vartype misses: int
+    """
+
+    def __init__(
+        self,
+        keys: Iterable[str],
+        state_ids: Iterable[str] = (),
+        size: int = DEFAULT_RENDER_CACHE_SIZE,
+        ttl: Optional[float] = None,
+        get_locale: Optional[LocaleGetter] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.keys = tuple(sorted(keys))
+        self.state_ids = tuple(sorted(state_ids))
+        self.size = size
+        self.ttl = ttl
+        self.get_locale = get_locale
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Hashable, tuple[Optional[float], Any]] = (
+            OrderedDict()
+        )
+        self._unstable_types: set[str] = set()
+
+    @property
+    def stats(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def make_key(self, data: dict, manager: DialogManager) -> Optional[Hashable]:
+        """Returns the key of the render data.
+
+        :param data: The render data
+        :type data: dict
+        :param manager: The dialog manager
+        :type manager: DialogManager
+
+        :return: The key, None if the used data can't be keyed
+        :rtype: Optional[Hashable]
+        """
+
+        used_data = {key: data.get(key) for key in self.keys}
+        if self.state_ids:
+            widget_data = manager.current_context().widget_data
+            used_data = [
+                used_data,
+                {state_id: widget_data.get(state_id) for state_id in self.state_ids},
+            ]
+        hashables = []
+        try:
+            dump = json.dumps(
+                used_data,
+                sort_keys=True,
+                default=lambda value: _encode_value(value, hashables),
+            )
+        except _UnstableValueError as error:
+            if str(error) not in self._unstable_types:
+                self._unstable_types.add(str(error))
+                logger.warning(
+                    "Render data with %s objects is not cached: they are not "
+                    "JSON-native, models, dataclasses or hashable by value",
+                    error,
+                )
+            return None
+        key = hashlib.blake2b(dump.encode(), digest_size=16).digest()
+        if hashables:
+            key = (key, tuple(hashables))
+        if self.get_locale is not None:
+            key = (self.get_locale(manager), key)
+        return key
+
+    def get(self, key: Hashable) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, value = entry
+        if expires_at is not None and expires_at <= self.clock():
+            del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        expires_at = self.clock() + self.ttl if self.ttl else None
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.size:
+            self._entries.popitem(last=False)
+
+
+class RenderCachedWindow(Window):
+    """Window rendering its text and keyboard once for equal render data.
+
+    The keyboard is cached before the markup factory, which adds
+    the intent id of the user to the callback data, and the cached
+    buttons are copied on every render. Previews are never cached.
+
+    :param render_cache: The cache
+    :type render_cache: RenderCache
+    """
+
+    def __init__(self, *widgets, render_cache: RenderCache, **kwargs):
+        super().__init__(*widgets, **kwargs)
+        self.render_cache = render_cache
+
+    async def render_text(self, data: dict, manager: DialogManager) -> str:
+        if manager.is_preview():
+            return await super().render_text(data, manager)
+
+        key = self.render_cache.make_key(data, manager)
+        if key is None:
+            return await super().render_text(data, manager)
+
+        key = ("text", key)
+        text = self.render_cache.get(key)
+        if text is None:
+            text = await super().render_text(data, manager)
+            self.render_cache.put(key, text)
+        return text
+
+    async def render_kbd(self, data: dict, manager: DialogManager) -> MarkupVariant:
+        if manager.is_preview():
+            return await super().render_kbd(data, manager)
+
+        key = self.render_cache.make_key(data, manager)
+        if key is None:
+            return await super().render_kbd(data, manager)
+
+        key = ("keyboard", key)
+        rows: Optional[RawKeyboard] = self.render_cache.get(key)
+        if rows is None:
+            rows = await self.keyboard.render_keyboard(data, manager)
+            self.render_cache.put(key, rows)
+        keyboard = [[button.model_copy() for button in row] for row in rows]
+        return await self.markup_factory.render_markup(data, manager, keyboard)
+
+
+def infer_render_keys(widgets: Iterable[Any]) -> Optional[frozenset[str]]:
+    """Infers the data keys the texts and the keyboards of a window use.
+
+    Keys are known for windows whose texts are constant or compiled
+    formatted texts and whose keyboards are static, all without
+    `when` conditions.
+
+    :param widgets: The window widgets
+    :type widgets: Iterable[Any]
+
+    :return: The keys, None if they can't be inferred
+    :rtype: Optional[frozenset[str]]
+    """
+
+    keys = set()
+    for widget in iter_widgets(_render_roots(widgets)):
+        if getattr(widget, "condition", true_condition) is not true_condition:
+            return None
+        if isinstance(widget, CompiledFormat):
+            keys.update(widget.required_keys)
+        elif type(widget) in (Const, Multi) or isinstance(widget, StaticKeyboard):
+            continue
+        elif isinstance(widget, Keyboard) and is_static_keyboard(widget):
+            continue
+        else:
+            return None
+    return frozenset(keys)
+
+
+def collect_required_keys(widgets: Iterable[Any]) -> frozenset[str]:
+    """Returns the data keys the compiled formatted texts of the widgets use.
+
+    :param widgets: The window widgets
+    :type widgets: Iterable[Any]
+
+    :return: The keys
+    :rtype: frozenset[str]
+    """
+
+    return frozenset(
+        key
+        for widget in iter_widgets(_render_roots(widgets))
+        if isinstance(widget, CompiledFormat)
+        for key in widget.required_keys
+    )
+
+
+def find_state_ids(widgets: Iterable[Any]) -> frozenset[str]:
+    """Returns the ids of the widgets which may keep their state
+    in the dialog context, e.g. selects, scrolls and counters.
+
+    Every widget with an id is included, except the static buttons
+    and groups, which keep no state.
+
+    :param widgets: The window widgets
+    :type widgets: Iterable[Any]
+
+    :return: The widget ids
+    :rtype: frozenset[str]
+    """
+
+    return frozenset(
+        widget.widget_id
+        for widget in iter_widgets(_render_roots(widgets))
+        if getattr(widget, "widget_id", None) is not None
+        and type(widget) not in STATIC_BUTTONS + STATIC_GROUPS
+    )
+
+
+def _render_roots(widgets: Iterable[Any]) -> list:
+    return [widget for widget in widgets if isinstance(widget, (Text, Keyboard))]
+
+
+def find_locale_getter(widgets: Iterable[Any]) -> Optional[LocaleGetter]:
+    """Returns the locale getter of the first localized text of the widgets.
+
+    :param widgets: The window widgets
+    :type widgets: Iterable[Any]
+
+    :return: The locale getter, None if the widgets are not localized
+    :rtype: Optional[LocaleGetter]
+    """
+
+    for widget in iter_widgets(widgets):
+        if isinstance(widget, I18nText):
+            return widget.catalogs.get_locale
+    return None
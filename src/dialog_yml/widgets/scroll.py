@@ -0,0 +1,264 @@
+import inspect
+import math
+from enum import Enum
+from typing import Any, Callable, NamedTuple, Optional, Sequence, Union
+
+from aiogram.types import InlineKeyboardButton
+from aiogram_dialog.api.internal import RawKeyboard
+from aiogram_dialog.api.protocols import DialogManager
+from aiogram_dialog.widgets.common import Scroll, WhenCondition
+from aiogram_dialog.widgets.common.scroll import OnPageChangedVariants
+from aiogram_dialog.widgets.kbd import StubScroll, NumberedPager
+from aiogram_dialog.widgets.kbd.pager import (
+    DEFAULT_PAGER_ID,
+    DEFAULT_PAGE_TEXT,
+    DEFAULT_CURRENT_PAGE_TEXT,
+    PagerData,
+)
+from aiogram_dialog.widgets.text import Text, Format
+
+DEFAULT_PAGE_SIZE = 10
+DEFAULT_PAGER_WINDOW = 2
+DEFAULT_JUMP_PREV_TEXT = Format("« {target_page1}")
+DEFAULT_JUMP_NEXT_TEXT = Format("{target_page1} »")
+
+
+class Pagination(Enum):
+    """The Pagination class represents the cursor kind used
+    to request pages from an items source.
+
+    :cvar offset: Pages are requested by `offset` and `limit`.
+    :vartype offset: Pagination
+    :cvar keyset: Pages are requested by the `cursor` returned
+        with the previous page.
+    :vartype keyset: Pagination
+    """
+
+    offset = "offset"
+    keyset = "keyset"
+
+
+class ItemsRequest(NamedTuple):
+    """A request for one page of items passed to the items source."""
+
+    page: int
+    offset: int
+    limit: int
+    cursor: Any = None
+
+
+class ItemsPage(NamedTuple):
+    """One page of items returned by the items source.
+
+    `total` is the total number of items, when known. `next_cursor`
+    is the cursor of the next page for keyset pagination, `None`
+    on the last page. It is stored in the widget data, so it must be
+    serializable by the FSM storage.
+    """
+
+    items: Sequence
+    total: Optional[int] = None
+    next_cursor: Any = None
+
+
+ItemsSource = Callable[[ItemsRequest, DialogManager], Any]
+
+
+class PagedItemsScroll(StubScroll):
+    """Scroll over items loaded one page at a time from an items source.
+
+    The widget renders no buttons. Its `load_page` method is a data
+    getter, which loads the current page and puts the items
+    and the pages count into the dialog data under `items_key`
+    and `pages_key`, so that a select widget and pagers can use them.
+
+    :param id: The scroll id, used by pagers.
+    :type id: str
+    :param source: Sync or async function returning `ItemsPage`
+        or a sequence of items for the given `ItemsRequest`.
+    :type source: ItemsSource
+    :param page_size: The number of items per page.
+    :type page_size: int (optional, default: DEFAULT_PAGE_SIZE)
+    :param pagination: The cursor kind.
+    :type pagination: Pagination (optional, default: Pagination.offset)
+    """
+
+    def __init__(
+        self,
+        id: str,
+        source: ItemsSource,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        pagination: Pagination = Pagination.offset,
+        on_page_changed: OnPageChangedVariants = None,
+    ):
+        self.items_key = f"{id}_items"
+        self.pages_key = f"{id}_pages"
+        self.state_key = f"{id}_state"
+        super().__init__(id=id, pages=self.pages_key, on_page_changed=on_page_changed)
+        self.source = source
+        self.page_size = page_size
+        self.pagination = pagination
+
+    async def _render_keyboard(
+        self,
+        data: dict,
+        manager: DialogManager,
+    ) -> RawKeyboard:
+        return []
+
+    def _get_state(self, manager: DialogManager) -> dict:
+        return manager.current_context().widget_data.setdefault(
+            self.state_key, {"cursors": [None]}
+        )
+
+    async def _call_source(
+        self, request: ItemsRequest, manager: DialogManager
+    ) -> ItemsPage:
+        result = self.source(request, manager)
+        if inspect.isawaitable(result):
+            result = await result
+        if isinstance(result, ItemsPage):
+            return result
+        return ItemsPage(items=list(result or []))
+
+    async def load_page(self, dialog_manager: DialogManager, **kwargs) -> dict:
+        """Loads the current page from the items source.
+
+        :param dialog_manager: The dialog manager
+        :type dialog_manager: DialogManager
+
+        :return: The items and the pages count of the current page
+        :rtype: dict
+        """
+
+        page = await self.get_page(dialog_manager)
+        cursor = None
+
+        if self.pagination is Pagination.keyset:
+            cursors = self._get_state(dialog_manager)["cursors"]
+            if page >= len(cursors):
+                # The cursor of a not yet visited page is unknown
+                page = len(cursors) - 1
+                self.set_widget_data(dialog_manager, page)
+            cursor = cursors[page]
+
+        request = ItemsRequest(
+            page=page,
+            offset=page * self.page_size,
+            limit=self.page_size,
+            cursor=cursor,
+        )
+        items_page = await self._call_source(request, dialog_manager)
+
+        if self.pagination is Pagination.keyset:
+            del cursors[page + 1 :]
+            if items_page.next_cursor is not None:
+                cursors.append(items_page.next_cursor)
+            has_next = items_page.next_cursor is not None
+        else:
+            has_next = len(items_page.items) >= self.page_size
+
+        if items_page.total is not None:
+            pages = max(1, math.ceil(items_page.total / self.page_size))
+        else:
+            pages = page + 2 if has_next else page + 1
+
+        return {self.items_key: items_page.items, self.pages_key: pages}
+
+
+class WindowedPager(NumberedPager):
+    """Numbered pager rendering only the first and the last pages
+    and a sliding window of pages around the current one.
+
+    Unlike `NumberedPager`, which renders a button for every page,
+    the render cost depends on the window size only.
+
+    :param window: The number of neighbor pages shown
+        on each side of the current page.
+    :type window: int (optional, default: DEFAULT_PAGER_WINDOW)
+    :param jump: The step of the additional jump buttons placed
+        outside the window. Jump buttons are not shown when not set.
+    :type jump: int (optional, default: None)
+    """
+
+    def __init__(
+        self,
+        scroll: Union[str, Scroll, None],
+        id: str = DEFAULT_PAGER_ID,
+        page_text: Text = DEFAULT_PAGE_TEXT,
+        current_page_text: Text = DEFAULT_CURRENT_PAGE_TEXT,
+        window: int = DEFAULT_PAGER_WINDOW,
+        jump: Optional[int] = None,
+        jump_prev_text: Text = DEFAULT_JUMP_PREV_TEXT,
+        jump_next_text: Text = DEFAULT_JUMP_NEXT_TEXT,
+        when: WhenCondition = None,
+        length: Optional[int] = None,
+    ):
+        super().__init__(
+            scroll=scroll,
+            id=id,
+            page_text=page_text,
+            current_page_text=current_page_text,
+            when=when,
+            length=length,
+        )
+        self.window = max(0, window)
+        self.jump = jump
+        self.jump_prev_text = jump_prev_text
+        self.jump_next_text = jump_next_text
+
+    def get_visible_pages(self, current_page: int, pages: int) -> dict[int, Text]:
+        """Returns the pages to render with their text widgets,
+        ordered by page number.
+
+        :param current_page: The current page
+        :type current_page: int
+        :param pages: The number of pages
+        :type pages: int
+
+        :return: The text widget by page number
+        :rtype: dict[int, Text]
+        """
+
+        if pages <= 0:
+            return {}
+
+        last_page = pages - 1
+        current_page = min(max(current_page, 0), last_page)
+        start = max(0, current_page - self.window)
+        end = min(last_page, current_page + self.window)
+
+        visible = {0: self.page_text, last_page: self.page_text}
+        for target_page in range(start, end + 1):
+            visible[target_page] = self.page_text
+        if self.jump:
+            if 0 < current_page - self.jump < start:
+                visible[current_page - self.jump] = self.jump_prev_text
+            if end < current_page + self.jump < last_page:
+                visible[current_page + self.jump] = self.jump_next_text
+        visible[current_page] = self.current_page_text
+
+        return dict(sorted(visible.items()))
+
+    async def _render_keyboard(
+        self, data: PagerData, manager: DialogManager
+    ) -> RawKeyboard:
+        buttons = []
+        final_buttons = []
+        visible_pages = self.get_visible_pages(data["current_page"], data["pages"])
+        for target_page, text_widget in visible_pages.items():
+            if self.length is not None and len(buttons) >= self.length:
+                final_buttons.append(buttons)
+                buttons = []
+            button_data = await self._prepare_page_data(
+                data=data, target_page=target_page
+            )
+            buttons.append(
+                InlineKeyboardButton(
+                    text=await text_widget.render_text(button_data, manager),
+                    callback_data=self._item_callback_data(target_page),
+                )
+            )
+        if buttons:
+            final_buttons.append(buttons)
+        return final_buttons
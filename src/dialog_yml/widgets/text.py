@@ -0,0 +1,427 @@
+import _string
+import hashlib
+import keyword
+import re
+import string
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterator, Optional, Union
+
+from aiogram.enums import ParseMode
+from aiogram_dialog.api.protocols import DialogManager
+from aiogram_dialog.widgets.common import (
+    OnPageChangedVariants,
+    WhenCondition,
+    true_condition,
+)
+from aiogram_dialog.widgets.text import Const, Format, ScrollingText, Text
+from aiogram_dialog.widgets.text.format import _FormatDataStub
+
+DEFAULT_PAGES_CACHE_SIZE = 256
+
+HTML_TAG_RE = re.compile(r"<(/?)([a-zA-Z][a-zA-Z0-9-]*)[^>]*?(/?)>")
+HTML_ENTITY_RE = re.compile(r"&#?[a-zA-Z0-9]+;")
+MARKDOWN_ENTITY_RE = re.compile(
+    r"```.*?```|`[^`]*`|\*[^*]*\*|_[^_]*_|\[[^\]]*\]\([^)]*\)",
+    re.DOTALL,
+)
+MARKDOWN_V2_ENTITY_RE = re.compile(
+    r"```(?:\\.|[^\\])*?```"
+    r"|`(?:\\.|[^`\\])*`"
+    r"|\|\|(?:\\.|[^\\])*?\|\|"
+    r"|__(?:\\.|[^\\])*?__"
+    r"|([*_~])(?:\\.|(?!\1)[^\\])*\1"
+    r"|\[(?:\\.|[^\]\\])*\]\((?:\\.|[^)\\])*\)",
+    re.DOTALL,
+)
+
+
+def _mark_unsafe(mask: bytearray, pattern: re.Pattern, text: str) -> None:
+    for match in pattern.finditer(text):
+        mask[match.start() + 1 : match.end()] = b"\x01" * (match.end() - match.start() - 1)
+
+
+def _get_unsafe_mask(text: str, parse_mode: Optional[str]) -> bytearray:
+    """Returns the mask of the positions the text must not be split at.
+
+    Position `i` means a split right before `text[i]`.
+    """
+
+    mask = bytearray(len(text) + 1)
+    if parse_mode == ParseMode.HTML:
+        _mark_unsafe(mask, HTML_TAG_RE, text)
+        _mark_unsafe(mask, HTML_ENTITY_RE, text)
+    elif parse_mode == ParseMode.MARKDOWN:
+        _mark_unsafe(mask, MARKDOWN_ENTITY_RE, text)
+    elif parse_mode == ParseMode.MARKDOWN_V2:
+        _mark_unsafe(mask, MARKDOWN_V2_ENTITY_RE, text)
+        for match in re.finditer(r"\\.", text, re.DOTALL):
+            mask[match.start() + 1] = 1
+    return mask
+
+
+def _find_split(text: str, mask: bytearray, start: int, end: int) -> int:
+    """Finds the best split position in `(start, end]`: the last safe
+    position after a whitespace, then the last safe position,
+    then `end` itself.
+    """
+
+    fallback = None
+    for position in range(end, start, -1):
+        if mask[position]:
+            continue
+        if text[position - 1].isspace():
+            return position
+        if fallback is None:
+            fallback = position
+    return fallback if fallback is not None else end
+
+
+def split_text_pages(
+    text: str, page_size: int, parse_mode: Optional[str] = None
+) -> list[str]:
+    """Splits the text into pages of at most `page_size` characters.
+
+    Pages are split on word boundaries when possible and never inside
+    markup entities of the given parse mode. For HTML the tags open
+    at a page boundary are closed at the end of the page and reopened
+    at the beginning of the next one, so a page may slightly exceed
+    `page_size`.
+
+    :param text: The text to split
+    :type text: str
+    :param page_size: The maximum page length, 0 for a single page
+    :type page_size: int
+    :param parse_mode: The parse mode of the text
+    :type parse_mode: Optional[str]
+
+    :return: The pages
+    :rtype: list[str]
+    """
+
+    if page_size <= 0 or len(text) <= page_size:
+        return [text]
+
+    mask = _get_unsafe_mask(text, parse_mode)
+    is_html = parse_mode == ParseMode.HTML
+    tags = list(HTML_TAG_RE.finditer(text)) if is_html else []
+    tag_index = 0
+    open_tags: list[re.Match] = []
+
+    pages = []
+    start = 0
+    while start < len(text):
+        if len(text) - start <= page_size:
+            end = len(text)
+        else:
+            end = _find_split(text, mask, start, start + page_size)
+
+        page = text[start:end]
+        if is_html:
+            prefix = "".join(tag.group(0) for tag in open_tags)
+            while tag_index < len(tags) and tags[tag_index].end() <= end:
+                tag = tags[tag_index]
+                tag_index += 1
+                if tag.group(3):
+                    continue
+                if not tag.group(1):
+                    open_tags.append(tag)
+                elif open_tags and open_tags[-1].group(2) == tag.group(2):
+                    open_tags.pop()
+            suffix = "".join(f"</{tag.group(2)}>" for tag in reversed(open_tags))
+            page = prefix + page + suffix
+
+        pages.append(page)
+        start = end
+
+    return pages
+
+
+class CompiledTemplate:
+    """A `str.format_map` template parsed once.
+
+    The template is compiled into a function building the result
+    with a single f-string expression. Literal parts, keys and format
+    specs are passed to the function as constants, the template text
+    itself is never evaluated. Templates which can not be compiled
+    (positional fields, nested format specs, invalid syntax) fall back
+    to `str.format_map`.
+
+    :ivar text: The template text
+    :vartype text: str
+    :ivar required_keys: The data keys used by the template
+    :vartype required_keys: frozenset[str]
+    :ivar is_compiled: Whether the template was compiled
+    :vartype is_compiled: bool
+    """
+
+    __slots__ = ("text", "required_keys", "is_compiled", "render")
+
+    def __init__(self, text: str):
+        self.text = text
+        self.required_keys = frozenset()
+        self.is_compiled = False
+        self.render: Callable[[dict], str] = text.format_map
+        try:
+            self.render, self.required_keys = self._compile(text)
+        except (ValueError, TypeError):
+            return
+        self.is_compiled = True
+
+    def __repr__(self):
+        return f"CompiledTemplate({self.text!r})"
+
+    @classmethod
+    def _compile(cls, text: str) -> tuple[Callable[[dict], str], frozenset[str]]:
+        constants = {}
+        parts = []
+        keys = set()
+
+        def constant(value) -> str:
+            name = f"_c{len(constants)}"
+            constants[name] = value
+            return name
+
+        for literal, field_name, format_spec, conversion in string.Formatter().parse(
+            text
+        ):
+            if literal:
+                parts.append(f"{{{constant(literal)}}}")
+            if field_name is None:
+                continue
+            if "{" in format_spec:
+                raise ValueError("Nested format specs are not compiled")
+
+            first, rest = _string.formatter_field_name_split(field_name)
+            if not isinstance(first, str) or not first:
+                raise ValueError("Positional fields are not supported by format_map")
+            keys.add(first)
+
+            expression = f"data[{constant(first)}]"
+            for is_attr, key in rest:
+                if is_attr and key.isidentifier() and not keyword.iskeyword(key):
+                    expression += f".{key}"
+                elif is_attr:
+                    expression = f"getattr({expression}, {constant(key)})"
+                elif isinstance(key, int):
+                    expression += f"[{key}]"
+                else:
+                    expression += f"[{constant(key)}]"
+
+            field = "{" + expression
+            if conversion:
+                field += f"!{conversion}"
+            if format_spec:
+                field += f":{{{constant(format_spec)}}}"
+            parts.append(field + "}")
+
+        arguments = "".join(f", {name}={name}" for name in constants)
+        source = f'lambda data{arguments}: f"{"".join(parts)}"'
+        render = eval(source, {"__builtins__": {"getattr": getattr}}, constants)
+        return render, frozenset(keys)
+
+
+_shared_templates: ContextVar[Optional[Dict[str, CompiledTemplate]]] = ContextVar(
+    "dialog_yml_shared_templates", default=None
+)
+
+
+@contextmanager
+def share_templates() -> Iterator[Dict[str, CompiledTemplate]]:
+    """Makes the formatted texts created within the context
+    share one compiled template for equal texts.
+
+    Templates are immutable, so the windows repeating a text
+    keep one compiled function instead of a copy each.
+    """
+
+    templates = {}
+    token = _shared_templates.set(templates)
+    try:
+        yield templates
+    finally:
+        _shared_templates.reset(token)
+
+
+def get_template(text: str) -> CompiledTemplate:
+    """Returns the compiled template of the text, shared within
+    a `share_templates` context.
+
+    :param text: The template text
+    :type text: str
+
+    :return: The compiled template
+    :rtype: CompiledTemplate
+    """
+
+    templates = _shared_templates.get()
+    if templates is None:
+        return CompiledTemplate(text)
+    template = templates.get(text)
+    if template is None:
+        template = templates.setdefault(text, CompiledTemplate(text))
+    return template
+
+
+class CompiledFormat(Format):
+    """Format text rendered by a template compiled at build time.
+
+    :ivar template: The compiled template
+    :vartype template: CompiledTemplate
+    """
+
+    def __init__(self, text: str, when: WhenCondition = None):
+        super().__init__(text=text, when=when)
+        self.template = get_template(text)
+
+    @property
+    def required_keys(self) -> frozenset[str]:
+        return self.template.required_keys
+
+    async def _render_text(self, data: dict, manager: DialogManager) -> str:
+        if manager.is_preview():
+            return await super()._render_text(data, manager)
+        return self.template.render(data)
+
+
+class I18nText(Text):
+    """Text translated to the locale of the user.
+
+    The translation of each locale is looked up in the catalogs
+    and, for formatted texts, compiled once, on the first render
+    in that locale. Later renders only pick the compiled text.
+
+    :param message_id: The message id of the catalogs
+    :type message_id: str
+    :param catalogs: The catalogs
+    :type catalogs: I18nCatalogs
+    :param formatted: Whether the translation is a format template
+    :type formatted: bool (optional, default: False)
+    """
+
+    def __init__(
+        self,
+        message_id: str,
+        catalogs,
+        formatted: bool = False,
+        when: WhenCondition = None,
+    ):
+        super().__init__(when=when)
+        self.message_id = message_id
+        self.catalogs = catalogs
+        self.formatted = formatted
+        self._texts: dict[str, Union[str, CompiledTemplate]] = {}
+
+    def get_text(self, locale: str) -> Union[str, CompiledTemplate]:
+        """Returns the translation of the locale, compiled for formatted texts.
+
+        :param locale: The locale
+        :type locale: str
+
+        :return: The text or the compiled template
+        :rtype: Union[str, CompiledTemplate]
+        """
+
+        text = self._texts.get(locale)
+        if text is None:
+            text = self.catalogs.gettext(self.message_id, locale)
+            if self.formatted:
+                text = CompiledTemplate(text)
+            self._texts[locale] = text
+        return text
+
+    async def _render_text(self, data: dict, manager: DialogManager) -> str:
+        text = self.get_text(self.catalogs.get_locale(manager))
+        if not self.formatted:
+            return text
+        if manager.is_preview():
+            return text.text.format_map(_FormatDataStub(data=data))
+        return text.render(data)
+
+
+class PagedScrollingText(ScrollingText):
+    """Scrolling text with cached page splitting.
+
+    Pages of a constant text are computed once, when the parse mode
+    is known. Pages of other texts are cached in an LRU keyed
+    by the hash of the rendered text.
+
+    :param parse_mode: The parse mode of the window, used to keep
+        markup entities whole. Usually set by the window.
+    :type parse_mode: Optional[str]
+    :param cache_size: The maximum number of cached rendered texts.
+    :type cache_size: int (optional, default: DEFAULT_PAGES_CACHE_SIZE)
+    """
+
+    def __init__(
+        self,
+        text: Text,
+        id: str,
+        page_size: int = 0,
+        when: WhenCondition = None,
+        on_page_changed: OnPageChangedVariants = None,
+        parse_mode: Optional[str] = None,
+        cache_size: int = DEFAULT_PAGES_CACHE_SIZE,
+    ):
+        super().__init__(
+            text=text,
+            id=id,
+            page_size=page_size,
+            when=when,
+            on_page_changed=on_page_changed,
+        )
+        self.parse_mode = parse_mode
+        self.cache_size = cache_size
+        self._static_pages: Optional[list[str]] = None
+        self._pages_cache: OrderedDict[bytes, list[str]] = OrderedDict()
+        if parse_mode is not None:
+            self.set_parse_mode(parse_mode)
+
+    @property
+    def is_static(self) -> bool:
+        return isinstance(self.text, Const) and self.text.condition is true_condition
+
+    def set_parse_mode(self, parse_mode: Optional[str]) -> None:
+        """Sets the parse mode and precomputes the pages of a constant text.
+
+        :param parse_mode: The parse mode
+        :type parse_mode: Optional[str]
+        """
+
+        self.parse_mode = parse_mode
+        self._pages_cache.clear()
+        self._static_pages = None
+        if self.is_static:
+            self._static_pages = split_text_pages(
+                self.text.text, self.page_size, parse_mode
+            )
+
+    async def get_pages(self, data: dict, manager: DialogManager) -> list[str]:
+        if self._static_pages is not None:
+            return self._static_pages
+
+        text = await self._render_contents(data, manager)
+        key = hashlib.blake2b(text.encode(), digest_size=16).digest()
+        pages = self._pages_cache.get(key)
+        if pages is not None:
+            self._pages_cache.move_to_end(key)
+            return pages
+
+        pages = split_text_pages(text, self.page_size, self.parse_mode)
+        if self.is_static:
+            self._static_pages = pages
+            return pages
+
+        self._pages_cache[key] = pages
+        while len(self._pages_cache) > self.cache_size:
+            self._pages_cache.popitem(last=False)
+        return pages
+
+    async def _render_text(self, data, manager: DialogManager) -> str:
+        pages = await self.get_pages(data, manager)
+        page = await self.get_page(manager)
+        return pages[min(len(pages) - 1, page)]
+
+    async def get_page_count(self, data: dict, manager: DialogManager) -> int:
+        return len(await self.get_pages(data, manager))
@@ -0,0 +1,28 @@
+from typing import Any, Iterable, Iterator
+
+CHILDREN_ATTRS = ("buttons", "widgets", "texts")
+
+
+def iter_widgets(widgets: Iterable[Any]) -> Iterator[Any]:
+    """Iterates over the widgets and all their nested widgets
+    in depth-first order.
+
+    Nested widgets are looked up in the `buttons` (groups),
+    `widgets` (keyboard `Or`) and `texts` (`Multi`, `Case`, text `Or`)
+    attributes.
+
+    :param widgets: The root widgets
+    :type widgets: Iterable[Any]
+
+    :return: Iterator over the widgets tree
+    :rtype: Iterator[Any]
+    """
+
+    for widget in widgets:
+        yield widget
+        for attr in CHILDREN_ATTRS:
+            children = getattr(widget, attr, None)
+            if isinstance(children, dict):
+                children = tuple(children.values())
+            if isinstance(children, (list, tuple)):
+                yield from iter_widgets(children)
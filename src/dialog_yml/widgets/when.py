@@ -0,0 +1,169 @@
+import dis
+import inspect
+from collections import Counter
+from typing import Any, Callable, Iterable, Optional
+
+from aiogram_dialog.api.protocols import DialogManager
+from aiogram_dialog.widgets.common import Whenable, true_condition
+
+from dialog_yml.widgets.utils import iter_widgets
+
+
+# The render data key of the predicate results of the current render
+WHEN_RESULTS_KEY = "__when_results__"
+
+
+class WhenCache:
+    """Counters of the `when` predicates memoized per render.
+
+    The results are kept in the render data of each render, which
+    aiogram-dialog creates anew for every render, so concurrent
+    renders of the window don't share them and nothing outlives
+    the render.
+
+    :ivar hits: The number of predicate calls answered from the cache
+    :vartype hits: int
+    :ivar misses: The number of predicate evaluations
+    :vartype misses: int
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def saved(self) -> int:
+        return self.hits
+
+    @property
+    def stats(self) -> dict[str, int]:
+        return {"evaluations": self.misses, "saved": self.hits}
+
+    def check(
+        self,
+        predicate: Callable,
+        data: dict,
+        widget: Whenable,
+        manager: DialogManager,
+    ) -> bool:
+        results = data.get(WHEN_RESULTS_KEY)
+        if results is None:
+            results = data[WHEN_RESULTS_KEY] = {}
+
+        if predicate in results:
+            self.hits += 1
+            return results[predicate]
+
+        self.misses += 1
+        result = results[predicate] = predicate(data, widget, manager)
+        return result
+
+
+class MemoizedPredicate:
+    """`when` predicate evaluated once per render through a `WhenCache`.
+
+    :param predicate: The wrapped predicate
+    :type predicate: Callable
+    :param cache: The counters shared by the window widgets
+    :type cache: WhenCache
+    """
+
+    __slots__ = ("predicate", "cache")
+
+    def __init__(self, predicate: Callable, cache: WhenCache):
+        self.predicate = predicate
+        self.cache = cache
+
+    def __call__(self, data: dict, widget: Whenable, manager: DialogManager) -> bool:
+        return self.cache.check(self.predicate, data, widget, manager)
+
+
+def reads_widget(predicate: Callable) -> bool:
+    """Checks whether the predicate may depend on the widget it is called for.
+
+    Python functions are checked for reads of their widget parameter,
+    any other callable is assumed to read it.
+
+    :param predicate: The `when` predicate
+    :type predicate: Callable
+
+    :return: False if the predicate never reads the widget, True otherwise
+    :rtype: bool
+    """
+
+    function = getattr(predicate, "__func__", predicate)
+    code = getattr(function, "__code__", None)
+    widget_index = 2 if inspect.ismethod(predicate) else 1
+    if code is None or code.co_argcount <= widget_index:
+        return True
+
+    name = code.co_varnames[widget_index]
+    if name in code.co_cellvars:
+        return True
+    for instruction in dis.get_instructions(code):
+        if instruction.opname.startswith("LOAD_FAST"):
+            argval = instruction.argval
+            if name in (argval if isinstance(argval, tuple) else (argval,)):
+                return True
+    return False
+
+
+def _iter_whenables(widgets: Iterable[Any]) -> Iterable[Whenable]:
+    for widget in iter_widgets(widgets):
+        for item in (widget, getattr(widget, "text", None)):
+            if isinstance(item, Whenable) and item.condition is not true_condition:
+                yield item
+
+
+def memoize_conditions(widgets: Iterable[Any]) -> Optional[WhenCache]:
+    """Wraps the `when` predicates shared by several widgets
+    of the tree into `MemoizedPredicate`, so each of them is evaluated
+    once per render.
+
+    Predicates reading the widget they are called for give
+    a result per widget, so they are left as is.
+
+    :param widgets: The root widgets
+    :type widgets: Iterable[Any]
+
+    :return: The cache of the wrapped predicates, None if no predicate
+        is shared
+    :rtype: Optional[WhenCache]
+    """
+
+    whenables = list(_iter_whenables(widgets))
+    counts = Counter(whenable.condition for whenable in whenables)
+    shared = {
+        predicate
+        for predicate, count in counts.items()
+        if count > 1
+        and not isinstance(predicate, MemoizedPredicate)
+        and not reads_widget(predicate)
+    }
+    if not shared:
+        return None
+
+    cache = WhenCache()
+    wrapped = {predicate: MemoizedPredicate(predicate, cache) for predicate in shared}
+    for whenable in whenables:
+        if whenable.condition in wrapped:
+            whenable.condition = wrapped[whenable.condition]
+    return cache
+
+
+def get_when_cache(window: Any) -> Optional[WhenCache]:
+    """Returns the counters of the `when` predicates memoized
+    in the window widgets.
+
+    :param window: The window
+    :type window: Window
+
+    :return: The counters, None if no predicate of the window is memoized
+    :rtype: Optional[WhenCache]
+    """
+
+    roots = (window.text, window.keyboard, window.media)
+    for whenable in _iter_whenables(roots):
+        if isinstance(whenable.condition, MemoizedPredicate):
+            return whenable.condition.cache
+    return None
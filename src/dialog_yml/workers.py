@@ -0,0 +1,167 @@
+"""The `src.workers` module provides the pre-fork worker mode:
+the dialog tree is built once in the master process and shared
+with the forked workers through copy-on-write memory pages.
+
+Following the `gc.freeze` guidance, the automatic GC is disabled
+early in the master with `disable_gc`, so it doesn't free objects
+between the shared ones, all the objects are frozen right before
+the fork and the GC is enabled again in each worker.
+
+Functions:
+---------
+- disable_gc: Disables the automatic GC in the master process.
+- freeze_objects: Moves all the objects created so far
+  to the permanent GC generation.
+- run_prefork: Forks the workers and waits for them.
+"""
+
+import asyncio
+import gc
+import inspect
+import logging
+import os
+import signal
+import sys
+from typing import Any, Callable, List, Optional
+
+from dialog_yml.exceptions import DialogYamlException
+
+logger = logging.getLogger(__name__)
+
+FORWARDED_SIGNALS = (signal.SIGINT, signal.SIGTERM)
+
+Worker = Callable[[int], Any]
+
+
+def disable_gc() -> None:
+    """Disables the automatic GC in the master process.
+
+    Call it before building the dialogs: a collection in the master
+    leaves freed blocks between the objects shared with the workers,
+    the workers allocate into them and so copy the shared pages.
+    `run_prefork` enables the GC in each worker.
+    """
+
+    gc.disable()
+
+
+def freeze_objects() -> int:
+    """Moves all the objects created so far to the permanent
+    generation, so that the GC of a forked worker never touches them
+    and their memory pages stay shared.
+
+    The garbage is not collected before, as the freed blocks would be
+    reused by the workers. Call `disable_gc` before the build instead.
+
+    :return: The number of frozen objects
+    :rtype: int
+    """
+
+    gc.freeze()
+    return gc.get_freeze_count()
+
+
+async def _await(awaitable) -> Any:
+    return await awaitable
+
+
+def _flush_streams() -> None:
+    for stream in (sys.stdout, sys.stderr):
+        try:
+            stream.flush()
+        except (AttributeError, ValueError, OSError):
+            pass
+
+
+def _flush_output() -> None:
+    # os._exit skips the interpreter shutdown, which flushes them
+    logging.shutdown()
+    _flush_streams()
+
+
+def _run_worker(worker: Worker, index: int) -> None:
+    gc.enable()
+    result = worker(index)
+    if inspect.isawaitable(result):
+        asyncio.run(_await(result))
+
+
+def run_prefork(
+    worker: Worker,
+    workers: Optional[int] = None,
+    freeze: bool = True,
+) -> List[int]:
+    """Forks the workers and waits until all of them exit.
+
+    Build the dialogs with `DialogYAMLBuilder.build` before calling this
+    function, after `disable_gc`: the workers inherit the built tree
+    instead of building their own copy. The GC is enabled in the workers.
+    `worker` is called in each worker with its index and usually starts
+    a dispatcher; a coroutine is run with `asyncio.run`.
+    `SIGINT` and `SIGTERM` received by the master are forwarded
+    to the workers.
+
+    Telegram allows only one `getUpdates` consumer per bot, so workers
+    either serve webhooks (e.g. on a socket shared by all of them)
+    or different bots.
+
+    :param worker: The function run in each worker
+    :type worker: Callable[[int], Any]
+    :param workers: The number of workers
+    :type workers: int (optional, default: the number of CPUs)
+    :param freeze: Whether to freeze the objects before forking
+    :type freeze: bool (optional, default: True)
+
+    :return: The exit codes of the workers by index
+    :rtype: List[int]
+
+    :raises DialogYamlException: If `os.fork` is not available
+    """
+
+    if not hasattr(os, "fork"):
+        raise DialogYamlException("Pre-fork mode requires os.fork")
+
+    workers = workers or os.cpu_count() or 1
+    if freeze:
+        logger.debug("Freeze %d objects before fork", freeze_objects())
+
+    pids = {}
+    for index in range(workers):
+        # Otherwise the buffered output of the master is written by each worker
+        _flush_streams()
+        pid = os.fork()
+        if pid == 0:
+            exit_code = 0
+            try:
+                _run_worker(worker, index)
+            except BaseException:
+                logger.exception("Worker %d failed", index)
+                exit_code = 1
+            finally:
+                _flush_output()
+                os._exit(exit_code)
+        pids[pid] = index
+    logger.debug("Started %d workers", workers)
+
+    def forward_signal(signum, frame):
+        for child_pid in pids:
+            try:
+                os.kill(child_pid, signum)
+            except ProcessLookupError:
+                pass
+
+    handlers = {
+        signum: signal.signal(signum, forward_signal) for signum in FORWARDED_SIGNALS
+    }
+    exit_codes = [0] * workers
+    try:
+        while pids:
+            pid, status = os.wait()
+            index = pids.pop(pid, None)
+            if index is not None:
+                exit_codes[index] = os.waitstatus_to_exitcode(status)
+    finally:
+        for signum, handler in handlers.items():
+            signal.signal(signum, handler)
+
+    return exit_codes
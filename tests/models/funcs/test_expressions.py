@@ -0,0 +1,83 @@
+from types import SimpleNamespace
+
+import pytest
+
+from dialog_yml import FuncsRegistry
+from dialog_yml.exceptions import InvalidExpressionError
+from dialog_yml.models.funcs.expression import (
+    ExpressionModel,
+    compile_expression,
+    to_when_model,
+)
+from dialog_yml.models.funcs.func import FuncModel
+
+
+class TestCompileExpression:
+    @pytest.mark.parametrize(
+        "expression, data, expected",
+        [
+            ("count > 0 and not banned", {"count": 1, "banned": False}, True),
+            ("count > 0 and not banned", {"count": 1, "banned": True}, False),
+            ("not banned", {}, True),
+            ("role in ('admin', 'owner')", {"role": "admin"}, True),
+            ("0 < count <= 10", {"count": 11}, False),
+            ("user.age >= 18", {"user": SimpleNamespace(age=20)}, True),
+            ("items[0] == 'a'", {"items": ["a"]}, True),
+            ("len(items) > 1", {"items": [1]}, False),
+            ("total - used > 0", {"total": 5, "used": 2}, True),
+        ],
+    )
+    def test_predicate(self, expression, data, expected):
+        # Given
+        predicate = compile_expression(expression)
+
+        # When
+        result = predicate(data, None, None)
+
+        # Then
+        assert result is expected
+
+    @pytest.mark.parametrize(
+        "expression",
+        [
+            "count >",
+            "user.__class__",
+            "_private",
+            "open('file')",
+            "len(items, key=1)",
+            "lambda: 1",
+            "2 ** 100",
+            "items[1:]",
+            "[x for x in items]",
+        ],
+    )
+    def test_invalid_expression(self, expression):
+        with pytest.raises(InvalidExpressionError):
+            compile_expression(expression)
+
+
+class TestWhenModel:
+    def test_identifier_is_function(self):
+        # Given
+        def is_admin(data, widget, manager):
+            return True
+
+        registry = FuncsRegistry()
+        registry.clear_categories()
+        registry.func.register(is_admin)
+
+        # When
+        model = to_when_model("is_admin")
+
+        # Then
+        assert isinstance(model, FuncModel)
+        assert model.name == "is_admin"
+
+    @pytest.mark.parametrize("data", ["count > 0", {"expr": "is_admin"}])
+    def test_expression(self, data):
+        # When
+        model = to_when_model(data)
+
+        # Then
+        assert isinstance(model, ExpressionModel)
+        assert model.func({"count": 1, "is_admin": True}, None, None)
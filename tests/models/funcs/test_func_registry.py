@@ -1,3 +1,5 @@
+from concurrent.futures import ThreadPoolExecutor
+from threading import Barrier
 from typing import Union, Callable, Awaitable
 
 import pytest
@@ -76,6 +78,26 @@ class TestCategory:
         with pytest.raises(FunctionRegistrationError):
             category.register(function)
 
+    def test_register_same_name_concurrently(self, get_test_func):
+        # Given
+        category = Category()
+        barrier = Barrier(8)
+
+        def register():
+            barrier.wait()
+            try:
+                category.register(get_test_func)
+            except FunctionRegistrationError:
+                return False
+            return True
+
+        # When
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(lambda _: register(), range(8)))
+
+        # Then
+        assert results.count(True) == 1
+
     def test_retrieve_none_if_function_does_not_exist(self):
         # Given
         category = Category()
@@ -1,3 +1,5 @@
+from unittest.mock import AsyncMock, Mock
+
 import pytest
 from aiogram_dialog.widgets.kbd import (
     Url,
@@ -23,7 +25,9 @@ from dialog_yml.models.widgets.kbd.keyboard import (
     RowKeyboardModel,
     ColumnKeyboardModel,
     ScrollingGroupKeyboardModel,
+    DynamicGroupKeyboardModel,
 )
+from dialog_yml.widgets import DynamicGroup
 from tests.models.widgets.conftest import TestWidgetBase
 
 
@@ -200,3 +204,140 @@ class TestKeyboard(TestWidgetBase):
         # Then
         assert isinstance(widget_obj, Group)
         assert len(widget_obj.buttons) == 2
+
+    @pytest.mark.asyncio
+    async def test_dynamic_group_caches_buttons_by_key(self):
+        # Given
+        calls = []
+
+        async def dynamic_buttons(data, dialog_manager):
+            calls.append(data["menu_version"])
+            return [
+                {"callback": {"id": f"item_{i}", "text": f"Item {i}"}}
+                for i in range(data["menu_size"])
+            ]
+
+        self.func_registry.func.register(dynamic_buttons)
+
+        input_data = {
+            "dynamic_group": {
+                "id": "menu",
+                "width": 2,
+                "buttons": "dynamic_buttons",
+                "cache_key": "menu_version",
+            }
+        }
+        widget_model = self.yaml_model.create_model(input_data)
+        assert isinstance(widget_model, DynamicGroupKeyboardModel)
+        widget_obj = widget_model.to_object()
+        assert isinstance(widget_obj, DynamicGroup)
+
+        # When
+        manager = Mock()
+        first = await widget_obj.render_keyboard(
+            {"menu_version": 1, "menu_size": 3}, manager
+        )
+        first_group = widget_obj.cached_groups[0]
+        second = await widget_obj.render_keyboard(
+            {"menu_version": 1, "menu_size": 3}, manager
+        )
+        third = await widget_obj.render_keyboard(
+            {"menu_version": 2, "menu_size": 1}, manager
+        )
+
+        # Then
+        assert calls == [1, 2]
+        assert first == second
+        assert [len(row) for row in first] == [2, 1]
+        assert [button.text for button in third[0]] == ["Item 0"]
+        assert widget_obj.cached_groups[0] is first_group
+        assert widget_obj.find("item_2") is not None
+
+    @pytest.mark.asyncio
+    async def test_dynamic_group_without_cache_key_reuses_compiled_buttons(self):
+        # Given
+        def static_buttons(data, dialog_manager):
+            return [{"next": "Next"}, {"back": "Back"}]
+
+        self.func_registry.func.register(static_buttons)
+        widget_obj = self.yaml_model.create_model(
+            {"dynamic_group": "static_buttons"}
+        ).to_object()
+
+        # When
+        manager = Mock()
+        await widget_obj.render_keyboard({}, manager)
+        await widget_obj.render_keyboard({}, manager)
+
+        # Then
+        assert len(widget_obj.cached_groups) == 1
+
+    @pytest.mark.asyncio
+    async def test_dynamic_group_cache_size_evicts_oldest(self):
+        # Given
+        def sized_buttons(data, dialog_manager):
+            return [{"next": f"Next {data['key']}"}]
+
+        self.func_registry.func.register(sized_buttons)
+        widget_obj = self.yaml_model.create_model(
+            {
+                "dynamic_group": {
+                    "buttons": "sized_buttons",
+                    "cache_key": "key",
+                    "cache_size": 2,
+                }
+            }
+        ).to_object()
+
+        # When
+        manager = Mock()
+        for key in range(3):
+            await widget_obj.render_keyboard({"key": key}, manager)
+
+        # Then
+        assert len(widget_obj.cached_groups) == 2
+
+    @pytest.mark.asyncio
+    async def test_dynamic_group_processes_click_after_eviction(self):
+        # Given
+        clicks = []
+
+        def keyed_buttons(data, dialog_manager):
+            return [
+                {
+                    "callback": {
+                        "id": f"item_{data['key']}",
+                        "text": "Item",
+                        "on_click": "record_click",
+                    }
+                }
+            ]
+
+        async def record_click(callback, button, manager, data):
+            clicks.append(button.widget_id)
+
+        self.func_registry.func.register(keyed_buttons)
+        self.func_registry.func.register(record_click)
+        widget_obj = self.yaml_model.create_model(
+            {
+                "dynamic_group": {
+                    "buttons": "keyed_buttons",
+                    "cache_key": "key",
+                    "cache_size": 1,
+                }
+            }
+        ).to_object()
+        manager = Mock()
+        for key in range(2):
+            await widget_obj.render_keyboard({"key": key}, manager)
+        dialog = Mock(spec=["load_data"])
+        dialog.load_data = AsyncMock(return_value={"key": 0})
+
+        # When
+        processed = await widget_obj.process_callback(
+            Mock(data="item_0"), dialog, manager
+        )
+
+        # Then
+        assert processed is True
+        assert clicks == ["item_0"]
@@ -1,3 +1,5 @@
+from unittest.mock import AsyncMock, Mock
+
 import pytest
 from aiogram_dialog.widgets.kbd import StubScroll, NumberedPager, SwitchPage
 from aiogram_dialog.widgets.text import ScrollingText
@@ -11,7 +13,9 @@ from dialog_yml.models.widgets.scrolls.scroll import (
     CurrentPageModel,
     NextPageModel,
     LastPageModel,
+    WindowedPagerModel,
 )
+from dialog_yml.widgets import WindowedPager
 from tests.models.widgets.conftest import TestWidgetBase
 
 
@@ -69,3 +73,53 @@ class TestScroll(TestWidgetBase):
 
         widget_obj = widget_model.to_object()
         assert isinstance(widget_obj, expected_widget_cls)
+
+    @pytest.mark.parametrize(
+        "current_page, pages, expected_pages",
+        [
+            (0, 1, [0]),
+            (0, 300, [0, 1, 2, 10, 299]),
+            (150, 300, [0, 140, 148, 149, 150, 151, 152, 160, 299]),
+            (299, 300, [0, 289, 297, 298, 299]),
+            (3, 6, [0, 1, 2, 3, 4, 5]),
+        ],
+    )
+    def test_windowed_pager_visible_pages(self, current_page, pages, expected_pages):
+        # Given
+        widget_model = self.yaml_model.create_model(
+            {"windowed_pager": {"scroll": "scroll_no_pager", "jump": 10}}
+        )
+        assert isinstance(widget_model, WindowedPagerModel)
+        widget_obj = widget_model.to_object()
+        assert isinstance(widget_obj, WindowedPager)
+
+        # When
+        visible_pages = widget_obj.get_visible_pages(current_page, pages)
+
+        # Then
+        assert list(visible_pages) == expected_pages
+        assert visible_pages[current_page] is widget_obj.current_page_text
+
+    @pytest.mark.asyncio
+    async def test_windowed_pager_renders_window_only(self):
+        # Given
+        widget_obj = self.yaml_model.create_model(
+            {"windowed_pager": {"scroll": "scroll_no_pager", "window": 1}}
+        ).to_object()
+        scroll = Mock()
+        scroll.get_page_count = AsyncMock(return_value=500)
+        scroll.get_page = AsyncMock(return_value=250)
+        manager = Mock()
+        manager.find.return_value = scroll
+
+        # When
+        keyboard = await widget_obj.render_keyboard({}, manager)
+
+        # Then
+        assert [button.text for button in keyboard[0]] == [
+            "1",
+            "250",
+            "[ 251 ]",
+            "252",
+            "500",
+        ]
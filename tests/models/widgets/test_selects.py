@@ -1,12 +1,16 @@
+from unittest.mock import Mock
+
 import pytest
-from aiogram_dialog.widgets.kbd import Checkbox, Select, Radio, Multiselect
+from aiogram_dialog.widgets.kbd import Checkbox, Select, Radio, Multiselect, Group
 
+from dialog_yml.exceptions import DialogYamlException
 from dialog_yml.models.widgets.selects import (
     CheckboxModel,
     SelectModel,
     RadioModel,
     MultiSelectModel,
 )
+from dialog_yml.widgets import ItemsPage, PagedItemsScroll
 from tests.models.widgets.conftest import TestWidgetBase
 
 
@@ -86,3 +90,143 @@ class TestSelect(TestWidgetBase):
 
         widget_obj = widget_model.to_object()
         assert isinstance(widget_obj, expected_widget_cls)
+
+
+class TestItemsSource(TestWidgetBase):
+    @pytest.fixture
+    def manager(self):
+        manager = Mock()
+        manager.current_context.return_value.widget_data = {}
+        return manager
+
+    @pytest.mark.parametrize("tag", ["select", "radio", "multi_select"])
+    def test_items_source_builds_group_with_scroll(self, tag):
+        # Given
+        async def load_rows(request, dialog_manager):
+            return []
+
+        self.func_registry.func.register(load_rows)
+        input_data = {
+            tag: {
+                "id": "rows",
+                "text": "{item}",
+                "items": {"source": "load_rows", "page_size": 5},
+                "item_id_getter": 0,
+            }
+        }
+
+        # When
+        widget_obj = self.yaml_model.create_model(input_data).to_object()
+
+        # Then
+        assert isinstance(widget_obj, Group)
+        select, scroll = widget_obj.buttons
+        assert isinstance(scroll, PagedItemsScroll)
+        assert scroll.widget_id == "rows_scroll"
+        assert select.items_getter({"rows_scroll_items": [1]}) == [1]
+
+    @pytest.mark.asyncio
+    async def test_offset_pagination(self, manager):
+        # Given
+        rows = list(range(23))
+        requests = []
+
+        async def load_offset_rows(request, dialog_manager):
+            requests.append(request)
+            return ItemsPage(
+                items=rows[request.offset : request.offset + request.limit],
+                total=len(rows),
+            )
+
+        self.func_registry.func.register(load_offset_rows)
+        widget_obj = self.yaml_model.create_model(
+            {
+                "select": {
+                    "id": "rows",
+                    "text": "{item}",
+                    "items": {
+                        "source": "load_offset_rows",
+                        "page_size": 10,
+                        "scroll": "pager",
+                    },
+                    "item_id_getter": 0,
+                }
+            }
+        ).to_object()
+        scroll = widget_obj.find("pager")
+
+        # When
+        manager.current_context.return_value.widget_data["pager"] = 2
+        data = await scroll.load_page(dialog_manager=manager)
+
+        # Then
+        assert requests[-1].offset == 20
+        assert requests[-1].limit == 10
+        assert data == {"pager_items": [20, 21, 22], "pager_pages": 3}
+
+    @pytest.mark.asyncio
+    async def test_keyset_pagination(self, manager):
+        # Given
+        rows = list(range(7))
+
+        def load_keyset_rows(request, dialog_manager):
+            start = request.cursor or 0
+            items = rows[start : start + request.limit]
+            next_cursor = start + request.limit if start + request.limit < len(rows) else None
+            return ItemsPage(items=items, next_cursor=next_cursor)
+
+        self.func_registry.func.register(load_keyset_rows)
+        scroll = self.yaml_model.create_model(
+            {
+                "radio": {
+                    "id": "rows",
+                    "items": {
+                        "source": "load_keyset_rows",
+                        "page_size": 3,
+                        "pagination": "keyset",
+                    },
+                    "item_id_getter": 0,
+                }
+            }
+        ).to_object().find("rows_scroll")
+        widget_data = manager.current_context.return_value.widget_data
+
+        # When
+        first = await scroll.load_page(dialog_manager=manager)
+        widget_data["rows_scroll"] = 5  # not visited yet, falls back to page 1
+        second = await scroll.load_page(dialog_manager=manager)
+        widget_data["rows_scroll"] = 2
+        last = await scroll.load_page(dialog_manager=manager)
+
+        # Then
+        assert first == {"rows_scroll_items": [0, 1, 2], "rows_scroll_pages": 2}
+        assert second == {"rows_scroll_items": [3, 4, 5], "rows_scroll_pages": 3}
+        assert last == {"rows_scroll_items": [6], "rows_scroll_pages": 3}
+
+    def test_unknown_pagination(self):
+        # Given
+        def load_typo_rows(request, dialog_manager):
+            return ItemsPage(items=[])
+
+        self.func_registry.func.register(load_typo_rows)
+
+        # When
+        with pytest.raises(DialogYamlException) as error:
+            self.yaml_model.create_model(
+                {
+                    "select": {
+                        "id": "typo",
+                        "format": "{item}",
+                        "items": {
+                            "source": "load_typo_rows",
+                            "pagination": "keyst",
+                        },
+                        "item_id_getter": 0,
+                    }
+                }
+            )
+
+        # Then
+        assert 'Unknown pagination "keyst", expected one of: offset, keyset' in str(
+            error.value
+        )
@@ -32,6 +32,11 @@ class TestText(TestWidgetBase):
                 TextModel,
                 Format,
             ),
+            (
+                {"text": {"val": "Test text", "when": "count > 0 and not banned"}},
+                TextModel,
+                Const,
+            ),
             ({"format": "Test text {name}"}, FormatModel, Format),
             (
                 {"format": {"val": "Test text {name}", "when": "test_func"}},
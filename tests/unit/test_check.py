@@ -0,0 +1,165 @@
+"""Unit tests for the configuration check and the `dialog-yml` command."""
+
+import textwrap
+
+import pytest
+
+from dialog_yml import YAMLStatesManager
+from dialog_yml.check import ERROR, Issue, check_config
+from dialog_yml.cli import main
+
+VALID_CONFIG = """
+dialogs:
+  CheckMenu:
+    windows:
+      MAIN:
+        widgets:
+          - text: Hello
+          - switch_to:
+              id: next
+              text: Next
+              state: CheckOther:START
+  CheckOther:
+    windows:
+      START:
+        widgets:
+          - format: "Hi {name}"
+"""
+
+INVALID_CONFIG = """
+dialogs:
+  CheckBroken:
+    windows:
+      MAIN:
+        widgets:
+          - unknown_tag: Hello
+      SECOND:
+        widgets:
+          - callback:
+              id: broken
+              text: Broken
+              on_click: not_registered_function
+      THIRD:
+        widgets: text
+  CheckEmpty:
+    windows: {}
+  CheckValid:
+    windows:
+      MAIN:
+        widgets:
+          - text: Hello
+"""
+
+LEAKED_STATE_CONFIG = """
+dialogs:
+  CheckMenu:
+    windows:
+      OTHER:
+        widgets:
+          - text: Hello
+          - switch_to:
+              id: back
+              text: Back
+              state: CheckMenu:MAIN
+  CheckPadding:
+    windows:
+      MAIN:
+        widgets:
+          - text: Hello
+"""
+
+
+@pytest.fixture
+def write_config(tmp_path):
+    def _write(content: str) -> str:
+        path = tmp_path / "config.yaml"
+        path.write_text(textwrap.dedent(content))
+        return str(path)
+
+    return _write
+
+
+class TestCheckConfig:
+    """Unit tests for check_config."""
+
+    def test_valid_config(self, write_config, tmp_path):
+        """Test a valid configuration has no errors."""
+        # Given
+        write_config(VALID_CONFIG)
+
+        # When
+        report = check_config("config.yaml", str(tmp_path), workers=1)
+
+        # Then
+        assert report.ok
+        assert (report.groups, report.windows) == (2, 2)
+
+    def test_all_errors_are_reported(self, write_config, tmp_path):
+        """Test the check continues after errors and reports each of them."""
+        # Given
+        write_config(INVALID_CONFIG)
+
+        # When
+        report = check_config("config.yaml", str(tmp_path), workers=1)
+
+        # Then
+        locations = {issue.location.split(".widgets")[0] for issue in report.errors}
+        assert {
+            "CheckBroken.MAIN",
+            "CheckBroken.SECOND",
+            "CheckBroken.THIRD",
+            "CheckEmpty",
+        } <= locations
+        assert not any(issue.location.startswith("CheckValid") for issue in report.issues)
+
+    def test_missing_file(self, tmp_path):
+        """Test a missing file is reported as an error."""
+        report = check_config("missing.yaml", str(tmp_path), workers=1)
+
+        assert not report.ok
+        assert report.errors[0].level == ERROR
+
+    def test_groups_are_checked_in_workers(self, write_config, tmp_path):
+        """Test the worker processes report the same issues."""
+        # Given
+        write_config(INVALID_CONFIG)
+        expected = check_config("config.yaml", str(tmp_path), workers=1)
+
+        # When
+        report = check_config("config.yaml", str(tmp_path), workers=2)
+
+        # Then
+        assert report.issues == expected.issues
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_checks_do_not_share_states(self, write_config, tmp_path, workers):
+        """Test states of a checked configuration don't leak into the next check."""
+        # Given
+        write_config(VALID_CONFIG)
+        check_config("config.yaml", str(tmp_path), workers=workers)
+        write_config(LEAKED_STATE_CONFIG)
+
+        # When
+        report = check_config("config.yaml", str(tmp_path), workers=workers)
+
+        # Then
+        assert [issue.location for issue in report.errors] == ["CheckMenu.OTHER"]
+        assert YAMLStatesManager().get_state("CheckMenu:MAIN") is None
+
+
+class TestCli:
+    """Unit tests for the `dialog-yml` command."""
+
+    def test_check_exit_codes(self, write_config, capsys):
+        """Test the check fails on errors only."""
+        assert main(["check", write_config(VALID_CONFIG), "-j", "1"]) == 0
+        assert main(["check", write_config(INVALID_CONFIG), "-j", "1"]) == 1
+
+        output = capsys.readouterr().out
+        assert "error: CheckBroken.MAIN" in output
+        assert "2 groups, 4 windows, 4 errors, 0 warnings" in output
+
+    def test_issue_str(self):
+        """Test the printed issue format."""
+        assert str(Issue(ERROR, "Menu.MAIN", "Boom")) == "error: Menu.MAIN: Boom"
+        assert str(Issue(ERROR, "", "Boom")) == "error: Boom"
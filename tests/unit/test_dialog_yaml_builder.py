@@ -1,9 +1,27 @@
+import asyncio
+import copy
+import gc
+import time
+
 import pytest
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 from aiogram import Router
 
+from dialog_yml import FuncsRegistry, YAMLStatesManager
 from dialog_yml.core import DialogYAMLBuilder
+from dialog_yml.exceptions import (
+    DialogYamlException,
+    FunctionOverrideError,
+    RenderCacheKeysError,
+)
+from dialog_yml.models import YAMLModelFactory
 from dialog_yml.models.base import YAMLModel
+from dialog_yml.models.funcs.func import FuncModel
+from dialog_yml.models.widgets.kbd.keyboard import CallbackButtonModel
+from dialog_yml.parallel import dumps_models, loads_models
+from dialog_yml.scope import BuilderScope
+from dialog_yml.variants import BotVariants, current_bot_id
+from dialog_yml.widgets import RenderCachedWindow
 
 
 class TestDialogYAMLBuilder:
@@ -242,3 +260,718 @@ class TestDialogYAMLBuilderIntegration:
         # Then
         assert isinstance(builder, DialogYAMLBuilder)
         # Should have processed all the dialog windows
+
+
+class TestBuilderScope:
+    """Unit tests for builders with isolated scopes."""
+
+    @staticmethod
+    def make_scope(getter_name: str, getter_value: str) -> BuilderScope:
+        async def getter(**kwargs):
+            return {"value": getter_value}
+
+        getter.__name__ = getter_name
+        scope = BuilderScope()
+        scope.funcs_registry.register(getter)
+        return scope
+
+    @pytest.mark.asyncio
+    @patch("dialog_yml.core.setup_dialogs")
+    @patch("dialog_yml.core.YAMLReader.read_data_to_dict")
+    async def test_isolated_builders(self, mock_read_data, mock_setup_dialogs):
+        """Test two builders resolve functions and states in their own scopes."""
+        # Given
+        mock_read_data.side_effect = lambda **kwargs: {
+            "dialogs": {
+                "menu": {
+                    "windows": {
+                        "start": {
+                            "getter": "first_getter",
+                            "widgets": [{"format": "{value}"}],
+                        }
+                    }
+                }
+            }
+        }
+        first_scope = self.make_scope("first_getter", "first")
+        second_scope = self.make_scope("first_getter", "second")
+
+        # When
+        first = DialogYAMLBuilder.build("first.yaml", router=Router(), scope=first_scope)
+        second = DialogYAMLBuilder.build(
+            "second.yaml", router=Router(), scope=second_scope
+        )
+
+        # Then
+        assert first.funcs_registry is first_scope.funcs_registry
+        assert first.states.menu is not second.states.menu
+        assert FuncsRegistry().func.get("first_getter") is None
+        assert YAMLStatesManager().get_by_name("menu") is None
+        first_window = first._dialogs[0].windows[first.states.menu.start]
+        second_window = second._dialogs[0].windows[second.states.menu.start]
+        manager = Mock()
+        manager.is_preview.return_value = False
+        assert await first_window.getter(manager) == {"value": "first"}
+        assert await second_window.getter(manager) == {"value": "second"}
+
+    @pytest.mark.asyncio
+    @patch("dialog_yml.core.setup_dialogs")
+    @patch("dialog_yml.core.YAMLReader.read_data_to_dict")
+    async def test_scoped_button_click(self, mock_read_data, mock_setup_dialogs):
+        """Test button callbacks registered in a scope run on click."""
+        # Given
+        clicks = []
+
+        async def scoped_click(callback, button, manager, data):
+            clicks.append(data)
+
+        mock_read_data.return_value = {
+            "dialogs": {
+                "clicks": {
+                    "windows": {
+                        "start": {
+                            "widgets": [
+                                {
+                                    "callback": {
+                                        "id": "go",
+                                        "text": "Go",
+                                        "on_click": "scoped_click",
+                                        "source": "menu",
+                                    }
+                                }
+                            ]
+                        }
+                    }
+                }
+            }
+        }
+        scope = BuilderScope()
+        scope.funcs_registry.register(scoped_click)
+        builder = DialogYAMLBuilder.build("test.yaml", router=Router(), scope=scope)
+        window = builder._dialogs[0].windows[builder.states.clicks.start]
+        button = window.keyboard.find("go")
+
+        # When
+        await button.on_click.process_event(Mock(), button, Mock())
+
+        # Then
+        assert clicks == [{"source": "menu"}]
+        assert FuncsRegistry().func.get("scoped_click") is None
+
+    def test_scope_model_factory_is_isolated(self):
+        """Test custom models registered in a scope do not leak."""
+        # Given
+        class CustomModel(YAMLModel):
+            pass
+
+        builder = DialogYAMLBuilder("test.yaml", scope=BuilderScope())
+
+        # When
+        builder.register_custom_models({"scoped_custom": CustomModel})
+
+        # Then
+        assert builder.model_factory.get_model_class("scoped_custom") is CustomModel
+        assert YAMLModelFactory.get_model_class("scoped_custom") is None
+        assert builder.model_factory.get_model_class("window") is not None
+
+
+class TestBotVariants:
+    """Unit tests for one dialog tree shared by several bots."""
+
+    @pytest.mark.asyncio
+    @patch("dialog_yml.core.setup_dialogs")
+    @patch("dialog_yml.core.YAMLReader.read_data_to_dict")
+    async def test_shared_tree_with_overrides(self, mock_read_data, mock_setup_dialogs):
+        """Test texts and functions are resolved for the current bot."""
+        # Given
+        async def shared_getter(**kwargs):
+            return {"items": "default"}
+
+        async def other_getter(**kwargs):
+            return {"items": "other"}
+
+        other_getter.__name__ = "shared_getter"
+        mock_read_data.return_value = {
+            "dialogs": {
+                "menu": {
+                    "windows": {
+                        "start": {
+                            "getter": "shared_getter",
+                            "widgets": [{"format": "{brand}: {items}"}],
+                        }
+                    }
+                }
+            }
+        }
+        variants = BotVariants(texts={"brand": "Default"})
+        variants.add(1, texts={"brand": "First"})
+        variants.add(2, functions=[other_getter])
+        scope = BuilderScope(variants=variants)
+        scope.funcs_registry.register(shared_getter)
+
+        # When
+        builder = DialogYAMLBuilder.build("test.yaml", router=Router(), scope=scope)
+        other_router = builder.attach(Router())
+        window = builder._dialogs[0].windows[builder.states.menu.start]
+        manager = Mock()
+        manager.is_preview.return_value = False
+        manager.middleware_data = {}
+
+        async def load(bot_id):
+            token = current_bot_id.set(bot_id)
+            try:
+                return await window.getter(manager)
+            finally:
+                current_bot_id.reset(token)
+
+        # Then
+        assert await load(1) == {"brand": "First", "items": "default"}
+        assert await load(2) == {"brand": "Default", "items": "other"}
+        assert await load(None) == {"brand": "Default", "items": "default"}
+        shared_dialog = other_router.sub_routers[0]
+        assert shared_dialog is not builder._dialogs[0]
+        assert shared_dialog.windows[builder.states.menu.start] is window
+
+    @pytest.mark.asyncio
+    @patch("dialog_yml.core.setup_dialogs")
+    @patch("dialog_yml.core.YAMLReader.read_data_to_dict")
+    async def test_bots_added_after_build(self, mock_read_data, mock_setup_dialogs):
+        """Test texts of later bots are used and late overrides are rejected."""
+        # Given
+        async def plain_getter(**kwargs):
+            return {}
+
+        mock_read_data.return_value = {
+            "dialogs": {
+                "late": {
+                    "windows": {
+                        "start": {
+                            "getter": "plain_getter",
+                            "widgets": [{"format": "{brand}"}],
+                        }
+                    }
+                }
+            }
+        }
+        variants = BotVariants()
+        scope = BuilderScope(variants=variants)
+        scope.funcs_registry.register(plain_getter)
+        builder = DialogYAMLBuilder.build("test.yaml", router=Router(), scope=scope)
+        window = builder._dialogs[0].windows[builder.states.late.start]
+        manager = Mock()
+        manager.is_preview.return_value = False
+        manager.middleware_data = {}
+
+        # When
+        variants.add(1, texts={"brand": "Late"})
+        token = current_bot_id.set(1)
+        try:
+            data = await window.getter(manager)
+        finally:
+            current_bot_id.reset(token)
+
+        # Then
+        assert data == {"brand": "Late"}
+        with pytest.raises(FunctionOverrideError):
+            variants.add(2, functions={"plain_getter": plain_getter})
+
+    @pytest.mark.asyncio
+    @patch("dialog_yml.core.setup_dialogs")
+    @patch("dialog_yml.core.YAMLReader.read_data_to_dict")
+    async def test_group_buttons_function_override(
+        self, mock_read_data, mock_setup_dialogs
+    ):
+        """Test group buttons produced by a function differ per bot."""
+        # Given
+        def menu_buttons():
+            return [{"callback": {"id": "default", "text": "Default"}}]
+
+        def other_menu_buttons():
+            return [{"callback": {"id": "other", "text": "Other"}}]
+
+        mock_read_data.return_value = {
+            "dialogs": {
+                "grouped": {
+                    "windows": {
+                        "start": {
+                            "widgets": [
+                                {"text": "Menu"},
+                                {"group": {"buttons": "menu_buttons"}},
+                            ]
+                        }
+                    }
+                }
+            }
+        }
+        variants = BotVariants()
+        variants.add(2, functions={"menu_buttons": other_menu_buttons})
+        scope = BuilderScope(variants=variants)
+        scope.funcs_registry.register(menu_buttons)
+        builder = DialogYAMLBuilder.build("test.yaml", router=Router(), scope=scope)
+        window = builder._dialogs[0].windows[builder.states.grouped.start]
+        manager = Mock()
+        manager.current_context.return_value.widget_data = {}
+        manager.is_preview.return_value = False
+
+        async def render(bot_id):
+            token = current_bot_id.set(bot_id)
+            try:
+                rows = await window.keyboard.render_keyboard({}, manager)
+            finally:
+                current_bot_id.reset(token)
+            return [button.text for row in rows for button in row]
+
+        # Then
+        assert await render(1) == ["Default"]
+        assert await render(2) == ["Other"]
+
+
+    @pytest.mark.asyncio
+    @patch("dialog_yml.core.setup_dialogs")
+    @patch("dialog_yml.core.YAMLReader.read_data_to_dict")
+    async def test_button_click_override(self, mock_read_data, mock_setup_dialogs):
+        """Test each bot clicking the same button runs its own function."""
+        # Given
+        clicks = []
+
+        async def buy(callback, button, manager, data):
+            clicks.append(("default", data))
+
+        async def other_buy(callback, button, manager, data):
+            clicks.append(("other", data))
+
+        mock_read_data.return_value = {
+            "dialogs": {
+                "shop": {
+                    "windows": {
+                        "start": {
+                            "widgets": [
+                                {
+                                    "callback": {
+                                        "id": "buy",
+                                        "text": "Buy",
+                                        "on_click": "buy",
+                                        "item": 7,
+                                    }
+                                }
+                            ]
+                        }
+                    }
+                }
+            }
+        }
+        variants = BotVariants()
+        variants.add(2, functions={"buy": other_buy})
+        scope = BuilderScope(variants=variants)
+        scope.funcs_registry.register(buy)
+        builder = DialogYAMLBuilder.build("test.yaml", router=Router(), scope=scope)
+        window = builder._dialogs[0].windows[builder.states.shop.start]
+        button = window.keyboard.find("buy")
+
+        async def click(bot_id):
+            token = current_bot_id.set(bot_id)
+            try:
+                await button.on_click.process_event(Mock(), button, Mock())
+            finally:
+                current_bot_id.reset(token)
+
+        # When
+        await click(1)
+        await click(2)
+
+        # Then
+        assert clicks == [("default", {"item": 7}), ("other", {"item": 7})]
+
+
+class TestAsyncBuild:
+    """Unit tests for the non-blocking build."""
+
+    DATA = {
+        "dialogs": {
+            "async_menu": {"windows": {"start": {"widgets": [{"text": "Menu"}]}}},
+            "async_other": {"windows": {"start": {"widgets": [{"text": "Other"}]}}},
+        }
+    }
+
+    @pytest.mark.asyncio
+    @patch("dialog_yml.core.YAMLReader.read_data_to_dict")
+    async def test_loop_is_not_blocked(self, mock_read_data):
+        """Test the loop serves other tasks while the files are read."""
+        # Given
+        def slow_read(**kwargs):
+            time.sleep(0.2)
+            return copy.deepcopy(self.DATA)
+
+        mock_read_data.side_effect = slow_read
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        ticker_task = asyncio.create_task(ticker())
+
+        # When
+        builder = await DialogYAMLBuilder.abuild("test.yaml", scope=BuilderScope())
+        ticker_task.cancel()
+
+        # Then
+        assert ticks >= 5
+        assert len(builder._dialogs) == 2
+        assert builder.router.sub_routers[:2] == builder._dialogs
+
+    @pytest.mark.asyncio
+    @patch("dialog_yml.core.YAMLReader.read_data_to_dict")
+    async def test_router_is_swapped(self, mock_read_data):
+        """Test the new router takes the place of the replaced one."""
+        # Given
+        mock_read_data.side_effect = lambda **kwargs: copy.deepcopy(self.DATA)
+        parent = Router()
+        first = Router()
+        old = Router()
+        last = Router()
+        parent.include_routers(first, old, last)
+
+        # When
+        builder = await DialogYAMLBuilder.abuild(
+            "test.yaml", scope=BuilderScope(), replace_router=old
+        )
+
+        # Then
+        assert parent.sub_routers == [first, builder.router, last]
+        assert builder.router.parent_router is parent
+        assert old.parent_router is None
+
+    @pytest.mark.asyncio
+    @patch("dialog_yml.core.YAMLReader.read_data_to_dict")
+    async def test_router_without_parent_is_rejected(self, mock_read_data):
+        """Test a replaced router must be included in a parent router."""
+        with pytest.raises(DialogYamlException, match="parent router"):
+            await DialogYAMLBuilder.abuild(
+                "test.yaml", scope=BuilderScope(), replace_router=Router()
+            )
+        mock_read_data.assert_not_called()
+
+
+class TestProcessBuild:
+    """Unit tests for the build of dialog groups in processes."""
+
+    DATA = {
+        "dialogs": {
+            "proc_menu": {
+                "windows": {
+                    "start": {
+                        "getter": "proc_getter",
+                        "widgets": [
+                            {"text": {"val": "Many", "when": "count > 1"}},
+                            {
+                                "switch_to": {
+                                    "id": "go",
+                                    "text": "Go",
+                                    "state": "proc_other:start",
+                                }
+                            },
+                        ],
+                    }
+                }
+            },
+            "proc_other": {
+                "windows": {"start": {"widgets": [{"format": "Hi {name}"}]}}
+            },
+        }
+    }
+
+    @patch("dialog_yml.core.YAMLReader.read_data_to_dict")
+    def test_groups_are_built_in_processes(self, mock_read_data, mocker):
+        """Test the dialogs built from the models of the worker processes."""
+        # Given
+        async def proc_getter(**kwargs):
+            return {"count": 2}
+
+        mock_read_data.side_effect = lambda **kwargs: copy.deepcopy(self.DATA)
+        scope = BuilderScope()
+        scope.funcs_registry.register(proc_getter)
+        build_group = mocker.spy(DialogYAMLBuilder, "_build_dialog_model")
+
+        # When
+        builder = DialogYAMLBuilder.build(
+            "test.yaml", router=Router(), scope=scope, processes=2
+        )
+
+        # Then
+        assert build_group.call_count == 0
+        states = builder.states
+        assert [dialog.states_group_name() for dialog in builder._dialogs] == [
+            "proc_menu",
+            "proc_other",
+        ]
+        window = builder._dialogs[0].windows[states.proc_menu.start]
+        switch_to = window.keyboard.buttons[0]
+        assert switch_to.state is states.proc_other.start
+        assert window.text.condition({"count": 2}, None, None)
+
+    def test_models_pickling_resolves_states(self):
+        """Test pickled models get the states of the builder."""
+        # Given
+        manager = YAMLStatesManager.__wrapped__()
+        manager.build_states_from_yaml_data(self.DATA)
+        state = manager.get_state("proc_other:start")
+
+        # When
+        restored = loads_models(dumps_models({"state": state}), manager)
+
+        # Then
+        assert restored["state"] is state
+
+
+class TestThreadBuild:
+    """Unit tests for the build of dialog groups in threads."""
+
+    DATA = TestProcessBuild.DATA
+
+    @patch("dialog_yml.core.YAMLReader.read_data_to_dict")
+    def test_groups_are_built_in_threads(self, mock_read_data, mocker):
+        """Test the dialogs built in threads keep the order of the groups."""
+        # Given
+        async def proc_getter(**kwargs):
+            return {"count": 2}
+
+        mock_read_data.side_effect = lambda **kwargs: copy.deepcopy(self.DATA)
+        scope = BuilderScope()
+        scope.funcs_registry.register(proc_getter)
+        build_dialogs = mocker.spy(DialogYAMLBuilder, "_build_dialogs")
+        warm_up = mocker.spy(scope.model_factory, "warm_up")
+
+        # When
+        builder = DialogYAMLBuilder.build(
+            "test.yaml", router=Router(), scope=scope, threads=2
+        )
+
+        # Then
+        assert build_dialogs.call_count == 0
+        assert warm_up.call_count == 1
+        states = builder.states
+        assert [dialog.states_group_name() for dialog in builder._dialogs] == [
+            "proc_menu",
+            "proc_other",
+        ]
+        window = builder._dialogs[0].windows[states.proc_menu.start]
+        assert window.keyboard.buttons[0].state is states.proc_other.start
+        assert window.text.condition({"count": 2}, None, None)
+
+
+class TestLeanBuild:
+    """Unit tests for the lean build mode."""
+
+    DATA = {
+        "dialogs": {
+            "lean_menu": {
+                "windows": {
+                    state: {"widgets": [{"format": "Hello {name}"}, {"text": "Bye"}]}
+                    for state in ("first", "second")
+                }
+            }
+        }
+    }
+
+    @patch("dialog_yml.core.YAMLReader.read_data_to_dict")
+    def test_windows_share_strings_and_templates(self, mock_read_data, mocker):
+        """Test equal texts of the windows are shared and the garbage collected."""
+        # Given
+        mock_read_data.side_effect = lambda **kwargs: copy.deepcopy(self.DATA)
+        collect = mocker.patch("dialog_yml.core.gc.collect", return_value=0)
+
+        # When
+        builder = DialogYAMLBuilder.build(
+            "test.yaml", router=Router(), scope=BuilderScope(), lean=True
+        )
+
+        # Then
+        assert mock_read_data.call_args.kwargs["intern_strings"] is True
+        assert collect.call_count == 1
+        states = builder.states
+        first, second = (
+            builder._dialogs[0].windows[state].text.texts
+            for state in (states.lean_menu.first, states.lean_menu.second)
+        )
+        assert first[0].template is second[0].template
+
+    @patch("dialog_yml.core.setup_dialogs")
+    @patch("dialog_yml.core.YAMLReader.read_data_to_dict")
+    def test_button_callbacks_keep_no_models(self, mock_read_data, mock_setup_dialogs):
+        """Test buttons calling functions keep no models after the build."""
+        # Given
+        async def lean_click(callback, button, manager, data):
+            pass
+
+        mock_read_data.return_value = {
+            "dialogs": {
+                "lean_click": {
+                    "windows": {
+                        "start": {
+                            "widgets": [
+                                {
+                                    "callback": {
+                                        "id": "go",
+                                        "text": "Go",
+                                        "on_click": {"name": "lean_click", "step": 1},
+                                        "notify": "Done",
+                                        "source": "menu",
+                                    }
+                                }
+                            ]
+                        }
+                    }
+                }
+            }
+        }
+        scope = BuilderScope()
+        scope.funcs_registry.register(lean_click)
+
+        # When
+        builder = DialogYAMLBuilder.build(
+            "test.yaml", router=Router(), scope=scope, lean=True
+        )
+        gc.collect()
+
+        # Then
+        assert builder._dialogs
+        assert not [
+            model
+            for model in gc.get_objects()
+            if isinstance(model, (CallbackButtonModel, FuncModel))
+        ]
+
+
+class TestReadOnlyData:
+    """Unit tests for the build of read-only YAML data."""
+
+    CONFIG = """
+anchors:
+  select: &select
+    format: "{item}"
+    id: sel
+    items: ["Apple", "Pear"]
+    item_id_getter: fruit_id
+  button: &button
+    id: btn
+    text: Button
+    notify: {val: Done}
+dialogs:
+  Fruits:
+    windows:
+      FIRST:
+        widgets:
+          - group: {buttons: [select: *select, callback: *button]}
+          - multi: {texts: [text: One, text: Two]}
+      SECOND:
+        widgets:
+          - column: {buttons: [select: *select, callback: *button]}
+          - case: {texts: {1: One, 2: Two}, selector: count}
+"""
+
+    def test_anchored_nodes_are_shared_without_copies(self, tmp_path):
+        """Test the anchored nodes are built in each window and kept unchanged."""
+        # Given
+        def fruit_id(item):
+            return item
+
+        (tmp_path / "main.yaml").write_text(self.CONFIG)
+        scope = BuilderScope()
+        scope.funcs_registry.register(fruit_id)
+
+        # When
+        builder = DialogYAMLBuilder.build(
+            "main.yaml", str(tmp_path), router=Router(), scope=scope
+        )
+
+        # Then
+        states = builder.states
+        windows = builder._dialogs[0].windows
+        for state in (states.Fruits.FIRST, states.Fruits.SECOND):
+            select = windows[state].keyboard.buttons[0]
+            assert select.text.template.text == "{item}"
+
+
+class TestRenderCacheOption:
+    """Unit tests for the `render_cache` option of windows."""
+
+    DATA = {
+        "dialogs": {
+            "catalog": {
+                "windows": {
+                    "page": {
+                        "render_cache": {"size": 16, "ttl": 30},
+                        "widgets": [
+                            {"format": "Page {page} of {pages}"},
+                            {"callback": {"id": "ok", "text": "Ok"}},
+                        ],
+                    },
+                    "auto": {
+                        "render_cache": True,
+                        "widgets": [{"format": "Hello {dialog_data[name]}"}],
+                    },
+                    "listed": {
+                        "render_cache": {"keys": ["count"]},
+                        "widgets": [
+                            {"format": {"val": "{name}", "when": "count > 0"}},
+                            {"checkbox": {"id": "flag"}},
+                        ],
+                    },
+                    "plain": {"widgets": [{"text": "Plain"}]},
+                }
+            }
+        }
+    }
+
+    @patch("dialog_yml.core.YAMLReader.read_data_to_dict")
+    def test_windows_with_render_cache(self, mock_read_data):
+        """Test the cached windows and their inferred data keys."""
+        # Given
+        mock_read_data.side_effect = lambda **kwargs: copy.deepcopy(self.DATA)
+
+        # When
+        builder = DialogYAMLBuilder.build(
+            "test.yaml", router=Router(), scope=BuilderScope()
+        )
+
+        # Then
+        states = builder.states.catalog
+        windows = builder._dialogs[0].windows
+        page, auto, listed, plain = (
+            windows[state]
+            for state in (states.page, states.auto, states.listed, states.plain)
+        )
+        assert isinstance(page, RenderCachedWindow)
+        assert page.render_cache.keys == ("page", "pages")
+        assert (page.render_cache.size, page.render_cache.ttl) == (16, 30)
+        assert isinstance(auto, RenderCachedWindow)
+        assert auto.render_cache.keys == ("dialog_data",)
+        assert listed.render_cache.keys == ("count", "name")
+        assert listed.render_cache.state_ids == ("flag",)
+        assert not isinstance(plain, RenderCachedWindow)
+
+    @patch("dialog_yml.core.YAMLReader.read_data_to_dict")
+    def test_keys_must_be_known(self, mock_read_data):
+        """Test a cache without keys on a window with unknown keys is rejected."""
+        # Given
+        mock_read_data.return_value = {
+            "dialogs": {
+                "unknown_keys": {
+                    "windows": {
+                        "page": {
+                            "render_cache": True,
+                            "widgets": [
+                                {"format": {"val": "{name}", "when": "not hidden"}}
+                            ],
+                        }
+                    }
+                }
+            }
+        }
+
+        # When / Then
+        with pytest.raises(RenderCacheKeysError, match="unknown_keys:page"):
+            DialogYAMLBuilder.build("test.yaml", router=Router(), scope=BuilderScope())
@@ -0,0 +1,139 @@
+"""Unit tests for the localized texts."""
+
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+import pytest
+from aiogram import Router
+from babel.messages.catalog import Catalog
+from babel.messages.mofile import write_mo
+
+from dialog_yml import BuilderScope
+from dialog_yml.core import DialogYAMLBuilder
+from dialog_yml.exceptions import DialogYamlException
+from dialog_yml.i18n import I18nCatalogs
+from dialog_yml.models.widgets.texts.text import TextModel
+from dialog_yml.scope import use_scope
+from dialog_yml.widgets import I18nText
+
+
+def compile_catalog(path, locale, messages):
+    catalog = Catalog(locale=locale)
+    for message_id, text in messages.items():
+        catalog.add(message_id, text)
+    directory = path / locale / "LC_MESSAGES"
+    directory.mkdir(parents=True)
+    with open(directory / "messages.mo", "wb") as file:
+        write_mo(file, catalog)
+
+
+def make_manager(language_code):
+    manager = Mock()
+    manager.is_preview.return_value = False
+    manager.middleware_data = {
+        "event_from_user": SimpleNamespace(language_code=language_code)
+    }
+    return manager
+
+
+@pytest.fixture
+def catalogs(tmp_path):
+    compile_catalog(tmp_path, "en", {"hello": "Hello, {name}!", "bye": "Bye"})
+    compile_catalog(tmp_path, "ru", {"hello": "Привет, {name}!", "bye": "Пока"})
+    compile_catalog(tmp_path, "pt_BR", {"bye": "Tchau"})
+    return I18nCatalogs(str(tmp_path))
+
+
+class TestI18nCatalogs:
+    """Unit tests for I18nCatalogs."""
+
+    @pytest.mark.parametrize(
+        "language_code, expected",
+        [
+            ("ru", "ru"),
+            ("ru-RU", "ru"),
+            ("pt-br", "pt_BR"),
+            ("de", "en"),
+            (None, "en"),
+        ],
+    )
+    def test_resolve_locale(self, catalogs, language_code, expected):
+        """Test language codes are resolved to the available locales."""
+        assert catalogs.resolve_locale(language_code) == expected
+
+    def test_catalogs_are_loaded_lazily(self, catalogs):
+        """Test a catalog is loaded on the first lookup of its locale only."""
+        # When
+        text = catalogs.gettext("bye", "ru")
+
+        # Then
+        assert text == "Пока"
+        assert set(catalogs._translations) == {"ru"}
+        assert catalogs.gettext("unknown", "ru") == "unknown"
+
+
+class TestI18nText:
+    """Unit tests for I18nText."""
+
+    @pytest.mark.asyncio
+    async def test_formatted_text_is_compiled_per_locale(self, catalogs, mocker):
+        """Test the translation of a locale is looked up and compiled once."""
+        # Given
+        text = I18nText("hello", catalogs, formatted=True)
+        gettext = mocker.spy(catalogs, "gettext")
+
+        # When
+        first = await text.render_text({"name": "Ann"}, make_manager("ru"))
+        second = await text.render_text({"name": "Bob"}, make_manager("ru-RU"))
+        english = await text.render_text({"name": "Eve"}, make_manager("de"))
+
+        # Then
+        assert (first, second, english) == ("Привет, Ann!", "Привет, Bob!", "Hello, Eve!")
+        assert gettext.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_text_model_builds_i18n_text(self, catalogs):
+        """Test `i18n` texts are built with the catalogs of the scope."""
+        # Given
+        model = TextModel.to_model({"val": "bye", "i18n": True})
+
+        # When
+        with use_scope(BuilderScope.default()) as scope:
+            scope.i18n = catalogs
+            widget = model.to_object()
+
+        # Then
+        assert isinstance(widget, I18nText)
+        assert await widget.render_text({}, make_manager("pt-BR")) == "Tchau"
+
+    def test_text_model_without_catalogs(self):
+        """Test an `i18n` text can not be built without catalogs."""
+        model = TextModel.to_model({"val": "bye", "i18n": True})
+
+        with use_scope(BuilderScope.default()):
+            with pytest.raises(DialogYamlException):
+                model.to_object()
+
+    @patch("dialog_yml.core.setup_dialogs")
+    @patch("dialog_yml.core.YAMLReader.read_data_to_dict")
+    def test_build_keeps_caller_scope(self, mock_read_data, mock_setup_dialogs, catalogs):
+        """Test the catalogs of a build are not kept in the given scope."""
+        # Given
+        mock_read_data.side_effect = lambda **kwargs: {
+            "dialogs": {
+                "greet": {"windows": {"start": {"widgets": [{"text": "Hi"}]}}}
+            }
+        }
+        scope = BuilderScope()
+
+        # When
+        first = DialogYAMLBuilder.build(
+            "test.yaml", router=Router(), scope=scope, i18n=catalogs
+        )
+        second = DialogYAMLBuilder.build("test.yaml", router=Router(), scope=scope)
+
+        # Then
+        assert first.scope.i18n is catalogs
+        assert first.funcs_registry is scope.funcs_registry
+        assert scope.i18n is None
+        assert second.scope.i18n is None
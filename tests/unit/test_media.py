@@ -0,0 +1,130 @@
+"""Unit tests for the media storages."""
+
+import mmap
+from unittest.mock import Mock
+
+import pytest
+from aiogram.enums import ContentType
+from aiogram_dialog.api.entities import MediaId
+
+from dialog_yml.media import CachedInputFile, MediaFileCache, SqliteMediaIdStorage
+
+
+class TestSqliteMediaIdStorage:
+    """Unit tests for SqliteMediaIdStorage."""
+
+    @pytest.fixture
+    def image(self, tmp_path):
+        path = tmp_path / "image.png"
+        path.write_bytes(b"first")
+        return path
+
+    @pytest.mark.asyncio
+    async def test_media_id_is_persisted(self, tmp_path, image):
+        """Test saved file id survives a new storage instance."""
+        # Given
+        db_path = str(tmp_path / "media.sqlite")
+        storage = SqliteMediaIdStorage(db_path)
+        media_id = MediaId("file-id", "unique-id")
+
+        # When
+        await storage.save_media_id(str(image), None, ContentType.PHOTO, media_id)
+        storage.close()
+        restored = SqliteMediaIdStorage(db_path)
+
+        # Then
+        assert await restored.get_media_id(
+            str(image), None, ContentType.PHOTO
+        ) == media_id
+        assert await restored.get_media_id(str(image), None, ContentType.VIDEO) is None
+
+    @pytest.mark.asyncio
+    async def test_changed_content_is_not_reused(self, tmp_path, image):
+        """Test file id is not returned after the file content changes."""
+        # Given
+        storage = SqliteMediaIdStorage(str(tmp_path / "media.sqlite"))
+        await storage.save_media_id(
+            str(image), None, ContentType.PHOTO, MediaId("file-id")
+        )
+
+        # When
+        image.write_bytes(b"second content")
+
+        # Then
+        assert await storage.get_media_id(str(image), None, ContentType.PHOTO) is None
+
+    @pytest.mark.asyncio
+    async def test_url_media_id(self, tmp_path):
+        """Test file ids of url media are stored by url."""
+        # Given
+        storage = SqliteMediaIdStorage(str(tmp_path / "media.sqlite"))
+        url = "https://example.com/image.png"
+
+        # When
+        await storage.save_media_id(None, url, ContentType.PHOTO, MediaId("url-id"))
+
+        # Then
+        assert await storage.get_media_id(None, url, ContentType.PHOTO) == MediaId(
+            "url-id"
+        )
+        assert await storage.get_media_id(None, None, ContentType.PHOTO) is None
+
+
+class TestMediaFileCache:
+    """Unit tests for MediaFileCache and CachedInputFile."""
+
+    @pytest.fixture
+    def cache(self):
+        cache = MediaFileCache(max_size=10, mmap_threshold=100)
+        yield cache
+        cache.close()
+
+    @pytest.mark.asyncio
+    async def test_small_files_are_cached(self, tmp_path, cache):
+        """Test small files are read once and evicted by total size."""
+        # Given
+        first = tmp_path / "first.png"
+        second = tmp_path / "second.png"
+        first.write_bytes(b"123456")
+        second.write_bytes(b"abcdef")
+
+        # When
+        data = await cache.read(str(first))
+        again = await cache.read(str(first))
+        await cache.read(str(second))
+
+        # Then
+        assert data == b"123456" and again is data
+        assert cache.size == 6
+        assert list(cache._files) == [str(second)]
+
+    @pytest.mark.asyncio
+    async def test_changed_file_is_read_again(self, tmp_path, cache):
+        """Test the cached content is invalidated by the file size change."""
+        # Given
+        path = tmp_path / "image.png"
+        path.write_bytes(b"old")
+        await cache.read(str(path))
+
+        # When
+        path.write_bytes(b"new content")
+
+        # Then
+        assert await cache.read(str(path)) == b"new content"
+
+    @pytest.mark.asyncio
+    async def test_large_file_is_memory_mapped(self, tmp_path, cache):
+        """Test large files are memory-mapped and uploaded in chunks."""
+        # Given
+        path = tmp_path / "video.mp4"
+        path.write_bytes(b"x" * 250)
+        input_file = CachedInputFile(str(path), cache, chunk_size=100)
+
+        # When
+        data = await cache.read(str(path))
+        chunks = [bytes(chunk) async for chunk in input_file.read(Mock())]
+
+        # Then
+        assert isinstance(data, mmap.mmap)
+        assert [len(chunk) for chunk in chunks] == [100, 100, 50]
+        assert input_file.filename == "video.mp4"
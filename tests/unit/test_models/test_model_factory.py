@@ -268,3 +268,41 @@ class TestYAMLModelFactory:
         # When/Then
         with pytest.raises(expected_exception):
             YAMLModelFactory.create_model(invalid_data)
+
+    def test_models_schemas_are_deferred(self):
+        """Test a model schema is built on the first validation only."""
+        # Given
+        class DeferredModel(YAMLSubModel):
+            key3: str = ""
+
+        # When
+        complete_before = DeferredModel.__pydantic_complete__
+        DeferredModel.to_model({"key1": "value1"})
+
+        # Then
+        assert not complete_before
+        assert DeferredModel.__pydantic_complete__
+
+    def test_warm_up_builds_schemas(self):
+        """Test warm-up builds the schemas of the given tags."""
+        # Given
+        class FirstModel(YAMLSubModel):
+            pass
+
+        class SecondModel(YAMLSubModel):
+            pass
+
+        YAMLModelFactory.set_classes({"first": FirstModel, "second": SecondModel})
+
+        # When
+        built = YAMLModelFactory.warm_up(["first", "second", "first"])
+
+        # Then
+        assert built == 2
+        assert FirstModel.__pydantic_complete__ and SecondModel.__pydantic_complete__
+        assert YAMLModelFactory.warm_up() == 0
+
+    def test_warm_up_unknown_tag(self):
+        """Test warm-up of a not registered tag raises."""
+        with pytest.raises(InvalidTagName):
+            YAMLModelFactory.warm_up(["missing"])
@@ -0,0 +1,96 @@
+"""Unit tests for the lazy model classes registry."""
+
+import subprocess
+import sys
+
+import pytest
+
+from dialog_yml.exceptions import DialogYamlException
+from dialog_yml.models import YAMLModelFactory
+from dialog_yml.models.registry import LazyModelClasses
+from dialog_yml.models.widgets.texts.text import TextModel
+
+TEXT_PATH = "dialog_yml.models.widgets.texts.text:TextModel"
+
+
+class TestLazyModelClasses:
+    """Unit tests for LazyModelClasses."""
+
+    def test_path_is_resolved_on_lookup(self):
+        """Test an import path is replaced by the class on the first lookup."""
+        # Given
+        registry = LazyModelClasses({"text": TEXT_PATH})
+
+        # When
+        loaded_before = registry.is_loaded("text")
+        model_class = registry["text"]
+
+        # Then
+        assert not loaded_before
+        assert model_class is TextModel
+        assert registry.is_loaded("text")
+        assert registry.loaded_items() == {"text": TextModel}
+
+    def test_merge_keeps_paths_unresolved(self):
+        """Test merged registries do not import the classes."""
+        # Given
+        registry = LazyModelClasses({"text": TEXT_PATH, "other": "missing:Model"})
+
+        # When
+        merged = LazyModelClasses(registry, {"custom": TextModel})
+        copied = registry.copy()
+
+        # Then
+        assert list(merged) == ["text", "other", "custom"]
+        assert not merged.is_loaded("text")
+        assert not copied.is_loaded("other")
+
+    def test_invalid_path(self):
+        """Test a broken import path is reported with the tag."""
+        registry = LazyModelClasses({"broken": "dialog_yml.missing:Model"})
+
+        with pytest.raises(DialogYamlException, match="broken"):
+            registry.get("broken")
+
+    def test_factory_with_lazy_registry(self):
+        """Test the factory creates models of lazily registered tags."""
+        # Given
+        factory = YAMLModelFactory.new_factory(LazyModelClasses({"text": TEXT_PATH}))
+
+        # When
+        factory.set_classes(factory._models_classes)
+        model = factory.create_model({"text": "Hello"})
+
+        # Then
+        assert isinstance(model, TextModel)
+
+    def test_widget_modules_are_not_imported_eagerly(self):
+        """Test importing the package and the builder does not import
+        widget models which are not used by the base models."""
+        # Given
+        code = (
+            "import sys, dialog_yml;"
+            "assert 'dialog_yml.core' not in sys.modules;"
+            "import dialog_yml.core;"
+            "assert 'dialog_yml.models.widgets.selects.select' not in sys.modules;"
+            "assert 'dialog_yml.models.widgets.calendars.calendar' not in sys.modules;"
+            "assert 'dialog_yml.models.window' not in sys.modules;"
+            "assert 'dialog_yml.models.widgets.kbd.keyboard' not in sys.modules;"
+            "assert 'dialog_yml.widgets' not in sys.modules;"
+            "assert 'dialog_yml.parallel' not in sys.modules"
+        )
+
+        # When
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True)
+
+        # Then
+        assert result.returncode == 0, result.stderr.decode()
+
+    def test_package_classes_are_kept(self):
+        """Test the `*_classes` maps of the widget packages map tags to classes."""
+        # When
+        from dialog_yml.models.widgets.texts import text_classes
+
+        # Then
+        assert text_classes["text"] is TextModel
+        assert len(text_classes) == 6
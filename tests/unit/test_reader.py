@@ -1,10 +1,14 @@
 """Unit tests for YAMLReader component."""
 
+import copy
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 from unittest.mock import mock_open, patch
 import yaml
 
-from dialog_yml.reader import YAMLReader
+from dialog_yml.reader import FrozenDict, YAMLReader
 
 
 class TestYAMLReader:
@@ -96,3 +100,81 @@ class TestYAMLReader:
 
         # Then
         assert result == expected_data
+
+    def test_includes_of_directories_read_in_threads(self, tmp_path):
+        """Test each directory resolves its own includes in parallel reads."""
+        # Given
+        dirs = []
+        for name in ("first", "second"):
+            dir_path = tmp_path / name
+            dir_path.mkdir()
+            (dir_path / "main.yaml").write_text("value: !include part.yaml")
+            (dir_path / "part.yaml").write_text(name)
+            dirs.append(str(dir_path))
+
+        # When
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(
+                executor.map(
+                    lambda dir_path: YAMLReader.read_data_to_dict("main.yaml", dir_path),
+                    dirs * 20,
+                )
+            )
+
+        # Then
+        assert results == [{"value": "first"}, {"value": "second"}] * 20
+        assert "!include" not in yaml.FullLoader.yaml_constructors
+
+    def test_interned_strings_are_shared_with_includes(self, tmp_path):
+        """Test equal strings of the main and the included files are one object."""
+        # Given
+        (tmp_path / "main.yaml").write_text(
+            "first: some text\nsecond: !include part.yaml"
+        )
+        (tmp_path / "part.yaml").write_text("some text")
+
+        # When
+        regular = YAMLReader.read_data_to_dict("main.yaml", str(tmp_path))
+        interned = YAMLReader.read_data_to_dict(
+            "main.yaml", str(tmp_path), intern_strings=True
+        )
+
+        # Then
+        assert regular == interned == {"first": "some text", "second": "some text"}
+        assert regular["first"] is not regular["second"]
+        assert interned["first"] is interned["second"]
+
+    def test_mappings_are_read_only(self, tmp_path):
+        """Test mappings are read-only and anchors are one object."""
+        # Given
+        (tmp_path / "main.yaml").write_text(
+            "anchors:\n  node: &node {id: btn}\nfirst: *node\nsecond: *node"
+        )
+
+        # When
+        data = YAMLReader.read_data_to_dict("main.yaml", str(tmp_path))
+
+        # Then
+        assert isinstance(data, FrozenDict)
+        assert data["first"] is data["second"]
+        with pytest.raises(TypeError):
+            data["first"]["id"] = "other"
+        with pytest.raises(TypeError):
+            data["first"].pop("id")
+        assert data["first"] == {"id": "btn"}
+
+    def test_frozen_dict_copies(self):
+        """Test copies of a read-only mapping."""
+        # Given
+        data = FrozenDict({"nested": FrozenDict({"id": "btn"})})
+
+        # When
+        copied = data.copy()
+        deep_copied = copy.deepcopy(data)
+        unpickled = pickle.loads(pickle.dumps(data))
+
+        # Then
+        copied["id"] = "changed"
+        assert type(copied) is dict
+        assert deep_copied == unpickled == data
+        assert isinstance(unpickled["nested"], FrozenDict)
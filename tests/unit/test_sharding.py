@@ -0,0 +1,211 @@
+"""Unit tests for the user-sharded multi-process dispatcher."""
+
+import asyncio
+import datetime
+from collections import defaultdict
+
+import pytest
+from aiogram import Bot, Dispatcher
+from aiogram.client.session.base import BaseSession
+from aiogram.methods import SendMessage
+from aiogram.types import Chat, Message
+
+from dialog_yml.exceptions import ShardWorkerError
+from dialog_yml.sharding import (
+    ShardedDispatcher,
+    _UserOrderedFeeder,
+    get_update_user_id,
+    shard_for,
+)
+
+
+class FakeSession(BaseSession):
+    """Bot session writing sent messages to a file instead of Telegram."""
+
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+
+    async def make_request(self, bot, method, timeout=None):
+        assert isinstance(method, SendMessage)
+        with open(self.path, "a") as file:
+            file.write(f"{method.text}\n")
+        return Message(
+            message_id=1,
+            date=datetime.datetime.now(),
+            chat=Chat(id=method.chat_id, type="private"),
+            text=method.text,
+        )
+
+    async def stream_content(self, *args, **kwargs):
+        raise NotImplementedError
+
+    async def close(self):
+        pass
+
+
+def make_update(update_id: int, user_id: int, text: str) -> dict:
+    user = {"id": user_id, "is_bot": False, "first_name": "User"}
+    return {
+        "update_id": update_id,
+        "message": {
+            "message_id": update_id,
+            "date": 0,
+            "chat": {"id": user_id, "type": "private"},
+            "from": user,
+            "text": text,
+        },
+    }
+
+
+class TestShardFor:
+    """Unit tests for the consistent hash."""
+
+    def test_shards_are_stable_and_balanced(self):
+        """Test the shard of a user depends only on the user and shards count."""
+        # When
+        shards = [shard_for(user_id, 4) for user_id in range(1000)]
+
+        # Then
+        assert shards == [shard_for(user_id, 4) for user_id in range(1000)]
+        assert set(shards) == {0, 1, 2, 3}
+        assert min(shards.count(shard) for shard in range(4)) > 150
+
+    def test_adding_shard_moves_few_users(self):
+        """Test adding a shard moves only users to the new shard."""
+        # When
+        moved = [
+            user_id
+            for user_id in range(1000)
+            if shard_for(user_id, 4) != shard_for(user_id, 5)
+        ]
+
+        # Then
+        assert all(shard_for(user_id, 5) == 4 for user_id in moved)
+        assert len(moved) < 300
+
+    def test_update_user_id(self):
+        """Test the user id is taken from the update event."""
+        assert get_update_user_id(make_update(1, 42, "hi")) == 42
+        assert get_update_user_id({"update_id": 1}) == 0
+
+
+class TestUserOrderedFeeder:
+    """Unit tests for the feeder of the updates of one worker."""
+
+    @pytest.mark.asyncio
+    async def test_failed_updates_are_logged(self, caplog):
+        """Test a failed update is logged and the next one of the user is handled."""
+        # Given
+        handled = []
+        dispatcher = Dispatcher()
+
+        @dispatcher.message()
+        async def handler(message: Message):
+            if message.text == "fail":
+                raise ValueError("handler failed")
+            handled.append(message.text)
+
+        feeder = _UserOrderedFeeder(dispatcher, Bot("42:TEST"))
+
+        # When
+        await feeder.feed(make_update(1, 1, "fail"))
+        await feeder.feed(make_update(2, 1, "ok"))
+        await feeder.wait()
+
+        # Then
+        assert handled == ["ok"]
+        assert feeder.failed == 1
+        assert "Update 1 failed" in caplog.text
+
+    @pytest.mark.asyncio
+    async def test_feed_waits_for_free_slot(self):
+        """Test no more than max_pending updates are in progress."""
+        # Given
+        release = asyncio.Event()
+        dispatcher = Dispatcher()
+
+        @dispatcher.message()
+        async def handler(message: Message):
+            await release.wait()
+
+        feeder = _UserOrderedFeeder(dispatcher, Bot("42:TEST"), max_pending=2)
+        await feeder.feed(make_update(1, 1, "a"))
+        await feeder.feed(make_update(2, 2, "b"))
+
+        # When
+        third = asyncio.create_task(feeder.feed(make_update(3, 3, "c")))
+        await asyncio.sleep(0.01)
+        blocked = not third.done()
+        release.set()
+        await third
+        await feeder.wait()
+
+        # Then
+        assert blocked
+        assert feeder.failed == 0
+
+
+class TestShardedDispatcher:
+    """Unit tests for ShardedDispatcher with a fake update source."""
+
+    @pytest.mark.asyncio
+    async def test_user_updates_are_ordered_in_one_worker(self, tmp_path):
+        """Test each user is served by one worker in the received order."""
+        # Given
+        def setup(index: int):
+            bot = Bot("42:TEST", session=FakeSession(tmp_path / f"shard_{index}"))
+            dispatcher = Dispatcher()
+
+            @dispatcher.message()
+            async def echo(message: Message):
+                # Later messages are handled faster
+                await asyncio.sleep(0.03 - 0.01 * int(message.text))
+                await message.answer(f"{message.from_user.id}:{message.text}")
+
+            return dispatcher, bot
+
+        updates = [
+            make_update(number * 10 + user_id, user_id, str(number))
+            for number in range(3)
+            for user_id in range(1, 7)
+        ]
+
+        # When
+        exit_codes = await ShardedDispatcher(setup, workers=3).run(updates)
+
+        # Then
+        assert exit_codes == [0, 0, 0]
+        user_shards = defaultdict(set)
+        user_texts = defaultdict(list)
+        for index in range(3):
+            path = tmp_path / f"shard_{index}"
+            lines = path.read_text().split() if path.exists() else []
+            for line in lines:
+                user_id, number = line.split(":")
+                user_shards[int(user_id)].add(index)
+                user_texts[int(user_id)].append(number)
+
+        assert set(user_texts) == set(range(1, 7))
+        assert all(len(shards) == 1 for shards in user_shards.values())
+        assert all(texts == ["0", "1", "2"] for texts in user_texts.values())
+        assert all(
+            user_shards[user_id] == {shard_for(user_id, 3)} for user_id in range(1, 7)
+        )
+
+    @pytest.mark.asyncio
+    async def test_dead_worker_stops_routing(self):
+        """Test routing to a worker that exited raises instead of blocking."""
+        # Given
+        def setup(index: int):
+            raise RuntimeError("setup failed")
+
+        updates = [make_update(number, 1, str(number)) for number in range(10)]
+        dispatcher = ShardedDispatcher(setup, workers=1, max_pending=2)
+
+        # When
+        with pytest.raises(ShardWorkerError) as error:
+            await asyncio.wait_for(dispatcher.run(updates), timeout=10)
+
+        # Then
+        assert "Shard worker 0 exited with code 1" in str(error.value)
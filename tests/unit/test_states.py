@@ -67,6 +67,44 @@ class TestYAMLStatesManager:
         # Then
         assert isinstance(result, State)
 
+    def test_group_and_state_indices(
+        self, populated_states_manager: YAMLStatesManager
+    ):
+        """Test groups and states are looked up in separate indices."""
+        # Given
+        states_manager = populated_states_manager
+
+        # When
+        group = states_manager.get_group("group1")
+        state = states_manager.get_state("group1:state1")
+
+        # Then
+        assert isinstance(group, StatesGroup)
+        assert isinstance(state, State)
+        assert states_manager.get_group("group1:state1") is None
+        assert states_manager.get_state("group1") is None
+        assert sorted(states_manager.get_group_names()) == ["group1", "group2"]
+
+    def test_namespace_is_cached_until_change(
+        self, populated_states_manager: YAMLStatesManager
+    ):
+        """Test the states namespace is rebuilt only after the map changes."""
+        # Given
+        states_manager = populated_states_manager
+        namespace = states_manager.namespace
+
+        # When
+        same_namespace = states_manager.namespace
+        states_manager.add_states_group_to_map(
+            "group3", states_manager._build_states_group("group3", {})
+        )
+
+        # Then
+        assert same_namespace is namespace
+        assert states_manager.namespace is not namespace
+        assert hasattr(states_manager.namespace, "group3")
+        assert not hasattr(namespace, "group3")
+
     def test_get_by_names(self, populated_states_manager: YAMLStatesManager):
         """Test retrieving state by group and state names."""
         # Given
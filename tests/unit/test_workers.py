@@ -0,0 +1,78 @@
+"""Unit tests for the pre-fork worker mode."""
+
+import gc
+import logging
+import logging.handlers
+import os
+
+import pytest
+
+from dialog_yml.workers import disable_gc, freeze_objects, run_prefork
+
+
+@pytest.fixture
+def unfreeze():
+    yield
+    gc.unfreeze()
+    gc.enable()
+
+
+class TestPrefork:
+    """Unit tests for run_prefork."""
+
+    def test_freeze_objects(self, unfreeze):
+        """Test objects are moved to the permanent generation."""
+        # When
+        frozen = freeze_objects()
+
+        # Then
+        assert frozen > 0
+        assert gc.get_freeze_count() == frozen
+
+    def test_workers_share_built_objects(self, tmp_path, unfreeze):
+        """Test each worker runs with the objects built in the master."""
+        # Given
+        built_tree = {"dialogs": ["menu"]}
+
+        async def worker(index: int):
+            path = tmp_path / f"worker_{index}"
+            path.write_text(f"{os.getpid()}:{built_tree['dialogs'][0]}")
+            if index == 2:
+                raise RuntimeError("worker failed")
+
+        # When
+        exit_codes = run_prefork(worker, workers=3)
+
+        # Then
+        assert exit_codes == [0, 0, 1]
+        results = [(tmp_path / f"worker_{i}").read_text() for i in range(3)]
+        assert all(result.endswith(":menu") for result in results)
+        assert len({result.split(":")[0] for result in results}) == 3
+        assert str(os.getpid()) not in {result.split(":")[0] for result in results}
+
+    def test_workers_enable_gc_and_flush_logs(self, tmp_path, unfreeze):
+        """Test workers run with the GC enabled and their buffered logs are kept."""
+        # Given
+        log_path = tmp_path / "worker.log"
+        handler = logging.handlers.MemoryHandler(
+            capacity=1000, target=logging.FileHandler(log_path)
+        )
+        worker_logger = logging.getLogger("tests.prefork_worker")
+        worker_logger.addHandler(handler)
+        worker_logger.setLevel(logging.INFO)
+        disable_gc()
+
+        def worker(index: int):
+            worker_logger.info("gc enabled: %s", gc.isenabled())
+
+        # When
+        try:
+            exit_codes = run_prefork(worker, workers=1)
+        finally:
+            worker_logger.removeHandler(handler)
+            handler.close()
+
+        # Then
+        assert exit_codes == [0]
+        assert gc.isenabled() is False
+        assert log_path.read_text() == "gc enabled: True\n"
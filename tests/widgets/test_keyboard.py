@@ -0,0 +1,53 @@
+from unittest.mock import Mock
+
+import pytest
+from aiogram_dialog.widgets.kbd import Button, Cancel, Group, Row, Select, Url
+from aiogram_dialog.widgets.text import Const, Format
+
+from dialog_yml.widgets.keyboard import StaticKeyboard, is_static_keyboard
+
+
+class TestStaticKeyboard:
+    @pytest.fixture
+    def manager(self):
+        manager = Mock()
+        manager.current_context.return_value.widget_data = {}
+        manager.is_preview.return_value = False
+        return manager
+
+    @pytest.mark.parametrize(
+        "keyboard, expected",
+        [
+            (Button(Const("Ok"), id="ok"), True),
+            (Url(Const("Site"), Const("https://example.com")), True),
+            (Row(Button(Const("Ok"), id="ok"), Cancel()), True),
+            (Button(Format("{name}"), id="ok"), False),
+            (Button(Const("Ok"), id="ok", when="flag"), False),
+            (Url(Const("Site"), Format("{url}")), False),
+            (Group(Button(Const("Ok"), id="ok"), Button(Format("{x}"), id="x")), False),
+            (
+                Select(Format("{item}"), id="s", item_id_getter=str, items="items"),
+                False,
+            ),
+        ],
+    )
+    def test_is_static_keyboard(self, keyboard, expected):
+        assert is_static_keyboard(keyboard) is expected
+
+    @pytest.mark.asyncio
+    async def test_markup_is_rendered_once(self, manager, mocker):
+        # Given
+        inner = Row(Button(Const("Ok"), id="ok"), Button(Const("No"), id="no"))
+        render = mocker.spy(inner, "_render_keyboard")
+        keyboard = StaticKeyboard(inner)
+
+        # When
+        first = await keyboard.render_keyboard({}, manager)
+        first[0][0].callback_data = "mutated"
+        second = await keyboard.render_keyboard({"other": 1}, manager)
+
+        # Then
+        assert render.call_count == 1
+        assert [[b.text for b in row] for row in second] == [["Ok", "No"]]
+        assert second[0][0].callback_data == "ok"
+        assert keyboard.find("no") is inner.buttons[1]
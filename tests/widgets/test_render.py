@@ -0,0 +1,256 @@
+import logging
+from dataclasses import dataclass
+from decimal import Decimal
+from unittest.mock import Mock
+
+import pytest
+from aiogram.fsm.state import State
+from aiogram.types import CallbackQuery, User
+from aiogram_dialog.widgets.kbd import Button, Row, Select
+from aiogram_dialog.widgets.text import Const, Format, Multi
+
+from dialog_yml.widgets.keyboard import StaticKeyboard
+from dialog_yml.widgets.render import (
+    RenderCache,
+    RenderCachedWindow,
+    find_state_ids,
+    infer_render_keys,
+)
+from dialog_yml.widgets.text import CompiledFormat
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestRenderCache:
+    @pytest.fixture
+    def manager(self):
+        manager = Mock()
+        manager.current_context.return_value.widget_data = {}
+        manager.current_context.return_value.id = "first"
+        manager.is_preview.return_value = False
+        return manager
+
+    def test_key_depends_on_used_data_only(self, manager):
+        # Given
+        cache = RenderCache(keys=["page"])
+
+        # When
+        first = cache.make_key({"page": 1, "user": "Bob"}, manager)
+        second = cache.make_key({"user": "Ann", "page": 1}, manager)
+        third = cache.make_key({"page": 2, "user": "Bob"}, manager)
+
+        # Then
+        assert first == second
+        assert first != third
+
+    def test_key_depends_on_widget_state(self, manager):
+        # Given
+        cache = RenderCache(keys=["page"], state_ids=["flag"])
+        widget_data = manager.current_context.return_value.widget_data
+
+        # When
+        first = cache.make_key({"page": 1}, manager)
+        widget_data["other"] = True
+        second = cache.make_key({"page": 1}, manager)
+        widget_data["flag"] = True
+        third = cache.make_key({"page": 1}, manager)
+
+        # Then
+        assert first == second
+        assert first != third
+
+    def test_size_evicts_least_recently_used(self):
+        # Given
+        cache = RenderCache(keys=(), size=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+
+        # When
+        cache.put("c", 3)
+
+        # Then
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+
+    def test_ttl_expires_entries(self):
+        # Given
+        clock = FakeClock()
+        cache = RenderCache(keys=(), ttl=10, clock=clock)
+        cache.put("a", 1)
+
+        # When
+        clock.now = 5
+        fresh = cache.get("a")
+        clock.now = 10
+        expired = cache.get("a")
+
+        # Then
+        assert fresh == 1
+        assert expired is None
+        assert cache.stats == {"hits": 1, "misses": 1, "size": 0}
+
+    @pytest.mark.parametrize(
+        "widgets, expected",
+        [
+            ([Const("Hi"), CompiledFormat("{name} {page}")], {"name", "page"}),
+            ([Multi(Const("A"), CompiledFormat("{page}"))], {"page"}),
+            ([StaticKeyboard(Row(Button(Const("Ok"), id="ok")))], set()),
+            ([Format("{name}")], None),
+            ([CompiledFormat("{name}", when="flag")], None),
+            ([Select(Format("{item}"), id="s", item_id_getter=str, items="items")], None),
+        ],
+    )
+    def test_infer_render_keys(self, widgets, expected):
+        keys = infer_render_keys(widgets)
+        assert keys == (frozenset(expected) if expected is not None else None)
+
+    @pytest.mark.asyncio
+    async def test_window_renders_once_for_equal_data(self, manager, mocker):
+        # Given
+        text = CompiledFormat("Page {page}")
+        keyboard = Row(Button(Format("Item {page}"), id="item"))
+        render_text = mocker.spy(text, "_render_text")
+        render_keyboard = mocker.spy(keyboard, "_render_keyboard")
+        window = RenderCachedWindow(
+            text,
+            keyboard,
+            state=State("main", "Catalog"),
+            render_cache=RenderCache(keys=["page"]),
+        )
+
+        # When
+        for data in ({"page": 1}, {"page": 1}, {"page": 2}):
+            rendered_text = await window.render_text(data, manager)
+            markup = await window.render_kbd(data, manager)
+
+        # Then
+        assert render_text.call_count == 2
+        assert render_keyboard.call_count == 2
+        assert rendered_text == "Page 2"
+        assert markup.inline_keyboard[0][0].text == "Item 2"
+        assert window.render_cache.stats == {"hits": 2, "misses": 4, "size": 4}
+
+    @pytest.mark.asyncio
+    async def test_cached_buttons_get_intent_of_each_user(self, manager):
+        # Given
+        window = RenderCachedWindow(
+            Const("Menu"),
+            Row(Button(Const("Ok"), id="ok")),
+            state=State("main", "Menu"),
+            render_cache=RenderCache(keys=()),
+        )
+
+        # When
+        first = await window.render_kbd({}, manager)
+        manager.current_context.return_value.id = "second"
+        second = await window.render_kbd({}, manager)
+
+        # Then
+        assert window.render_cache.stats["hits"] == 1
+        assert first.inline_keyboard[0][0].callback_data.startswith("first")
+        assert second.inline_keyboard[0][0].callback_data.startswith("second")
+
+    @pytest.mark.asyncio
+    async def test_preview_is_not_cached(self, manager):
+        # Given
+        manager.is_preview.return_value = True
+        window = RenderCachedWindow(
+            Const("Menu"), state=State("main", "Menu"), render_cache=RenderCache(keys=())
+        )
+
+        # When
+        await window.render_text({}, manager)
+
+        # Then
+        assert window.render_cache.stats["size"] == 0
+
+    @pytest.mark.asyncio
+    async def test_users_with_different_context_data(self, manager):
+        # Given
+        text = CompiledFormat("Hello {dialog_data[name]} / {event.from_user.id}")
+        window = RenderCachedWindow(
+            text,
+            state=State("main", "Greeting"),
+            render_cache=RenderCache(keys=infer_render_keys([text])),
+        )
+
+        def data(name: str, user_id: int) -> dict:
+            user = User(id=user_id, is_bot=False, first_name=name)
+            event = CallbackQuery(id="1", from_user=user, chat_instance="chat")
+            return {"dialog_data": {"name": name}, "event": event}
+
+        # When
+        alice = await window.render_text(data("alice", 1), manager)
+        bob = await window.render_text(data("bob", 2), manager)
+        alice_again = await window.render_text(data("alice", 1), manager)
+
+        # Then
+        assert alice == alice_again == "Hello alice / 1"
+        assert bob == "Hello bob / 2"
+        assert window.render_cache.stats["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_objects_without_value_key_are_not_cached(self, manager, caplog):
+        # Given
+        class Product:
+            def __init__(self, name: str):
+                self.name = name
+
+        window = RenderCachedWindow(
+            CompiledFormat("{product.name}"),
+            state=State("main", "Product"),
+            render_cache=RenderCache(keys=["product"]),
+        )
+
+        # When
+        with caplog.at_level(logging.WARNING):
+            texts = [
+                await window.render_text({"product": Product(f"#{number}")}, manager)
+                for number in range(100)
+            ]
+
+        # Then
+        assert texts == [f"#{number}" for number in range(100)]
+        assert window.render_cache.stats == {"hits": 0, "misses": 0, "size": 0}
+        assert len(caplog.records) == 1
+        assert "Product" in caplog.records[0].getMessage()
+
+    def test_models_and_hashable_values_are_keyed_by_value(self, manager):
+        # Given
+        @dataclass
+        class Product:
+            name: str
+
+        cache = RenderCache(keys=["product", "user"])
+
+        def key(name: str, user_id: int):
+            user = User(id=user_id, is_bot=False, first_name="User")
+            return cache.make_key({"product": Product(name), "user": user}, manager)
+
+        # When
+        keys = [key("tea", 1), key("tea", 1), key("tea", 2), key("milk", 1)]
+        decimals = [
+            cache.make_key({"product": Decimal(value)}, manager)
+            for value in ("1.5", "1.5", "2.5")
+        ]
+
+        # Then
+        assert keys[0] == keys[1]
+        assert len(set(keys)) == 3
+        assert decimals[0] == decimals[1] != decimals[2]
+
+    def test_find_state_ids(self):
+        widgets = [
+            Const("Menu"),
+            Row(Button(Const("Ok"), id="ok")),
+            Select(Format("{item}"), id="items", item_id_getter=str, items="items"),
+        ]
+        assert find_state_ids(widgets) == {"items"}
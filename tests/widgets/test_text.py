@@ -0,0 +1,187 @@
+from unittest.mock import Mock
+
+import pytest
+from aiogram.enums import ParseMode
+from aiogram_dialog.widgets.text import Const, Format
+
+from dialog_yml.widgets.text import (
+    CompiledFormat,
+    CompiledTemplate,
+    PagedScrollingText,
+    share_templates,
+    split_text_pages,
+)
+
+LONG_TEXT = " ".join(f"word{i}" for i in range(100))
+
+
+class TestSplitTextPages:
+    def test_short_text_is_single_page(self):
+        assert split_text_pages("short text", 100) == ["short text"]
+
+    def test_zero_page_size_is_single_page(self):
+        assert split_text_pages(LONG_TEXT, 0) == [LONG_TEXT]
+
+    def test_split_on_word_boundaries(self):
+        # When
+        pages = split_text_pages(LONG_TEXT, 50)
+
+        # Then
+        assert "".join(pages) == LONG_TEXT
+        assert all(len(page) <= 50 for page in pages)
+        assert all(page.endswith(" ") for page in pages[:-1])
+
+    def test_long_word_is_hard_split(self):
+        assert split_text_pages("a" * 25, 10) == ["a" * 10, "a" * 10, "a" * 5]
+
+    def test_markdown_entity_is_not_split(self):
+        # Given
+        text = "aaaa *bold text* bbbb cccc"
+
+        # When
+        pages = split_text_pages(text, 15, ParseMode.MARKDOWN)
+
+        # Then
+        assert pages[0] == "aaaa "
+        assert pages[1].startswith("*bold text* ")
+
+    def test_markdown_v2_escape_is_not_split(self):
+        # Given
+        text = "abcdefghi\\.jk"
+
+        # When
+        pages = split_text_pages(text, 10, ParseMode.MARKDOWN_V2)
+
+        # Then
+        assert pages == ["abcdefghi", "\\.jk"]
+
+    def test_html_tags_are_reopened(self):
+        # Given
+        text = "<b>one two three four</b> five"
+
+        # When
+        pages = split_text_pages(text, 15, ParseMode.HTML)
+
+        # Then
+        assert pages[0] == "<b>one two </b>"
+        assert pages[1].startswith("<b>three")
+        assert pages[-1].endswith("five")
+
+    def test_html_entity_is_not_split(self):
+        # Given
+        text = "abcdefg&amp;hij"
+
+        # When
+        pages = split_text_pages(text, 10, ParseMode.HTML)
+
+        # Then
+        assert pages[0] == "abcdefg"
+        assert pages[1].startswith("&amp;")
+
+
+class Item:
+    name = "item name"
+
+
+TEMPLATE_DATA = {"name": "Bob", "count": 5, "items": [Item()], "info": {"key": 1}}
+
+
+class TestCompiledTemplate:
+    @pytest.mark.parametrize(
+        "text, expected_keys",
+        [
+            ("plain text", set()),
+            ("Hello {name}!", {"name"}),
+            ("{count:>5} {count!r} {name!s:^9}", {"count", "name"}),
+            ("{items[0].name} {info[key]}", {"items", "info"}),
+            ("{{escaped}} {name}", {"name"}),
+        ],
+    )
+    def test_render_matches_format_map(self, text, expected_keys):
+        # When
+        template = CompiledTemplate(text)
+
+        # Then
+        assert template.is_compiled
+        assert template.required_keys == expected_keys
+        assert template.render(TEMPLATE_DATA) == text.format_map(TEMPLATE_DATA)
+
+    @pytest.mark.parametrize("text", ["{}", "{0}", "{count:{width}}", "broken {"])
+    def test_fallback_to_format_map(self, text):
+        # When
+        template = CompiledTemplate(text)
+
+        # Then
+        assert not template.is_compiled
+        assert template.render == text.format_map
+
+    def test_missing_key_raises_key_error(self):
+        with pytest.raises(KeyError):
+            CompiledTemplate("{missing}").render({})
+
+    @pytest.mark.asyncio
+    async def test_compiled_format_widget(self):
+        # Given
+        widget = CompiledFormat("Hello {name}")
+        manager = Mock()
+        manager.is_preview.return_value = False
+
+        # When
+        text = await widget.render_text({"name": "Bob"}, manager)
+
+        # Then
+        assert text == "Hello Bob"
+        assert widget.required_keys == {"name"}
+
+    def test_shared_templates_within_context(self):
+        # When
+        with share_templates():
+            first = CompiledFormat("Hello {name}")
+            second = CompiledFormat("Hello {name}")
+        third = CompiledFormat("Hello {name}")
+
+        # Then
+        assert first.template is second.template
+        assert third.template is not first.template
+
+
+class TestPagedScrollingText:
+    @pytest.fixture
+    def manager(self):
+        manager = Mock()
+        manager.current_context.return_value.widget_data = {}
+        manager.is_preview.return_value = False
+        return manager
+
+    @pytest.mark.asyncio
+    async def test_constant_text_pages_are_precomputed(self, manager):
+        # Given
+        widget = PagedScrollingText(
+            Const(LONG_TEXT), id="scroll", page_size=100, parse_mode=ParseMode.HTML
+        )
+
+        # When
+        manager.current_context.return_value.widget_data["scroll"] = 1
+        text = await widget.render_text({}, manager)
+
+        # Then
+        assert widget.is_static
+        assert text == split_text_pages(LONG_TEXT, 100)[1]
+        assert await widget.get_page_count({}, manager) == len(
+            split_text_pages(LONG_TEXT, 100)
+        )
+
+    @pytest.mark.asyncio
+    async def test_formatted_text_pages_are_cached(self, manager):
+        # Given
+        widget = PagedScrollingText(Format("{text}"), id="scroll", page_size=100)
+
+        # When
+        await widget.render_text({"text": LONG_TEXT}, manager)
+        pages = await widget.get_pages({"text": LONG_TEXT}, manager)
+        await widget.render_text({"text": "other"}, manager)
+
+        # Then
+        assert not widget.is_static
+        assert len(widget._pages_cache) == 2
+        assert pages is await widget.get_pages({"text": LONG_TEXT}, manager)
@@ -0,0 +1,123 @@
+from unittest.mock import Mock
+
+import pytest
+from aiogram.fsm.state import State
+from aiogram_dialog import Window
+from aiogram_dialog.widgets.kbd import Button, Group
+from aiogram_dialog.widgets.text import Const
+
+from dialog_yml.widgets.when import (
+    MemoizedPredicate,
+    get_when_cache,
+    memoize_conditions,
+)
+
+
+class TestMemoizeConditions:
+    @pytest.fixture
+    def manager(self):
+        manager = Mock()
+        manager.current_context.return_value.widget_data = {}
+        manager.is_preview.return_value = False
+        return manager
+
+    @pytest.mark.asyncio
+    async def test_shared_predicate_runs_once_per_render(self, manager):
+        # Given
+        calls = []
+
+        def is_admin(data, widget, dialog_manager):
+            calls.append(data)
+            return data["admin"]
+
+        def is_owner(data, widget, dialog_manager):
+            return True
+
+        keyboard = Group(
+            *[Button(Const(str(i)), id=f"b{i}", when=is_admin) for i in range(5)],
+            Button(Const("owner"), id="owner", when=is_owner),
+        )
+
+        # When
+        cache = memoize_conditions([keyboard])
+        first = await keyboard.render_keyboard({"admin": True}, manager)
+        second = await keyboard.render_keyboard({"admin": False}, manager)
+
+        # Then
+        assert len(calls) == 2
+        assert len(first) == 6 and len(second) == 1
+        assert cache.stats == {"evaluations": 2, "saved": 8}
+        assert isinstance(keyboard.buttons[0].condition, MemoizedPredicate)
+        assert keyboard.buttons[-1].condition is is_owner
+
+    def test_no_shared_predicates(self):
+        # Given
+        keyboard = Group(Button(Const("a"), id="a", when=lambda *_: True))
+
+        # When
+        cache = memoize_conditions([keyboard])
+
+        # Then
+        assert cache is None
+
+    @pytest.mark.asyncio
+    async def test_interleaved_renders_keep_their_results(self, manager):
+        # Given
+        calls = []
+
+        def is_admin(data, widget, dialog_manager):
+            calls.append(data["admin"])
+            return data["admin"]
+
+        keyboard = Group(
+            *[Button(Const(str(i)), id=f"b{i}", when=is_admin) for i in range(2)]
+        )
+        cache = memoize_conditions([keyboard])
+        first, second = {"admin": True}, {"admin": False}
+
+        # When
+        first_rows = await keyboard.buttons[0].render_keyboard(first, manager)
+        second_rows = await keyboard.buttons[0].render_keyboard(second, manager)
+        first_rows += await keyboard.buttons[1].render_keyboard(first, manager)
+        second_rows += await keyboard.buttons[1].render_keyboard(second, manager)
+
+        # Then
+        assert calls == [True, False]
+        assert len(first_rows) == 2 and second_rows == []
+        assert cache.stats == {"evaluations": 2, "saved": 2}
+
+    def test_predicate_reading_widget_is_not_shared(self):
+        # Given
+        def is_first(data, widget, dialog_manager):
+            return widget.widget_id == "a"
+
+        keyboard = Group(
+            Button(Const("a"), id="a", when=is_first),
+            Button(Const("b"), id="b", when=is_first),
+        )
+
+        # When
+        cache = memoize_conditions([keyboard])
+
+        # Then
+        assert cache is None
+        assert keyboard.buttons[0].condition is is_first
+
+    def test_get_when_cache(self):
+        # Given
+        def is_admin(data, widget, dialog_manager):
+            return data["admin"]
+
+        keyboard = Group(
+            Button(Const("a"), id="a", when=is_admin),
+            Button(Const("b"), id="b", when=is_admin),
+        )
+        expected = memoize_conditions([keyboard])
+        window = Window(Const("Menu"), keyboard, state=State("main", "Menu"))
+
+        # When
+        cache = get_when_cache(window)
+
+        # Then
+        assert cache is expected
+        assert get_when_cache(Window(Const("Menu"), state=State("main", "Menu"))) is None